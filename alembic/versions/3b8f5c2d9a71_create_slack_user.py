@@ -0,0 +1,60 @@
+"""create slack_user
+
+Revision ID: 3b8f5c2d9a71
+Revises: 65d4a71a8e37, f1e2d3c4b5a6
+Create Date: 2026-10-17 09:12:44.118203
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = "3b8f5c2d9a71"
+down_revision = ("65d4a71a8e37", "f1e2d3c4b5a6")
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "slack_user",
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.Column("email", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("id", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("name", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column(
+            "real_name", sqlmodel.sql.sqltypes.AutoString(), nullable=True
+        ),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_slack_user_email"), "slack_user", ["email"], unique=False
+    )
+    op.create_index(
+        op.f("ix_slack_user_name"), "slack_user", ["name"], unique=False
+    )
+    op.create_index(
+        op.f("ix_slack_user_real_name"),
+        "slack_user",
+        ["real_name"],
+        unique=False,
+    )
+
+    # The user directory now lives in slack_user and is rebuilt at startup
+    op.execute("DELETE FROM applicationdata WHERE name = 'slack_users'")
+
+
+def downgrade():
+    op.drop_index(op.f("ix_slack_user_real_name"), table_name="slack_user")
+    op.drop_index(op.f("ix_slack_user_name"), table_name="slack_user")
+    op.drop_index(op.f("ix_slack_user_email"), table_name="slack_user")
+    op.drop_table("slack_user")
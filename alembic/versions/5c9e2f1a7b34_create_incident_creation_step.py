@@ -0,0 +1,62 @@
+"""create incident_creation_step
+
+Revision ID: 5c9e2f1a7b34
+Revises: 8d41e7a0c3f2
+Create Date: 2026-10-17 14:02:51.274119
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = "5c9e2f1a7b34"
+down_revision = "8d41e7a0c3f2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "incident_creation_step",
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.Column("error", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("output", sa.JSON(), nullable=True),
+        sa.Column("parent", sa.Integer(), nullable=False),
+        sa.Column(
+            "pipeline", sqlmodel.sql.sqltypes.AutoString(), nullable=False
+        ),
+        sa.Column(
+            "status", sqlmodel.sql.sqltypes.AutoString(), nullable=False
+        ),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["parent"], ["incidentrecord.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("parent", "name"),
+    )
+    op.create_index(
+        op.f("ix_incident_creation_step_parent"),
+        "incident_creation_step",
+        ["parent"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        op.f("ix_incident_creation_step_parent"),
+        table_name="incident_creation_step",
+    )
+    op.drop_table("incident_creation_step")
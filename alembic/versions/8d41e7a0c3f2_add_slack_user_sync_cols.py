@@ -0,0 +1,36 @@
+"""add sync columns to slack_user
+
+Revision ID: 8d41e7a0c3f2
+Revises: 3b8f5c2d9a71
+Create Date: 2026-10-17 11:40:05.530917
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = "8d41e7a0c3f2"
+down_revision = "3b8f5c2d9a71"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "slack_user",
+        sa.Column(
+            "content_hash", sqlmodel.sql.sqltypes.AutoString(), nullable=True
+        ),
+    )
+    op.add_column(
+        "slack_user",
+        sa.Column("deleted_at", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade():
+    op.drop_column("slack_user", "deleted_at")
+    op.drop_column("slack_user", "content_hash")
@@ -0,0 +1,46 @@
+"""add incidentrecord lookup indexes
+
+Revision ID: 9f3a6d2c8b15
+Revises: e5b8c2f7a913
+Create Date: 2026-10-17 18:40:12.502914
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9f3a6d2c8b15"
+down_revision = "e5b8c2f7a913"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        op.f("ix_incidentrecord_channel_id"),
+        "incidentrecord",
+        ["channel_id"],
+        unique=True,
+    )
+    op.create_index(
+        op.f("ix_incidentrecord_channel_name"),
+        "incidentrecord",
+        ["channel_name"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_incidentrecord_slug"),
+        "incidentrecord",
+        ["slug"],
+        unique=True,
+    )
+
+
+def downgrade():
+    op.drop_index(op.f("ix_incidentrecord_slug"), table_name="incidentrecord")
+    op.drop_index(
+        op.f("ix_incidentrecord_channel_name"), table_name="incidentrecord"
+    )
+    op.drop_index(
+        op.f("ix_incidentrecord_channel_id"), table_name="incidentrecord"
+    )
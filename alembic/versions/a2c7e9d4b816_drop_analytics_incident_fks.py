@@ -0,0 +1,39 @@
+"""drop incidentrecord foreign keys from analytics tables
+
+Revision ID: a2c7e9d4b816
+Revises: d9a3f5c1e824
+Create Date: 2026-10-18 14:27:05.331870
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "a2c7e9d4b816"
+down_revision = "d9a3f5c1e824"
+branch_labels = None
+depends_on = None
+
+tables = ["incident_metrics", "incident_status_time"]
+
+
+def upgrade():
+    for table in tables:
+        op.drop_constraint(f"{table}_parent_fkey", table, type_="foreignkey")
+
+
+def downgrade():
+    for table in tables:
+        op.execute(
+            f"DELETE FROM {table} WHERE parent NOT IN "
+            + "(SELECT id FROM incidentrecord)"
+        )
+        op.create_foreign_key(
+            f"{table}_parent_fkey",
+            table,
+            "incidentrecord",
+            ["parent"],
+            ["id"],
+            ondelete="CASCADE",
+        )
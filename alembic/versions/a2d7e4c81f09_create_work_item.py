@@ -0,0 +1,70 @@
+"""create work_item
+
+Revision ID: a2d7e4c81f09
+Revises: 5c9e2f1a7b34
+Create Date: 2026-10-17 15:31:08.660412
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = "a2d7e4c81f09"
+down_revision = "5c9e2f1a7b34"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "work_item",
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("key", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("kind", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column(
+            "last_error", sqlmodel.sql.sqltypes.AutoString(), nullable=True
+        ),
+        sa.Column("locked_at", sa.DateTime(), nullable=True),
+        sa.Column("max_attempts", sa.Integer(), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=True),
+        sa.Column(
+            "run_after",
+            sa.DateTime(),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.Column(
+            "status", sqlmodel.sql.sqltypes.AutoString(), nullable=False
+        ),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_work_item_status_run_after",
+        "work_item",
+        ["status", "run_after"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_work_item_key_unfinished",
+        "work_item",
+        ["key"],
+        unique=True,
+        postgresql_where=sa.text("status IN ('queued', 'running')"),
+    )
+
+
+def downgrade():
+    op.drop_index("ix_work_item_key_unfinished", table_name="work_item")
+    op.drop_index("ix_work_item_status_run_after", table_name="work_item")
+    op.drop_table("work_item")
@@ -0,0 +1,64 @@
+"""add full text search vectors
+
+Revision ID: a6e4c9d1f273
+Revises: f8d3b6a2c517
+Create Date: 2026-10-17 21:12:44.918203
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "a6e4c9d1f273"
+down_revision = "f8d3b6a2c517"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(
+        """
+        ALTER TABLE incidentrecord ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(slug, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(impact, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(components, '')), 'C')
+        ) STORED
+        """
+    )
+    op.execute(
+        """
+        ALTER TABLE incidentevent ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(text, '')), 'B')
+        ) STORED
+        """
+    )
+    op.create_index(
+        "ix_incidentrecord_search_vector",
+        "incidentrecord",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "ix_incidentevent_search_vector",
+        "incidentevent",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade():
+    op.drop_index(
+        "ix_incidentevent_search_vector", table_name="incidentevent"
+    )
+    op.drop_index(
+        "ix_incidentrecord_search_vector", table_name="incidentrecord"
+    )
+    op.drop_column("incidentevent", "search_vector")
+    op.drop_column("incidentrecord", "search_vector")
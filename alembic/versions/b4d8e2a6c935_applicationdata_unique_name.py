@@ -0,0 +1,55 @@
+"""make applicationdata name unique and add digest
+
+Revision ID: b4d8e2a6c935
+Revises: e7b2d4f9a681
+Create Date: 2026-10-17 23:26:08.140736
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+# revision identifiers, used by Alembic.
+revision = "b4d8e2a6c935"
+down_revision = "e7b2d4f9a681"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep the most recently written row of any duplicated name
+    op.execute("""
+        DELETE FROM applicationdata
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY name
+                    ORDER BY coalesce(updated_at, created_at) DESC
+                ) AS n
+                FROM applicationdata
+            ) ranked
+            WHERE n > 1
+        )
+        """)
+    op.add_column(
+        "applicationdata",
+        sa.Column(
+            "digest",
+            sqlmodel.sql.sqltypes.AutoString(length=64),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        op.f("ix_applicationdata_name"),
+        "applicationdata",
+        ["name"],
+        unique=True,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        op.f("ix_applicationdata_name"), table_name="applicationdata"
+    )
+    op.drop_column("applicationdata", "digest")
@@ -0,0 +1,64 @@
+"""add change_seq to incidentevent
+
+Revision ID: b5e1d8c3f602
+Revises: a2c7e9d4b816
+Create Date: 2026-10-19 10:12:44.518203
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b5e1d8c3f602"
+down_revision = "a2c7e9d4b816"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(
+        sa.schema.CreateSequence(sa.Sequence("incidentevent_change_seq"))
+    )
+    op.add_column(
+        "incidentevent",
+        sa.Column("change_seq", sa.BigInteger(), nullable=True),
+    )
+
+    # Number existing events in the order they were last added or edited
+    op.execute(
+        """
+        UPDATE incidentevent
+        SET change_seq = ordered.change_seq
+        FROM (
+            SELECT id, nextval('incidentevent_change_seq') AS change_seq
+            FROM (
+                SELECT id
+                FROM incidentevent
+                ORDER BY coalesce(updated_at, created_at), id
+            ) AS events
+        ) AS ordered
+        WHERE incidentevent.id = ordered.id
+        """
+    )
+
+    op.alter_column(
+        "incidentevent",
+        "change_seq",
+        server_default=sa.text("nextval('incidentevent_change_seq')"),
+    )
+    op.create_index(
+        "ix_incidentevent_parent_change_seq",
+        "incidentevent",
+        ["parent", "change_seq"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        "ix_incidentevent_parent_change_seq", table_name="incidentevent"
+    )
+    op.drop_column("incidentevent", "change_seq")
+    op.execute(sa.schema.DropSequence(sa.Sequence("incidentevent_change_seq")))
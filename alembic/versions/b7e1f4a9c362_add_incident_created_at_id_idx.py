@@ -0,0 +1,30 @@
+"""add incidentrecord created_at id index
+
+Revision ID: b7e1f4a9c362
+Revises: 9f3a6d2c8b15
+Create Date: 2026-10-17 19:12:55.730118
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b7e1f4a9c362"
+down_revision = "9f3a6d2c8b15"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_incidentrecord_created_at_id",
+        "incidentrecord",
+        ["created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        "ix_incidentrecord_created_at_id", table_name="incidentrecord"
+    )
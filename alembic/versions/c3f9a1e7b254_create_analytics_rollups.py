@@ -0,0 +1,107 @@
+"""create analytics rollup tables
+
+Revision ID: c3f9a1e7b254
+Revises: a6e4c9d1f273
+Create Date: 2026-10-17 22:03:19.506172
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+# revision identifiers, used by Alembic.
+revision = "c3f9a1e7b254"
+down_revision = "a6e4c9d1f273"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "incident_metrics",
+        sa.Column(
+            "components", sqlmodel.sql.sqltypes.AutoString(), nullable=True
+        ),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column(
+            "incident_type",
+            sqlmodel.sql.sqltypes.AutoString(),
+            nullable=True,
+        ),
+        sa.Column("parent", sa.Integer(), nullable=False),
+        sa.Column("participants", sa.Integer(), nullable=False),
+        sa.Column("resolved_at", sa.DateTime(), nullable=True),
+        sa.Column(
+            "severity", sqlmodel.sql.sqltypes.AutoString(), nullable=True
+        ),
+        sa.Column("status", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("status_entered_at", sa.DateTime(), nullable=False),
+        sa.Column("time_to_resolve", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["parent"], ["incidentrecord.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("parent"),
+    )
+    op.create_index(
+        op.f("ix_incident_metrics_created_at"),
+        "incident_metrics",
+        ["created_at"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_incident_metrics_resolved_at"),
+        "incident_metrics",
+        ["resolved_at"],
+        unique=False,
+    )
+    op.create_table(
+        "incident_status_time",
+        sa.Column("parent", sa.Integer(), nullable=False),
+        sa.Column("seconds", sa.Integer(), nullable=False),
+        sa.Column(
+            "status", sqlmodel.sql.sqltypes.AutoString(), nullable=False
+        ),
+        sa.ForeignKeyConstraint(
+            ["parent"], ["incidentrecord.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("parent", "status"),
+    )
+    op.create_table(
+        "incident_rollup",
+        sa.Column("bucket", sa.Date(), nullable=False),
+        sa.Column(
+            "dimension", sqlmodel.sql.sqltypes.AutoString(), nullable=False
+        ),
+        sa.Column("opened", sa.Integer(), nullable=False),
+        sa.Column("participants", sa.Integer(), nullable=False),
+        sa.Column(
+            "period", sqlmodel.sql.sqltypes.AutoString(), nullable=False
+        ),
+        sa.Column("resolve_seconds", sa.BigInteger(), nullable=False),
+        sa.Column("resolved", sa.Integer(), nullable=False),
+        sa.Column("value", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.PrimaryKeyConstraint("bucket", "dimension", "period", "value"),
+    )
+    op.create_index(
+        "ix_incident_rollup_period_dimension_bucket",
+        "incident_rollup",
+        ["period", "dimension", "bucket"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        "ix_incident_rollup_period_dimension_bucket",
+        table_name="incident_rollup",
+    )
+    op.drop_table("incident_rollup")
+    op.drop_table("incident_status_time")
+    op.drop_index(
+        op.f("ix_incident_metrics_resolved_at"), table_name="incident_metrics"
+    )
+    op.drop_index(
+        op.f("ix_incident_metrics_created_at"), table_name="incident_metrics"
+    )
+    op.drop_table("incident_metrics")
@@ -0,0 +1,78 @@
+"""add reminder columns to incidentrecord
+
+Revision ID: c41f8a9e2d57
+Revises: a2d7e4c81f09
+Create Date: 2026-10-17 16:48:19.035527
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c41f8a9e2d57"
+down_revision = "a2d7e4c81f09"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "incidentrecord",
+        sa.Column("comms_reminder_minutes", sa.Integer(), nullable=True),
+    )
+    op.add_column(
+        "incidentrecord",
+        sa.Column("next_comms_reminder_at", sa.DateTime(), nullable=True),
+    )
+    op.add_column(
+        "incidentrecord",
+        sa.Column("next_role_check_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index(
+        op.f("ix_incidentrecord_next_comms_reminder_at"),
+        "incidentrecord",
+        ["next_comms_reminder_at"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_incidentrecord_next_role_check_at"),
+        "incidentrecord",
+        ["next_role_check_at"],
+        unique=False,
+    )
+
+    # Carry over the per-incident scheduler jobs, which are replaced by a
+    # single sweeper, and remove them from the job store
+    if sa.inspect(op.get_bind()).has_table("apscheduler_jobs"):
+        for suffix, column in (
+            ("comms_reminder", "next_comms_reminder_at"),
+            ("role_watcher", "next_role_check_at"),
+        ):
+            op.execute(
+                f"""
+                UPDATE incidentrecord
+                SET {column} = to_timestamp(j.next_run_time)
+                FROM apscheduler_jobs j
+                WHERE j.id = incidentrecord.slug || '_{suffix}'
+                  AND j.next_run_time IS NOT NULL
+                """
+            )
+            op.execute(
+                f"DELETE FROM apscheduler_jobs WHERE id LIKE '%\\_{suffix}'"
+            )
+
+
+def downgrade():
+    op.drop_index(
+        op.f("ix_incidentrecord_next_role_check_at"),
+        table_name="incidentrecord",
+    )
+    op.drop_index(
+        op.f("ix_incidentrecord_next_comms_reminder_at"),
+        table_name="incidentrecord",
+    )
+    op.drop_column("incidentrecord", "next_role_check_at")
+    op.drop_column("incidentrecord", "next_comms_reminder_at")
+    op.drop_column("incidentrecord", "comms_reminder_minutes")
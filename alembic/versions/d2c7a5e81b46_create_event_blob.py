@@ -0,0 +1,76 @@
+"""create event_blob and add image reference cols
+
+Revision ID: d2c7a5e81b46
+Revises: b7e1f4a9c362
+Create Date: 2026-10-17 19:58:30.914467
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+# revision identifiers, used by Alembic.
+revision = "d2c7a5e81b46"
+down_revision = "b7e1f4a9c362"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "event_blob",
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.Column(
+            "digest",
+            sqlmodel.sql.sqltypes.AutoString(length=64),
+            nullable=False,
+        ),
+        sa.Column("oid", sa.BigInteger(), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("digest"),
+    )
+    op.add_column(
+        "incidentevent",
+        sa.Column(
+            "image_ref", sqlmodel.sql.sqltypes.AutoString(), nullable=True
+        ),
+    )
+    op.add_column(
+        "incidentevent",
+        sa.Column("image_size", sa.Integer(), nullable=True),
+    )
+    op.create_index(
+        op.f("ix_incidentevent_image_ref"),
+        "incidentevent",
+        ["image_ref"],
+        unique=False,
+    )
+
+    # Lets readers tell which events have an image without loading it, the
+    # content itself is moved by the migrate_event_images job in batches
+    op.execute(
+        "UPDATE incidentevent SET image_size = octet_length(image) "
+        + "WHERE image IS NOT NULL"
+    )
+
+
+def downgrade():
+    # Images kept by the local blob store backend can't be restored here
+    op.execute(
+        "UPDATE incidentevent SET image = lo_get(event_blob.oid) "
+        + "FROM event_blob WHERE incidentevent.image_ref = event_blob.digest "
+        + "AND incidentevent.image IS NULL"
+    )
+    op.drop_index(
+        op.f("ix_incidentevent_image_ref"), table_name="incidentevent"
+    )
+    op.drop_column("incidentevent", "image_size")
+    op.drop_column("incidentevent", "image_ref")
+    op.execute("SELECT lo_unlink(oid) FROM event_blob")
+    op.drop_table("event_blob")
@@ -0,0 +1,37 @@
+"""add parent indexes to incident artifact tables
+
+Revision ID: d9a3f5c1e824
+Revises: b4d8e2a6c935
+Create Date: 2026-10-18 09:12:44.518302
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "d9a3f5c1e824"
+down_revision = "b4d8e2a6c935"
+branch_labels = None
+depends_on = None
+
+tables = [
+    "gitlabissuerecord",
+    "incidentparticipant",
+    "jiraissuerecord",
+    "pagerdutyincidentrecord",
+    "postmortemrecord",
+    "statuspageincidentrecord",
+]
+
+
+def upgrade():
+    for table in tables:
+        op.create_index(
+            op.f(f"ix_{table}_parent"), table, ["parent"], unique=False
+        )
+
+
+def downgrade():
+    for table in tables:
+        op.drop_index(op.f(f"ix_{table}_parent"), table_name=table)
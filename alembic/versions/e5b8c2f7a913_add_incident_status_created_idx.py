@@ -0,0 +1,30 @@
+"""add incidentrecord status created_at index
+
+Revision ID: e5b8c2f7a913
+Revises: c41f8a9e2d57
+Create Date: 2026-10-17 18:02:41.118203
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e5b8c2f7a913"
+down_revision = "c41f8a9e2d57"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_incidentrecord_status_created_at",
+        "incidentrecord",
+        ["status", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        "ix_incidentrecord_status_created_at", table_name="incidentrecord"
+    )
@@ -0,0 +1,67 @@
+"""create incident_archive
+
+Revision ID: e7b2d4f9a681
+Revises: c3f9a1e7b254
+Create Date: 2026-10-17 22:47:51.382940
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+# revision identifiers, used by Alembic.
+revision = "e7b2d4f9a681"
+down_revision = "c3f9a1e7b254"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "incident_archive",
+        sa.Column(
+            "archive",
+            sqlmodel.sql.sqltypes.AutoString(length=64),
+            nullable=False,
+        ),
+        sa.Column(
+            "archived_at",
+            sa.DateTime(),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.Column(
+            "channel_id", sqlmodel.sql.sqltypes.AutoString(), nullable=True
+        ),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column(
+            "description", sqlmodel.sql.sqltypes.AutoString(), nullable=True
+        ),
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column(
+            "images",
+            sqlmodel.sql.sqltypes.AutoString(length=64),
+            nullable=True,
+        ),
+        sa.Column(
+            "severity", sqlmodel.sql.sqltypes.AutoString(), nullable=True
+        ),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.Column("slug", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("status", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_incident_archive_slug"),
+        "incident_archive",
+        ["slug"],
+        unique=True,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        op.f("ix_incident_archive_slug"), table_name="incident_archive"
+    )
+    op.drop_table("incident_archive")
@@ -0,0 +1,31 @@
+"""add incidentevent parent message_ts index
+
+Revision ID: f8d3b6a2c517
+Revises: d2c7a5e81b46
+Create Date: 2026-10-17 20:41:07.284519
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "f8d3b6a2c517"
+down_revision = "d2c7a5e81b46"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_incidentevent_parent_message_ts",
+        "incidentevent",
+        ["parent", "message_ts"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        "ix_incidentevent_parent_message_ts", table_name="incidentevent"
+    )
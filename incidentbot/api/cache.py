@@ -0,0 +1,242 @@
+import hashlib
+import jwt
+import threading
+import time
+
+from collections import OrderedDict
+from fastapi import Request, Response
+from incidentbot.configuration.settings import settings
+from incidentbot.models.database import on_commit
+from incidentbot.util.security import ALGORITHM
+from jwt.exceptions import InvalidTokenError
+from typing import Awaitable, Callable
+
+"""
+Conditional GETs
+
+Successful JSON responses to GET requests under the API prefix carry an ETag
+derived from a hash of their content, and requests whose If-None-Match
+matches it are answered with an empty 304
+
+Responses from the list endpoints below are also kept in a small in-process
+cache for response_cache_seconds, keyed by path, query string and access
+token. A poll answered from the cache runs no handler and no database query.
+The cache is cleared whenever this process commits a write to the database,
+changes made by other replicas show up once entries expire
+"""
+
+cached_paths = {
+    "/analytics/status_time",
+    "/analytics/summary",
+    "/analytics/trends",
+    "/incident",
+    "/incident/archive",
+    "/job",
+    "/maintenance_window",
+    "/pager",
+    "/pager/automapping",
+    "/setting",
+}
+
+
+class CachedResponse:
+    def __init__(self, body: bytes, etag: str, media_type: str | None):
+        self.body = body
+        self.etag = etag
+        self.media_type = media_type
+
+
+class ResponseCache:
+    """
+    In-process cache of serialized API responses
+
+    Parameters:
+        ttl_seconds (float): How long an entry is served
+        max_entries (int): Entries beyond this evict the least recently used
+    """
+
+    def __init__(self, ttl_seconds: float = 10, max_entries: int = 256):
+        self.generation = 0
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[
+            tuple[str, ...], tuple[float, CachedResponse]
+        ] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, ...]) -> CachedResponse | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+
+        return entry[1]
+
+    def set(
+        self,
+        key: tuple[str, ...],
+        response: CachedResponse,
+        generation: int,
+    ):
+        """
+        Store a response unless the cache was invalidated since generation
+        was read, the response may predate the write that invalidated it
+        """
+
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = (time.monotonic(), response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+
+response_cache = ResponseCache(
+    ttl_seconds=settings.api.response_cache_seconds,
+    max_entries=settings.api.response_cache_max_entries,
+)
+
+
+def content_etag(body: bytes) -> str:
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Return whether an If-None-Match header matches an ETag
+    """
+
+    if not if_none_match:
+        return False
+
+    return if_none_match.strip() == "*" or etag in [
+        tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+    ]
+
+
+def cache_key(request: Request) -> tuple[str, ...] | None:
+    """
+    Return the response cache key of a request, None if its response must
+    not be cached - only requests with a valid access token to one of
+    cached_paths are
+
+    Parameters:
+        request (Request): The request
+    """
+
+    path = request.url.path.removeprefix(settings.api.v1_str).rstrip("/")
+    if path not in cached_paths:
+        return None
+
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+
+    # Checked here as well because cached responses skip the route's own
+    # authentication
+    try:
+        jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+    except InvalidTokenError:
+        return None
+
+    return (
+        path,
+        str(request.query_params),
+        hashlib.sha256(token.encode()).hexdigest(),
+    )
+
+
+def conditional_response(
+    request: Request,
+    cached: CachedResponse,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    headers = (headers or {}) | {
+        "Cache-Control": "private, no-cache",
+        "ETag": cached.etag,
+    }
+
+    if etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(
+        content=cached.body, headers=headers, media_type=cached.media_type
+    )
+
+
+async def conditional_get(
+    request: Request,
+    call_next: Callable[[Request], Awaitable[Response]],
+) -> Response:
+    """
+    Middleware adding ETags to API responses and serving cached ones
+    """
+
+    if not request.url.path.startswith(settings.api.v1_str):
+        return await call_next(request)
+
+    if request.method != "GET":
+        response = await call_next(request)
+        if request.method not in ("HEAD", "OPTIONS"):
+            response_cache.invalidate()
+        return response
+
+    key = cache_key(request)
+    if key is not None:
+        cached = response_cache.get(key)
+        if cached is not None:
+            return conditional_response(request, cached)
+
+    generation = response_cache.generation
+    response = await call_next(request)
+
+    # Responses that set their own validators, like event images, are
+    # streamed through untouched
+    if (
+        response.status_code != 200
+        or "etag" in response.headers
+        or not response.headers.get("content-type", "").startswith(
+            "application/json"
+        )
+    ):
+        return response
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    cached = CachedResponse(
+        body=body,
+        etag=content_etag(body),
+        media_type=response.headers.get("content-type"),
+    )
+
+    if key is not None:
+        response_cache.set(key, cached, generation)
+
+    return conditional_response(
+        request,
+        cached,
+        headers={
+            name: value
+            for name, value in response.headers.items()
+            if name not in ("content-length", "content-type")
+        },
+    )
+
+
+"""
+Invalidation
+"""
+
+
+@on_commit
+def invalidate_response_cache(tables: set[str | None]):
+    response_cache.invalidate()
@@ -1,16 +1,17 @@
 import jwt
 
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jwt.exceptions import InvalidTokenError
 from pydantic import ValidationError
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import Annotated
 
 from incidentbot.configuration.settings import settings
 from incidentbot.models.database import TokenPayload, User
-from incidentbot.models.database import engine
+from incidentbot.models.database import async_engine, db_session, engine
 from incidentbot.util.security import ALGORITHM
 
 reusable_oauth2 = OAuth2PasswordBearer(
@@ -19,11 +20,17 @@ reusable_oauth2 = OAuth2PasswordBearer(
 
 
 def get_db() -> Generator[Session, None, None]:
-    with Session(engine) as session:
+    with db_session(engine) as session:
+        yield session
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSession(async_engine) as session:
         yield session
 
 
 SessionDep = Annotated[Session, Depends(get_db)]
+AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_db)]
 TokenDep = Annotated[str, Depends(reusable_oauth2)]
 
 
@@ -1,4 +1,6 @@
+from incidentbot.api.cache import conditional_get
 from incidentbot.api.routes import (
+    analytics,
     health,
     incident,
     job,
@@ -9,6 +11,7 @@ from incidentbot.api.routes import (
     users,
 )
 from incidentbot.configuration.settings import settings, __version__
+from incidentbot.models.database import unit_of_work
 
 from fastapi import (
     APIRouter,
@@ -36,6 +39,21 @@ app = FastAPI(
     redoc_url="/redoc" if settings.api.enable_redoc_endpoint else None,
 )
 
+
+@app.middleware("http")
+async def database_unit_of_work(request: Request, call_next):
+    """
+    Runs each request in one database unit of work
+    """
+
+    with unit_of_work():
+        return await call_next(request)
+
+
+# Middleware added later wraps middleware added earlier - cached responses
+# skip the unit of work but still get CORS headers
+app.middleware("http")(conditional_get)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -64,6 +82,7 @@ api_router = APIRouter()
 api_router.include_router(health.router, tags=["health"])
 
 if settings.api.enabled:
+    api_router.include_router(analytics.router, tags=["analytics"])
     api_router.include_router(incident.router, tags=["incident"])
     api_router.include_router(job.router, tags=["job"])
     api_router.include_router(login.router, tags=["login"])
@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from incidentbot.api.deps import get_current_active_superuser
+from incidentbot.models.analytics import (
+    AnalyticsDatabaseInterface,
+    AnalyticsSummary,
+    dimensions,
+    periods,
+    StatusTime,
+    TrendPoint,
+)
+
+router = APIRouter()
+
+
+def analytics_window(
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> tuple[datetime, datetime]:
+    """
+    Return the requested window, the last 90 days by default
+    """
+
+    until = until or datetime.now()
+    since = since or until - timedelta(days=90)
+
+    if since > until:
+        raise HTTPException(
+            status_code=400, detail="since must be before until"
+        )
+
+    return since, until
+
+
+"""
+/analytics
+"""
+
+
+@router.get(
+    "/analytics/summary",
+    dependencies=[Depends(get_current_active_superuser)],
+    status_code=status.HTTP_200_OK,
+)
+def get_summary(
+    window: tuple[datetime, datetime] = Depends(analytics_window),
+) -> AnalyticsSummary:
+    """
+    Counts, participants and time to resolve percentiles for incidents
+    opened in the window
+    """
+
+    try:
+        return AnalyticsDatabaseInterface.summary(*window)
+    except Exception as error:
+        raise HTTPException(status_code=500, detail=str(error))
+
+
+@router.get(
+    "/analytics/status_time",
+    dependencies=[Depends(get_current_active_superuser)],
+    status_code=status.HTTP_200_OK,
+)
+def get_status_times(
+    window: tuple[datetime, datetime] = Depends(analytics_window),
+) -> list[StatusTime]:
+    """
+    Seconds spent in each status by incidents opened in the window
+    """
+
+    try:
+        return AnalyticsDatabaseInterface.status_times(*window)
+    except Exception as error:
+        raise HTTPException(status_code=500, detail=str(error))
+
+
+@router.get(
+    "/analytics/trends",
+    dependencies=[Depends(get_current_active_superuser)],
+    status_code=status.HTTP_200_OK,
+)
+def get_trends(
+    window: tuple[datetime, datetime] = Depends(analytics_window),
+    period: str = Query(default="week", pattern=f"^({'|'.join(periods)})$"),
+    dimension: str = Query(
+        default="all", pattern=f"^({'|'.join(dimensions)})$"
+    ),
+) -> list[TrendPoint]:
+    """
+    Opened and resolved counts per day or week for each value of a
+    dimension
+    """
+
+    try:
+        return AnalyticsDatabaseInterface.trends(
+            period=period,
+            dimension=dimension,
+            since=window[0],
+            until=window[1],
+        )
+    except Exception as error:
+        raise HTTPException(status_code=500, detail=str(error))
@@ -1,17 +1,32 @@
 import asyncio
 import base64
-
-from fastapi import APIRouter, Depends, HTTPException, Response, status
-from incidentbot.api.deps import get_current_active_superuser, SessionDep
+import uuid
+
+from datetime import datetime
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from incidentbot.api.deps import (
+    AsyncSessionDep,
+    get_current_active_superuser,
+)
 from incidentbot.incident.actions import (
     set_description,
     set_severity,
     set_status,
 )
+from incidentbot.archive.core import restore_incident
 from incidentbot.incident.core import Incident, IncidentRequestParameters
 from incidentbot.incident.event import EventLogHandler
 from incidentbot.models.database import (
-    ApplicationData,
+    IncidentArchiveRecord,
     IncidentEvent,
     IncidentEventBase,
     IncidentParticipant,
@@ -22,11 +37,19 @@ from incidentbot.models.database import (
     PostmortemRecord,
     StatuspageIncidentRecord,
 )
+from incidentbot.models.incident import (
+    incident_collections,
+    IncidentDatabaseInterface,
+    IncidentDetail,
+    IncidentSearchResult,
+)
 from incidentbot.models.response import SuccessResponse
+from incidentbot.slack.client import list_slack_users
 from pydantic import BaseModel
 from sqlalchemy.exc import NoResultFound
-from sqlmodel import col, select
-from typing import Any
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import Annotated, Any, Callable
 
 router = APIRouter()
 
@@ -34,6 +57,68 @@ router = APIRouter()
 class Incidents(BaseModel):
     data: list[IncidentRecord]
     count: int
+    next_cursor: str | None = None
+
+
+class IncidentSearchResults(BaseModel):
+    data: list[IncidentSearchResult]
+    count: int
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Return an opaque cursor holding the values of a keyset position
+
+    Parameters:
+        values (Any): The values, in order
+    """
+
+    return base64.urlsafe_b64encode(
+        "|".join(
+            value.isoformat() if isinstance(value, datetime) else str(value)
+            for value in values
+        ).encode()
+    ).decode()
+
+
+def decode_cursor(cursor: str, *parsers: Callable[[str], Any]) -> tuple:
+    """
+    Return the values stored in a cursor, each converted by its parser
+
+    Parameters:
+        cursor (str): Cursor returned by a previous request
+        parsers (Callable): One per value, e.g. int or datetime.fromisoformat
+    """
+
+    try:
+        values = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+
+        if len(values) != len(parsers):
+            raise ValueError("wrong number of values")
+
+        return tuple(parse(value) for parse, value in zip(parsers, values))
+    except Exception:
+        raise HTTPException(status_code=400, detail="invalid cursor")
+
+
+async def incident_not_found(
+    session: AsyncSession, slug: str
+) -> HTTPException:
+    """
+    Return the error for an incident that wasn't found - 410 if it was
+    archived, otherwise 404
+    """
+
+    if (
+        await session.exec(
+            select(IncidentArchiveRecord.id).filter(
+                IncidentArchiveRecord.slug == slug
+            )
+        )
+    ).first():
+        return HTTPException(status_code=410, detail="incident archived")
+
+    return HTTPException(status_code=404, detail="incident not found")
 
 
 """
@@ -47,48 +132,194 @@ class Incidents(BaseModel):
     status_code=status.HTTP_200_OK,
 )
 async def get_incidents(
-    session: SessionDep,
+    session: AsyncSessionDep,
+    cursor: str = None,
     skip: int = 0,
     limit: int = 100,
     filter: str = None,
 ) -> Incidents:
+    """
+    List incidents newest first - pass next_cursor from the response as
+    cursor to fetch the following page
+    """
+
+    before = (
+        decode_cursor(cursor, datetime.fromisoformat, int) if cursor else None
+    )
+
     try:
+        query = select(IncidentRecord)
+
         if filter:
-            incidents = session.exec(
-                select(IncidentRecord)
-                .where(col(IncidentRecord.description).contains(filter))
-                .order_by(IncidentRecord.slug)
-            ).all()
+            query = query.where(
+                IncidentDatabaseInterface.search_filter(filter)
+            )
+
+        incidents = (
+            await session.exec(
+                IncidentDatabaseInterface.keyset_page(
+                    query=query, before=before
+                )
+                .offset(skip)
+                .limit(limit)
+            )
+        ).all()
+
+        return Incidents(
+            data=incidents,
+            count=len(incidents),
+            next_cursor=(
+                encode_cursor(incidents[-1].created_at, incidents[-1].id)
+                if len(incidents) == limit
+                else None
+            ),
+        )
+    except Exception as error:
+        raise HTTPException(status_code=500, detail=str(error))
 
-            return Incidents(data=incidents, count=len(incidents))
 
-        incidents = session.exec(
-            select(IncidentRecord).offset(skip).limit(limit).order_by("id")
+@router.get(
+    "/incident/archive",
+    dependencies=[Depends(get_current_active_superuser)],
+    status_code=status.HTTP_200_OK,
+)
+async def get_archived_incidents(
+    session: AsyncSessionDep,
+    limit: int = Query(default=100, ge=1, le=1000),
+    offset: int = Query(default=0, ge=0),
+) -> list[IncidentArchiveRecord]:
+    """
+    List tombstones of archived incidents, most recently archived first
+    """
+
+    try:
+        return (
+            await session.exec(
+                select(IncidentArchiveRecord)
+                .order_by(
+                    IncidentArchiveRecord.archived_at.desc(),
+                    IncidentArchiveRecord.id.desc(),
+                )
+                .offset(offset)
+                .limit(limit)
+            )
         ).all()
+    except Exception as error:
+        raise HTTPException(status_code=500, detail=str(error))
 
-        return Incidents(data=incidents, count=len(incidents))
+
+@router.post(
+    "/incident/archive/{slug}/restore",
+    dependencies=[Depends(get_current_active_superuser)],
+    status_code=status.HTTP_200_OK,
+)
+async def restore_archived_incident(slug: str) -> IncidentRecord:
+    """
+    Reimport an archived incident into the database
+    """
+
+    try:
+        return await asyncio.to_thread(restore_incident, slug)
+    except NoResultFound:
+        raise HTTPException(
+            status_code=404, detail="archived incident not found"
+        )
     except Exception as error:
         raise HTTPException(status_code=500, detail=str(error))
 
 
+@router.get(
+    "/incident/search",
+    dependencies=[Depends(get_current_active_superuser)],
+    status_code=status.HTTP_200_OK,
+)
+def search_incidents(
+    q: str,
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0),
+) -> IncidentSearchResults:
+    """
+    Search incidents and their timelines, best match first
+    """
+
+    results = IncidentDatabaseInterface.search(
+        terms=q, limit=limit, offset=offset
+    )
+    if results is None:
+        raise HTTPException(status_code=500, detail="search failed")
+
+    return IncidentSearchResults(data=results, count=len(results))
+
+
 @router.get(
     "/incident/{slug}",
     dependencies=[Depends(get_current_active_superuser)],
     status_code=status.HTTP_200_OK,
 )
-async def get_incident(session: SessionDep, slug: str) -> IncidentRecord:
+async def get_incident(session: AsyncSessionDep, slug: str) -> IncidentRecord:
     try:
-        incident = session.exec(
-            select(IncidentRecord).filter(IncidentRecord.slug == slug)
+        incident = (
+            await session.exec(
+                select(IncidentRecord).filter(IncidentRecord.slug == slug)
+            )
         ).one()
 
         return incident
     except NoResultFound:
-        raise HTTPException(status_code=404, detail="incident not found")
+        raise await incident_not_found(session, slug)
     except Exception as error:
         raise HTTPException(status_code=500, detail=str(error))
 
 
+@router.get(
+    "/incident/{slug}/full",
+    dependencies=[Depends(get_current_active_superuser)],
+    status_code=status.HTTP_200_OK,
+)
+async def get_incident_detail(
+    session: AsyncSessionDep,
+    slug: str,
+    include: str = None,
+) -> IncidentDetail:
+    """
+    Return an incident together with its artifacts, participants and events
+    in one response - pass a comma separated include, e.g.
+    include=jira,participants, to load only some collections, all are loaded
+    by default
+    """
+
+    names = (
+        sorted(incident_collections)
+        if include is None
+        else list(
+            dict.fromkeys(
+                name.strip() for name in include.split(",") if name.strip()
+            )
+        )
+    )
+    unknown = [name for name in names if name not in incident_collections]
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"unknown include {', '.join(unknown)}"
+        )
+
+    try:
+        row = (
+            await session.exec(
+                IncidentDatabaseInterface.detail_query(
+                    slug=slug, include=names
+                )
+            )
+        ).first()
+    except Exception as error:
+        raise HTTPException(status_code=500, detail=str(error))
+
+    if row is None:
+        raise await incident_not_found(session, slug)
+
+    return IncidentDatabaseInterface.detail_from_row(row=row, include=names)
+
+
 # Artifacts
 
 
@@ -98,16 +329,20 @@ async def get_incident(session: SessionDep, slug: str) -> IncidentRecord:
     status_code=status.HTTP_200_OK,
 )
 async def get_incident_jira_issues(
-    session: SessionDep, slug: str
+    session: AsyncSessionDep, slug: str
 ) -> list[JiraIssueRecord]:
     try:
-        incident = session.exec(
-            select(IncidentRecord).filter(IncidentRecord.slug == slug)
+        incident = (
+            await session.exec(
+                select(IncidentRecord).filter(IncidentRecord.slug == slug)
+            )
         ).one()
 
-        records = session.exec(
-            select(JiraIssueRecord).filter(
-                JiraIssueRecord.parent == incident.id
+        records = (
+            await session.exec(
+                select(JiraIssueRecord).filter(
+                    JiraIssueRecord.parent == incident.id
+                )
             )
         ).all()
 
@@ -124,16 +359,20 @@ async def get_incident_jira_issues(
     status_code=status.HTTP_200_OK,
 )
 async def get_incident_pagerduty(
-    session: SessionDep, slug: str
+    session: AsyncSessionDep, slug: str
 ) -> list[PagerDutyIncidentRecord]:
     try:
-        incident = session.exec(
-            select(IncidentRecord).filter(IncidentRecord.slug == slug)
+        incident = (
+            await session.exec(
+                select(IncidentRecord).filter(IncidentRecord.slug == slug)
+            )
         ).one()
 
-        records = session.exec(
-            select(PagerDutyIncidentRecord).filter(
-                PagerDutyIncidentRecord.parent == incident.id
+        records = (
+            await session.exec(
+                select(PagerDutyIncidentRecord).filter(
+                    PagerDutyIncidentRecord.parent == incident.id
+                )
             )
         ).all()
 
@@ -150,16 +389,20 @@ async def get_incident_pagerduty(
     status_code=status.HTTP_200_OK,
 )
 async def get_incident_postmortems(
-    session: SessionDep, slug: str
+    session: AsyncSessionDep, slug: str
 ) -> list[PostmortemRecord]:
     try:
-        incident = session.exec(
-            select(IncidentRecord).filter(IncidentRecord.slug == slug)
+        incident = (
+            await session.exec(
+                select(IncidentRecord).filter(IncidentRecord.slug == slug)
+            )
         ).one()
 
-        records = session.exec(
-            select(PostmortemRecord).filter(
-                PostmortemRecord.parent == incident.id
+        records = (
+            await session.exec(
+                select(PostmortemRecord).filter(
+                    PostmortemRecord.parent == incident.id
+                )
             )
         ).all()
 
@@ -176,16 +419,20 @@ async def get_incident_postmortems(
     status_code=status.HTTP_200_OK,
 )
 async def get_incident_statuspage(
-    session: SessionDep, slug: str
+    session: AsyncSessionDep, slug: str
 ) -> list[StatuspageIncidentRecord]:
     try:
-        incident = session.exec(
-            select(IncidentRecord).filter(IncidentRecord.slug == slug)
+        incident = (
+            await session.exec(
+                select(IncidentRecord).filter(IncidentRecord.slug == slug)
+            )
         ).one()
 
-        records = session.exec(
-            select(StatuspageIncidentRecord).filter(
-                StatuspageIncidentRecord.parent == incident.id
+        records = (
+            await session.exec(
+                select(StatuspageIncidentRecord).filter(
+                    StatuspageIncidentRecord.parent == incident.id
+                )
             )
         ).all()
 
@@ -202,16 +449,20 @@ async def get_incident_statuspage(
     status_code=status.HTTP_200_OK,
 )
 async def get_incident_gitlab_issues(
-    session: SessionDep, slug: str
+    session: AsyncSessionDep, slug: str
 ) -> list[GitlabIssueRecord]:
     try:
-        incident = session.exec(
-            select(IncidentRecord).filter(IncidentRecord.slug == slug)
+        incident = (
+            await session.exec(
+                select(IncidentRecord).filter(IncidentRecord.slug == slug)
+            )
         ).one()
 
-        records = session.exec(
-            select(GitlabIssueRecord).filter(
-                GitlabIssueRecord.parent == incident.id
+        records = (
+            await session.exec(
+                select(GitlabIssueRecord).filter(
+                    GitlabIssueRecord.parent == incident.id
+                )
             )
         ).all()
 
@@ -231,16 +482,20 @@ async def get_incident_gitlab_issues(
     status_code=status.HTTP_200_OK,
 )
 async def get_incident_participants(
-    session: SessionDep, slug: str
+    session: AsyncSessionDep, slug: str
 ) -> list[IncidentParticipant]:
     try:
-        incident = session.exec(
-            select(IncidentRecord).filter(IncidentRecord.slug == slug)
+        incident = (
+            await session.exec(
+                select(IncidentRecord).filter(IncidentRecord.slug == slug)
+            )
         ).one()
 
-        records = session.exec(
-            select(IncidentParticipant).filter(
-                IncidentParticipant.parent == incident.id
+        records = (
+            await session.exec(
+                select(IncidentParticipant).filter(
+                    IncidentParticipant.parent == incident.id
+                )
             )
         ).all()
 
@@ -259,7 +514,7 @@ async def get_incident_participants(
     dependencies=[Depends(get_current_active_superuser)],
     status_code=status.HTTP_200_OK,
 )
-async def post_incident(request: IncidentRecord):
+def post_incident(request: IncidentRecord):
     try:
         incident = Incident(
             params=IncidentRequestParameters(
@@ -288,7 +543,7 @@ async def post_incident(request: IncidentRecord):
     dependencies=[Depends(get_current_active_superuser)],
     status_code=status.HTTP_200_OK,
 )
-async def delete_incident(
+def delete_incident(
     id: str,
 ) -> SuccessResponse:
     try:
@@ -355,40 +610,98 @@ def patch_incident(incident: IncidentRecord, field: str):
     status_code=status.HTTP_200_OK,
 )
 def get_incident_events(
+    response: Response,
     slug: str,
+    cursor: str = None,
+    limit: int = None,
+    since: str = None,
 ) -> list[IncidentEventBase]:
     """
     Return events excluding the image field
 
     If there is an image present, an additional request will have to be made
-    against the following endpoint to get the iamge specifically
+    against the following endpoint to get the image specifically
+
+    With limit, events are returned in pages - pass the X-Next-Cursor response
+    header as cursor to fetch the following page. The X-Since-Cursor header
+    of the first page can be passed as since to later fetch only the events
+    added or edited since that page was read
     """
+
+    after = decode_cursor(cursor, str, uuid.UUID) if cursor else None
+    changes_since = decode_cursor(since, int)[0] if since else None
+
     try:
-        records = EventLogHandler.read(incident_slug=slug)
-
-        return [
-            IncidentEventBase(
-                created_at=record.created_at,
-                id=record.id,
-                incident_slug=record.incident_slug,
-                message_ts=record.message_ts,
-                mimetype=record.mimetype,
-                parent=record.parent,
-                source=record.source,
-                text=record.text,
-                timestamp=record.timestamp,
-                title=record.title,
-                updated_at=record.updated_at,
-                user=record.user,
+        records = EventLogHandler.read_summaries(
+            incident_slug=slug,
+            after=after,
+            since=changes_since,
+            limit=limit,
+        )
+
+        # Taken from the returned rows - an event added or edited after they
+        # were read is given a higher change_seq, while one not yet
+        # committed holds a lock that keeps later events of the incident
+        # from being numbered before it
+        if changes_since is not None:
+            latest = records[-1].change_seq if records else changes_since
+        elif not after:
+            latest = max(
+                (r.change_seq for r in records if r.change_seq is not None),
+                default=0,
+            )
+        else:
+            latest = None
+
+        if latest is not None:
+            response.headers["X-Since-Cursor"] = encode_cursor(latest)
+        if limit and len(records) == limit and changes_since is None:
+            response.headers["X-Next-Cursor"] = encode_cursor(
+                records[-1].message_ts, records[-1].id
             )
-            for record in records
-        ]
+
+        return records
     except NoResultFound:
         raise HTTPException(status_code=404, detail="incident not found")
     except Exception as error:
         raise HTTPException(status_code=500, detail=str(error))
 
 
+def parse_byte_range(header: str, size: int) -> tuple[int, int] | None:
+    """
+    Return the first and last byte requested by a Range header, or None if
+    the header should be ignored and the whole content returned - raises
+    ValueError when the range can't be satisfied
+
+    Parameters:
+        header (str): Value of the Range header
+        size (int): Size of the content
+    """
+
+    unit, _, spec = header.partition("=")
+
+    # Multiple ranges aren't supported, the full content is a valid response
+    if unit.strip() != "bytes" or "," in spec:
+        return None
+
+    first, _, last = spec.strip().partition("-")
+
+    try:
+        if not first:
+            # Suffix range, e.g. bytes=-500
+            start, end = max(0, size - int(last)), size - 1
+        else:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+    except ValueError:
+        return None
+
+    if start >= size or start > end:
+        raise ValueError(f"range {header} not satisfiable for size {size}")
+
+    return start, end
+
+
 @router.get(
     "/incident/{slug}/events/image/{id}",
     dependencies=[Depends(get_current_active_superuser)],
@@ -398,22 +711,72 @@ def get_incident_events(
 def get_incident_event_image(
     slug: str,
     id: str,
+    encoding: str = None,
+    if_none_match: Annotated[str | None, Header()] = None,
+    range_header: Annotated[str | None, Header(alias="range")] = None,
 ):
     """
-    Returns only the image content and mimetype when an event contains an image
+    Returns the raw image content of an event with its mimetype
+
+    Images never change once stored, so responses carry an ETag and may be
+    cached indefinitely. Range requests are supported. Pass encoding=base64
+    to receive the whole image base64 encoded instead
     """
 
-    try:
-        event = EventLogHandler.read_one(id=id, incident_slug=slug)
+    event = EventLogHandler.read_one(id=id, incident_slug=slug)
 
+    if not event or not event.image_size:
+        raise HTTPException(status_code=404, detail="image not found")
+
+    etag = f'"{event.image_ref or event.id}"'
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, max-age=31536000, immutable",
+        "ETag": etag,
+    }
+
+    if if_none_match and (
+        if_none_match.strip() == "*"
+        or etag in [tag.strip() for tag in if_none_match.split(",")]
+    ):
+        return Response(status_code=304, headers=headers)
+
+    if encoding == "base64":
         return Response(
-            content=base64.b64encode(event.image).decode("utf-8"),
+            content=base64.b64encode(EventLogHandler.read_image(event)).decode(
+                "utf-8"
+            ),
+            headers=headers,
             media_type=event.mimetype,
         )
-    except NoResultFound:
-        raise HTTPException(status_code=404, detail="incident not found")
-    except Exception as error:
-        raise HTTPException(status_code=500, detail=str(error))
+
+    size = event.image_size
+    start, end = 0, size - 1
+    status_code = 200
+
+    if range_header:
+        try:
+            requested = parse_byte_range(header=range_header, size=size)
+        except ValueError:
+            raise HTTPException(
+                status_code=416,
+                detail="requested range not satisfiable",
+                headers={"Content-Range": f"bytes */{size}"},
+            )
+
+        if requested:
+            start, end = requested
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            status_code = 206
+
+    headers["Content-Length"] = str(end - start + 1)
+
+    return StreamingResponse(
+        EventLogHandler.stream_image(event=event, start=start, end=end),
+        headers=headers,
+        media_type=event.mimetype,
+        status_code=status_code,
+    )
 
 
 @router.delete(
@@ -466,19 +829,11 @@ class ConfigurationResponse(BaseModel):
     dependencies=[Depends(get_current_active_superuser)],
     status_code=status.HTTP_200_OK,
 )
-async def get_incident_config(
-    session: SessionDep, parameter: str
-) -> ConfigurationResponse:
+def get_incident_config(parameter: str) -> ConfigurationResponse:
     try:
         match parameter:
             case "users":
-                record = session.exec(
-                    select(ApplicationData).filter(
-                        ApplicationData.name == "slack_users"
-                    )
-                ).one()
-
-                return ConfigurationResponse(data=record.json_data)
+                return ConfigurationResponse(data=list_slack_users())
             case _:
                 raise HTTPException(status_code=404, detail="not found")
     except Exception as error:
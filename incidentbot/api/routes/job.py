@@ -1,8 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from incidentbot.api.deps import get_current_active_superuser
 from incidentbot.configuration.settings import settings
+from incidentbot.models.analytics import AnalyticsDatabaseInterface
 from incidentbot.models.response import SuccessResponse
+from incidentbot.queue.core import process as WorkQueue
 from incidentbot.scheduler.core import (
+    archive_incidents,
+    migrate_event_images,
     process as TaskScheduler,
     scrape_for_aging_incidents,
 )
@@ -15,6 +19,10 @@ router = APIRouter()
 
 
 protected_jobs = [
+    "archive_incidents",
+    "migrate_event_images",
+    "process_incident_reminders",
+    "resume_incident_creations",
     "scrape_for_aging_incidents",
     "update_pagerduty_oc_data",
     "update_slack_channel_list",
@@ -27,7 +35,7 @@ protected_jobs = [
     dependencies=[Depends(get_current_active_superuser)],
     status_code=status.HTTP_200_OK,
 )
-async def get_jobs() -> list[dict]:
+def get_jobs() -> list[dict]:
     try:
         return [
             {
@@ -43,13 +51,40 @@ async def get_jobs() -> list[dict]:
         raise HTTPException(status_code=500, detail=str(error))
 
 
+@router.get(
+    "/job/queue",
+    dependencies=[Depends(get_current_active_superuser)],
+    status_code=status.HTTP_200_OK,
+)
+def get_work_queue() -> dict:
+    try:
+        return WorkQueue.stats()
+    except Exception as error:
+        raise HTTPException(status_code=500, detail=str(error))
+
+
 @router.post(
     "/job/run/{job_id}",
     dependencies=[Depends(get_current_active_superuser)],
     status_code=status.HTTP_200_OK,
 )
-async def run_job(job_id) -> SuccessResponse:
+def run_job(job_id) -> SuccessResponse:
     match job_id:
+        case "archive_incidents":
+            try:
+                archive_incidents()
+            except Exception as error:
+                raise HTTPException(status_code=500, detail=str(error))
+        case "migrate_event_images":
+            try:
+                migrate_event_images()
+            except Exception as error:
+                raise HTTPException(status_code=500, detail=str(error))
+        case "rebuild_analytics":
+            try:
+                AnalyticsDatabaseInterface.rebuild()
+            except Exception as error:
+                raise HTTPException(status_code=500, detail=str(error))
         case "scrape_for_aging_incidents":
             try:
                 scrape_for_aging_incidents()
@@ -97,7 +132,7 @@ async def run_job(job_id) -> SuccessResponse:
     dependencies=[Depends(get_current_active_superuser)],
     status_code=status.HTTP_200_OK,
 )
-async def delete_job(job_id) -> SuccessResponse:
+def delete_job(job_id) -> SuccessResponse:
     if job_id not in protected_jobs:
         try:
             TaskScheduler.delete_job(job_id)
@@ -1,7 +1,10 @@
 import uuid
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from incidentbot.api.deps import get_current_active_superuser, SessionDep
+from incidentbot.api.deps import (
+    AsyncSessionDep,
+    get_current_active_superuser,
+)
 from incidentbot.logging import logger
 from incidentbot.models.database import (
     MaintenanceWindowRecord,
@@ -24,10 +27,12 @@ class MaintenanceWindows(BaseModel):
     dependencies=[Depends(get_current_active_superuser)],
     status_code=status.HTTP_200_OK,
 )
-async def get_maintenance_windows(session: SessionDep) -> MaintenanceWindows:
+async def get_maintenance_windows(
+    session: AsyncSessionDep,
+) -> MaintenanceWindows:
     try:
-        maintenance_windows = session.exec(
-            select(MaintenanceWindowRecord)
+        maintenance_windows = (
+            await session.exec(select(MaintenanceWindowRecord))
         ).all()
 
         return MaintenanceWindows(
@@ -42,11 +47,13 @@ async def get_maintenance_windows(session: SessionDep) -> MaintenanceWindows:
     dependencies=[Depends(get_current_active_superuser)],
     status_code=status.HTTP_200_OK,
 )
-async def get_maintenance_window(session: SessionDep, id: uuid.UUID):
+async def get_maintenance_window(session: AsyncSessionDep, id: uuid.UUID):
     try:
-        maintenance_window = session.exec(
-            select(MaintenanceWindowRecord).filter(
-                MaintenanceWindowRecord.id == id
+        maintenance_window = (
+            await session.exec(
+                select(MaintenanceWindowRecord).filter(
+                    MaintenanceWindowRecord.id == id
+                )
             )
         ).one()
 
@@ -65,19 +72,21 @@ async def get_maintenance_window(session: SessionDep, id: uuid.UUID):
     status_code=status.HTTP_200_OK,
 )
 async def delete_maintenance_window(
-    session: SessionDep,
+    session: AsyncSessionDep,
     id: str,
 ):
     try:
-        record = session.exec(
-            select(MaintenanceWindowRecord).filter(
-                MaintenanceWindowRecord.id == id
+        record = (
+            await session.exec(
+                select(MaintenanceWindowRecord).filter(
+                    MaintenanceWindowRecord.id == id
+                )
             )
         ).one()
 
         logger.info(f"Deleting maintenance window {record.title}")
-        session.delete(record)
-        session.commit()
+        await session.delete(record)
+        await session.commit()
 
         return SuccessResponse(
             result="success", message="maintenance window deleted"
@@ -1,40 +1,55 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from incidentbot.api.deps import get_current_active_superuser, SessionDep
+from incidentbot.api.deps import get_current_active_superuser
 from incidentbot.configuration.settings import settings
+from incidentbot.models.application_data import (
+    ApplicationDataInterface,
+    ApplicationDataKey,
+    auto_page_teams,
+    pagerduty_auto_mapping,
+    pagerduty_oc_data,
+)
 from incidentbot.models.database import ApplicationData
 from incidentbot.models.pager import PagerAutoMappingRequest
 from incidentbot.models.response import (
     PagerDataResponse,
     SuccessResponse,
 )
-from sqlmodel import select
 
 router = APIRouter()
 
 
+def stored_record(key: ApplicationDataKey) -> ApplicationData:
+    """
+    Return the row stored under a key or raise a 404
+    """
+
+    record = ApplicationDataInterface.get_record(key.name)
+    if record is None:
+        raise HTTPException(
+            status_code=404, detail=f"{key.name} has not been stored yet"
+        )
+
+    return record
+
+
 @router.get(
     "/pager",
     dependencies=[Depends(get_current_active_superuser)],
     status_code=status.HTTP_200_OK,
 )
-def get_pager(session: SessionDep) -> PagerDataResponse | SuccessResponse:
+def get_pager() -> PagerDataResponse | SuccessResponse:
     if (
         settings.integrations
         and settings.integrations.pagerduty
         and settings.integrations.pagerduty.enabled
     ):
-        try:
-
-            data = (
-                session.exec(select(ApplicationData))
-                .filter(ApplicationData.name == "pagerduty_oc_data")
-                .first()
-            )
+        data = stored_record(pagerduty_oc_data)
 
+        try:
             return PagerDataResponse(
                 platform="pagerduty",
                 data=data.json_data,
-                ts=data.updated_at,
+                ts=str(data.updated_at),
             )
         except Exception as error:
             raise HTTPException(status_code=500, detail=str(error))
@@ -47,23 +62,15 @@ def get_pager(session: SessionDep) -> PagerDataResponse | SuccessResponse:
     dependencies=[Depends(get_current_active_superuser)],
     status_code=status.HTTP_200_OK,
 )
-def get_pager_automapping(session: SessionDep) -> dict | SuccessResponse:
+def get_pager_automapping() -> dict | SuccessResponse:
     if (
         settings.integrations
         and settings.integrations.pagerduty
         and settings.integrations.pagerduty.enabled
     ):
-        try:
-
-            data = session.exec(
-                select(ApplicationData)
-                .filter(ApplicationData.name == "pagerduty_auto_mapping")
-                .one()
-            )
+        data = stored_record(pagerduty_auto_mapping)
 
-            return {"data": data.json_data, "ts": data.updated_at}
-        except Exception as error:
-            raise HTTPException(status_code=500, detail=str(error))
+        return {"data": data.json_data, "ts": data.updated_at}
 
     return SuccessResponse(result="success", message="feature_not_enabled")
 
@@ -73,27 +80,18 @@ def get_pager_automapping(session: SessionDep) -> dict | SuccessResponse:
     dependencies=[Depends(get_current_active_superuser)],
     status_code=status.HTTP_200_OK,
 )
-def get_pager_store_automapping(session: SessionDep) -> dict | SuccessResponse:
+def get_pager_store_automapping() -> dict | SuccessResponse:
     if (
         settings.integrations
         and settings.integrations.pagerduty
         and settings.integrations.pagerduty.enabled
     ):
-        try:
-
-            data = (
-                session.exec(select(ApplicationData))
-                .filter(ApplicationData.name == "auto_page_teams")
-                .first()
-            )
+        data = stored_record(auto_page_teams)
 
-            return {
-                "data": data.json_data,
-                "ts": data.updated_at,
-            }
-
-        except Exception as error:
-            raise HTTPException(status_code=500, detail=str(error))
+        return {
+            "data": data.json_data,
+            "ts": data.updated_at,
+        }
     else:
         return SuccessResponse(result="success", message="feature_not_enabled")
 
@@ -104,7 +102,6 @@ def get_pager_store_automapping(session: SessionDep) -> dict | SuccessResponse:
     status_code=status.HTTP_200_OK,
 )
 def patch_pager_automapping(
-    session: SessionDep,
     request: PagerAutoMappingRequest,
 ) -> SuccessResponse:
     if (
@@ -112,16 +109,13 @@ def patch_pager_automapping(
         and settings.integrations.pagerduty
         and settings.integrations.pagerduty.enabled
     ):
-        v = request.json["value"]
         try:
-
-            data = (
-                session.exec(select(ApplicationData))
-                .filter(ApplicationData.name == "auto_page_teams")
-                .first()
-            )
-            data.json_data = {"teams": v}
-            session.commit()
+            if not ApplicationDataInterface.put(
+                auto_page_teams, {"teams": request.value}
+            ):
+                return SuccessResponse(
+                    result="success", message="data unchanged"
+                )
 
             return SuccessResponse(result="success", message="data stored")
         except Exception as error:
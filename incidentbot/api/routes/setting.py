@@ -1,8 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from incidentbot.api.deps import get_current_active_superuser, SessionDep
-from incidentbot.models.database import ApplicationData
-from incidentbot.slack.client import slack_workspace_id
-from sqlalchemy.exc import NoResultFound
+from incidentbot.models.application_data import ApplicationDataInterface
+from incidentbot.models.database import ApplicationData, pool_stats
+from incidentbot.slack.client import (
+    list_slack_users,
+    slack_web_client,
+    slack_workspace_id,
+)
 from sqlmodel import select
 
 router = APIRouter()
@@ -28,30 +32,30 @@ def get_settings(session: SessionDep) -> list[ApplicationData]:
     dependencies=[Depends(get_current_active_superuser)],
     status_code=status.HTTP_200_OK,
 )
-def get_setting(session: SessionDep, setting_name: str) -> ApplicationData:
+def get_setting(setting_name: str) -> ApplicationData:
     match setting_name:
+        case "database_pool_stats":
+            return ApplicationData(
+                name="database_pool_stats", json_data=pool_stats()
+            )
+        case "slack_api_stats":
+            return ApplicationData(
+                name="slack_api_stats", json_data=slack_web_client.stats()
+            )
         case "slack_users":
-            data = session.exec(
-                select(ApplicationData).filter(
-                    ApplicationData.name == "slack_users"
-                )
-            ).first()
-
-            return ApplicationData(name="slack_users", value=data.json_data)
+            return ApplicationData(
+                name="slack_users", value=list_slack_users()
+            )
         case "slack_workspace_id":
             return ApplicationData(
                 name="slack_workspace_id", value=[slack_workspace_id]
             )
         case _:
-            try:
-                setting = session.exec(
-                    select(ApplicationData.name == setting_name)
-                ).first()
+            setting = ApplicationDataInterface.get_record(setting_name)
 
-                return setting
-            except NoResultFound:
+            if setting is None:
                 raise HTTPException(
                     status_code=404, detail="setting not found"
                 )
-            except Exception as error:
-                raise HTTPException(status_code=500, detail=str(error))
+
+            return setting
@@ -0,0 +1,328 @@
+import base64
+import gzip
+import io
+import json
+import uuid
+
+from datetime import date, datetime, timedelta
+from functools import cache
+from incidentbot.blobstore.core import (
+    BlobStore,
+    get_blob_store,
+    LocalBlobStore,
+)
+from incidentbot.configuration.settings import ArchiveIncidentsJob, settings
+from incidentbot.exceptions import ConfigurationError
+from incidentbot.logging import logger
+from incidentbot.models.database import (
+    db_session,
+    engine,
+    IncidentArchiveRecord,
+    IncidentRecord,
+)
+from sqlalchemy import Column, delete, insert, or_, Table
+from sqlmodel import select, SQLModel
+from typing import Any, Iterator
+
+"""
+Archive
+
+Old incidents are moved out of the database into gzip compressed NDJSON
+archives - one line per row of the incident and of every table referencing
+it - with event images in a separate sidecar archive. A tombstone row in
+incident_archive records where an incident went so it can be restored
+"""
+
+archive_version = 1
+
+
+def job_settings() -> ArchiveIncidentsJob:
+    return (
+        settings.jobs.archive_incidents
+        if settings.jobs and settings.jobs.archive_incidents
+        else ArchiveIncidentsJob()
+    )
+
+
+@cache
+def get_archive_store() -> BlobStore:
+    """
+    Return the configured archive store
+    """
+
+    backend = job_settings().backend
+
+    match backend:
+        case "local":
+            return LocalBlobStore(root=job_settings().local_path)
+        case "blob_store":
+            return get_blob_store()
+        case _:
+            raise ConfigurationError(f"unknown archive backend {backend}")
+
+
+def incident_tables() -> list[tuple[Table, Column]]:
+    """
+    Return every table referencing incidentrecord and its referencing
+    column, in the order they can be inserted - the analytics tables have
+    no foreign key so archived incidents stay in analytics
+    """
+
+    return [
+        (table, fk.parent)
+        for table in SQLModel.metadata.sorted_tables
+        for fk in table.foreign_keys
+        if fk.column.table is IncidentRecord.__table__
+    ]
+
+
+def encode_value(value: Any) -> Any:
+    """
+    JSON encoder for column values
+    """
+
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode()
+
+    raise TypeError(f"can't archive value of type {type(value)}")
+
+
+def decode_value(column: Column, value: Any) -> Any:
+    """
+    Convert an archived value back to the type of its column
+
+    Parameters:
+        column (Column): The column the value belongs to
+        value (Any): The archived value
+    """
+
+    if value is None:
+        return None
+
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type is uuid.UUID:
+        return uuid.UUID(value)
+    if python_type is bytes:
+        return base64.b64decode(value)
+
+    return value
+
+
+def read_lines(data: bytes) -> Iterator[dict]:
+    with gzip.open(io.BytesIO(data), "rt") as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def archive_incident(id: int) -> IncidentArchiveRecord | None:
+    """
+    Move an incident and everything referencing it to the archive store,
+    leaving a tombstone behind
+
+    Parameters:
+        id (int): The incident id
+    """
+
+    store = get_archive_store()
+    images = get_blob_store()
+
+    with db_session(engine) as session:
+        incident = session.exec(
+            select(IncidentRecord)
+            .where(IncidentRecord.id == id)
+            .with_for_update(skip_locked=True)
+        ).first()
+
+        # Already archived or being archived elsewhere
+        if incident is None:
+            return
+
+        rows = io.BytesIO()
+        sidecar = io.BytesIO()
+        image_count = 0
+
+        with (
+            gzip.open(rows, "wt") as out,
+            gzip.open(sidecar, "wt") as image_out,
+        ):
+            out.write(
+                json.dumps({"version": archive_version, "incident": id}) + "\n"
+            )
+
+            for table, parent in [
+                (IncidentRecord.__table__, IncidentRecord.__table__.c.id)
+            ] + incident_tables():
+                for row in session.exec(
+                    select(*table.c).where(parent == id)
+                ).mappings():
+                    row = dict(row)
+
+                    # Images are written to the sidecar and referenced by
+                    # digest, including those still stored inline
+                    if table.name == "incidentevent":
+                        content = row.pop("image", None)
+                        if content is not None:
+                            row["image_ref"] = BlobStore.digest(content)
+                        elif row.get("image_ref"):
+                            content = images.get(row["image_ref"])
+                        if content is not None:
+                            image_out.write(
+                                json.dumps(
+                                    {
+                                        "digest": row["image_ref"],
+                                        "data": encode_value(content),
+                                    }
+                                )
+                                + "\n"
+                            )
+                            image_count += 1
+
+                    out.write(
+                        json.dumps(
+                            {"table": table.name, "row": row},
+                            default=encode_value,
+                        )
+                        + "\n"
+                    )
+
+        record = IncidentArchiveRecord(
+            archive=store.put(rows.getvalue()),
+            channel_id=incident.channel_id,
+            created_at=incident.created_at,
+            description=incident.description,
+            id=incident.id,
+            images=store.put(sidecar.getvalue()) if image_count else None,
+            severity=incident.severity,
+            size=len(rows.getvalue()) + len(sidecar.getvalue()),
+            slug=incident.slug,
+            status=incident.status,
+        )
+
+        for table, parent in reversed(incident_tables()):
+            session.exec(delete(table).where(parent == id))
+        session.exec(delete(IncidentRecord).where(IncidentRecord.id == id))
+        session.add(record)
+        session.commit()
+        session.refresh(record)
+
+        logger.info(f"archived incident {record.slug} ({record.size} bytes)")
+
+        return record
+
+
+def archive_old_incidents() -> int:
+    """
+    Archive incidents in a final status that haven't changed for the
+    configured number of days and return how many were archived
+    """
+
+    config = job_settings()
+    cutoff = datetime.now() - timedelta(days=config.after_days)
+    final_statuses = [
+        status
+        for status, definition in settings.statuses.items()
+        if definition.final
+    ]
+
+    if not final_statuses:
+        return 0
+
+    with db_session(engine) as session:
+        ids = session.exec(
+            select(IncidentRecord.id)
+            .where(
+                IncidentRecord.status.in_(final_statuses),
+                IncidentRecord.created_at < cutoff,
+                or_(
+                    IncidentRecord.updated_at.is_(None),
+                    IncidentRecord.updated_at < cutoff,
+                ),
+            )
+            .order_by(IncidentRecord.created_at)
+            .limit(config.batch_size)
+        ).all()
+
+    archived = 0
+    for id in ids:
+        try:
+            if archive_incident(id):
+                archived += 1
+        except Exception as error:
+            logger.error(f"archiving incident {id} failed: {error}")
+
+    return archived
+
+
+def restore_incident(slug: str) -> IncidentRecord:
+    """
+    Reimport an archived incident and remove its tombstone
+
+    Parameters:
+        slug (str): The incident slug
+    """
+
+    store = get_archive_store()
+    images = get_blob_store()
+
+    with db_session(engine) as session:
+        record = session.exec(
+            select(IncidentArchiveRecord)
+            .where(IncidentArchiveRecord.slug == slug)
+            .with_for_update()
+        ).one()
+
+        data = store.get(record.archive)
+        if data is None:
+            raise FileNotFoundError(
+                f"archive {record.archive} for {slug} is missing"
+            )
+
+        if record.images:
+            sidecar = store.get(record.images)
+            if sidecar is None:
+                raise FileNotFoundError(
+                    f"image archive {record.images} for {slug} is missing"
+                )
+            for image in read_lines(sidecar):
+                images.put(base64.b64decode(image["data"]))
+
+        lines = read_lines(data)
+        header = next(lines)
+        if header.get("version") != archive_version:
+            raise ValueError(
+                f"unsupported archive version {header.get('version')}"
+            )
+
+        tables = SQLModel.metadata.tables
+        for line in lines:
+            table = tables[line["table"]]
+            session.exec(
+                insert(table).values(
+                    {
+                        name: decode_value(table.c[name], value)
+                        for name, value in line["row"].items()
+                        if name in table.c
+                    }
+                )
+            )
+
+        session.delete(record)
+        session.commit()
+
+        logger.info(f"restored incident {slug} from the archive")
+
+        return session.exec(
+            select(IncidentRecord).where(IncidentRecord.slug == slug)
+        ).one()
@@ -0,0 +1,279 @@
+import hashlib
+import os
+import re
+import tempfile
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from functools import cache
+from incidentbot.configuration.settings import settings
+from incidentbot.exceptions import ConfigurationError
+from incidentbot.models.database import db_session, engine, EventBlob
+from sqlalchemy import delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import select
+from typing import Iterator
+
+"""
+Blob Store
+
+Content addressed storage for event images - blobs are keyed by the SHA-256
+digest of their content, so storing the same image twice keeps one copy
+"""
+
+digest_pattern = re.compile(r"^[0-9a-f]{64}$")
+
+
+class BlobStore(ABC):
+    """
+    Base class for blob store backends
+    """
+
+    @staticmethod
+    def digest(data: bytes) -> str:
+        """
+        Return the key a blob is stored under
+
+        Parameters:
+            data (bytes): Content of the blob
+        """
+
+        return hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def validate(digest: str):
+        if not digest_pattern.match(digest):
+            raise ValueError(f"invalid blob digest {digest}")
+
+    @abstractmethod
+    def put(self, data: bytes) -> str:
+        """
+        Store a blob unless it already exists and return its digest
+
+        Parameters:
+            data (bytes): Content of the blob
+        """
+
+    @abstractmethod
+    def get(self, digest: str) -> bytes | None:
+        """
+        Return the content of a blob or None if it doesn't exist
+
+        Parameters:
+            digest (str): Digest of the blob
+        """
+
+    @abstractmethod
+    def read_range(self, digest: str, start: int, length: int) -> bytes:
+        """
+        Return up to length bytes of a blob starting at start
+
+        Parameters:
+            digest (str): Digest of the blob
+            start (int): Offset of the first byte
+            length (int): Maximum number of bytes to return
+        """
+
+    def stream(
+        self,
+        digest: str,
+        start: int,
+        end: int,
+        chunk_size: int = 256 * 1024,
+    ) -> Iterator[bytes]:
+        """
+        Yield a byte range of a blob in chunks so it is never held in memory
+        as a whole
+
+        Parameters:
+            digest (str): Digest of the blob
+            start (int): Offset of the first byte
+            end (int): Offset of the last byte, inclusive
+            chunk_size (int): Maximum size of each chunk
+        """
+
+        position = start
+        while position <= end:
+            chunk = self.read_range(
+                digest, position, min(chunk_size, end - position + 1)
+            )
+            if not chunk:
+                break
+
+            yield chunk
+            position += len(chunk)
+
+    @abstractmethod
+    def delete(self, digest: str):
+        """
+        Delete a blob if it exists
+
+        Parameters:
+            digest (str): Digest of the blob
+        """
+
+    @abstractmethod
+    def list(self) -> Iterator[tuple[str, datetime]]:
+        """
+        Yield the digest and creation time of every blob
+        """
+
+
+class LocalBlobStore(BlobStore):
+    """
+    Stores blobs as files below root, fanned out by the first two characters
+    of the digest
+
+    Parameters:
+        root (str): Directory to store blobs in
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def path(self, digest: str) -> str:
+        self.validate(digest)
+
+        return os.path.join(self.root, digest[:2], digest)
+
+    def put(self, data: bytes) -> str:
+        digest = self.digest(data)
+        path = self.path(digest)
+
+        if os.path.exists(path):
+            return digest
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write to a temporary file first so a blob is never seen half written
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except Exception:
+            os.unlink(tmp)
+            raise
+
+        return digest
+
+    def get(self, digest: str) -> bytes | None:
+        try:
+            with open(self.path(digest), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def read_range(self, digest: str, start: int, length: int) -> bytes:
+        with open(self.path(digest), "rb") as f:
+            f.seek(start)
+
+            return f.read(length)
+
+    def delete(self, digest: str):
+        try:
+            os.unlink(self.path(digest))
+        except FileNotFoundError:
+            pass
+
+    def list(self) -> Iterator[tuple[str, datetime]]:
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if digest_pattern.match(name):
+                    yield name, datetime.fromtimestamp(
+                        os.path.getmtime(os.path.join(dirpath, name))
+                    )
+
+
+class PostgresBlobStore(BlobStore):
+    """
+    Stores blobs as Postgres large objects, tracked in the event_blob table
+    """
+
+    def put(self, data: bytes) -> str:
+        digest = self.digest(data)
+
+        with db_session(engine) as session:
+            if session.get(EventBlob, digest):
+                return digest
+
+            oid = session.exec(select(func.lo_from_bytea(0, data))).one()
+            result = session.exec(
+                insert(EventBlob)
+                .values(digest=digest, oid=oid, size=len(data))
+                .on_conflict_do_nothing(index_elements=["digest"])
+            )
+
+            # Stored concurrently by someone else
+            if result.rowcount == 0:
+                session.exec(select(func.lo_unlink(oid)))
+
+            session.commit()
+
+        return digest
+
+    def get(self, digest: str) -> bytes | None:
+        self.validate(digest)
+
+        with db_session(engine) as session:
+            return session.exec(
+                select(func.lo_get(EventBlob.oid)).where(
+                    EventBlob.digest == digest
+                )
+            ).first()
+
+    def read_range(self, digest: str, start: int, length: int) -> bytes:
+        self.validate(digest)
+
+        with db_session(engine) as session:
+            return (
+                session.exec(
+                    select(func.lo_get(EventBlob.oid, start, length)).where(
+                        EventBlob.digest == digest
+                    )
+                ).first()
+                or b""
+            )
+
+    def delete(self, digest: str):
+        self.validate(digest)
+
+        with db_session(engine) as session:
+            oid = session.exec(
+                select(EventBlob.oid)
+                .where(EventBlob.digest == digest)
+                .with_for_update()
+            ).first()
+
+            if oid is not None:
+                session.exec(select(func.lo_unlink(oid)))
+                session.exec(
+                    delete(EventBlob).where(EventBlob.digest == digest)
+                )
+            session.commit()
+
+    def list(self) -> Iterator[tuple[str, datetime]]:
+        # Read before yielding so the session isn't held open by the caller
+        with db_session(engine) as session:
+            rows = session.exec(
+                select(EventBlob.digest, EventBlob.created_at)
+            ).all()
+
+        yield from rows
+
+
+@cache
+def get_blob_store() -> BlobStore:
+    """
+    Return the configured blob store
+    """
+
+    match settings.blob_store.backend:
+        case "local":
+            return LocalBlobStore(root=settings.blob_store.local_path)
+        case "postgres":
+            return PostgresBlobStore()
+        case _:
+            raise ConfigurationError(
+                f"unknown blob store backend {settings.blob_store.backend}"
+            )
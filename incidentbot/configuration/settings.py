@@ -43,14 +43,89 @@ class API(BaseModel):
     enable_docs_endpoint: bool | None = False
     enable_openapi_endpoint: bool | None = False
     enable_redoc_endpoint: bool | None = False
+    response_cache_max_entries: int = 256
+    response_cache_seconds: float = 10
     v1_str: str | None = "/api/v1"
 
 
+"""
+Blob Store
+"""
+
+
+class BlobStore(BaseModel):
+    """
+    Model for the blob_store field
+    """
+
+    backend: str = "postgres"
+    local_path: str = "/var/lib/incidentbot/blobs"
+    migration_batch_size: int = 100
+    migration_max_batches: int = 10
+
+
+"""
+Database
+"""
+
+
+class Database(BaseModel):
+    """
+    Model for the database field
+
+    Sizes the connection pools - the one shared by Slack listeners, the work
+    queue, jobs and synchronous API routes, and the one used by asynchronous
+    API routes. Checkouts waiting longer than slow_checkout_warning_seconds
+    are logged
+    """
+
+    max_overflow: int = 10
+    pool_pre_ping: bool = True
+    pool_recycle_seconds: int = 1800
+    pool_size: int = 10
+    pool_timeout_seconds: float = 30
+    slow_checkout_warning_seconds: float = 1.0
+
+
+"""
+Event Log
+"""
+
+
+class EventLog(BaseModel):
+    """
+    Model for the event_log field
+    """
+
+    batch_size: int = 100
+    flush_interval_seconds: float = 0.5
+    flush_timeout_seconds: float = 10
+    max_queue_size: int = 10000
+    user_name_cache_seconds: int = 300
+    user_name_cache_size: int = 1000
+
+
 """
 Jobs
 """
 
 
+class ArchiveIncidentsJob(BaseModel):
+    """
+    Model for the jobs archive_incidents field
+
+    Incidents in a final status that haven't changed for after_days are
+    written to the archive store and replaced by a tombstone
+    """
+
+    after_days: int = 365
+    backend: str = "local"
+    batch_size: int = 50
+    enabled: bool = False
+    interval_hours: int = 24
+    local_path: str = "/var/lib/incidentbot/archive"
+
+
 class ScrapeForAgingIncidentsJob(BaseModel):
     """
     Model for the jobs scrape_for_aging_incidents_job field
@@ -58,6 +133,20 @@ class ScrapeForAgingIncidentsJob(BaseModel):
 
     enabled: bool = True
     ignore_statuses: list = []
+    interval_hours: int = 48
+    max_age_days: int = 7
+
+
+class WorkQueue(BaseModel):
+    """
+    Model for the work_queue field
+    """
+
+    concurrency: int = 4
+    max_attempts: int = 5
+    max_depth: int = 1000
+    poll_interval_seconds: float = 2.0
+    visibility_timeout_seconds: int = 600
 
 
 class Jobs(BaseModel):
@@ -65,6 +154,7 @@ class Jobs(BaseModel):
     Model for the jobs field
     """
 
+    archive_incidents: ArchiveIncidentsJob | None = ArchiveIncidentsJob()
     scrape_for_aging_incidents: ScrapeForAgingIncidentsJob
 
 
@@ -99,12 +189,19 @@ class Options(BaseModel):
     """
 
     additional_welcome_messages: list[AdditionalWelcomeMessage] | None = None
+    app_home_cache_seconds: int = 60
+    app_home_skip_unchanged_publish: bool = False
+    application_data_cache_seconds: int = 60
     auto_invite_groups: list[GroupAutoInvite] | None = None
     channel_name_prefix: str | None = "inc"
     channel_name_date_format: str | None = "YYYY-MM-DD"
     channel_name_use_date_prefix: bool | None = False
+    incident_creation_concurrency: int = 4
+    incident_creation_max_attempts: int = 3
+    incident_creation_recovery_minutes: int = 5
     meeting_link: str | None = None
     pin_meeting_link_to_channel: bool = False
+    search_results_limit: int = 10
     skip_logs_for_user_agent: list[str] | None = None
     show_most_recent_incidents_app_home_limit: int = 5
     slack_items_pagination_per_page: int = 5
@@ -303,9 +400,12 @@ class Settings(BaseSettings):
     """
 
     api: API | None = API()
+    blob_store: BlobStore | None = BlobStore()
+    database: Database | None = Database()
     digest_channel: str = "incidents"
     emails_enabled: bool = False
     enable_pinned_images: bool = True
+    event_log: EventLog | None = EventLog()
     icons: dict[str, dict[str, str]] = {
         "slack": {
             "channel": ":slack:",
@@ -348,6 +448,7 @@ class Settings(BaseSettings):
         },
     }
     root_slash_command: str = "/incidentbot"
+    slack_directory_reconcile_minutes: int = 720
     severities: dict[str, str] = {
         "sev1": "This signifies a critical production scenario that impacts most or all users with a major impact on SLAs. This is an all-hands-on-deck scenario that requires swift action to restore operation. Customers must be notified.",
         "sev2": "This signifies a significant production degradation scenario impacting a large portion of users.",
@@ -364,6 +465,7 @@ class Settings(BaseSettings):
             "final": True,
         },
     }
+    work_queue: WorkQueue | None = WorkQueue()
 
     """
     .env
@@ -402,6 +504,11 @@ class Settings(BaseSettings):
     def DATABASE_URI(self) -> str:
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def ASYNC_DATABASE_URI(self) -> str:
+        return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+
     ATLASSIAN_API_URL: str | None = None
     ATLASSIAN_API_USERNAME: str | None = None
     ATLASSIAN_API_TOKEN: str | None = None
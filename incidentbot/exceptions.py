@@ -35,3 +35,16 @@ class PostmortemException(Exception):
     def __init__(self, message: str) -> None:
         self.message = message
         super().__init__(self.message)
+
+
+class WorkQueueFullError(Exception):
+    """
+    Exception raised when the work queue has reached its maximum depth
+
+    Parameters:
+        message (str): explanation of the error
+    """
+
+    def __init__(self, message: str) -> None:
+        self.message = message
+        super().__init__(self.message)
@@ -89,6 +89,23 @@ class GitLabIncident:
                 f"Error linking '{title}' to GitLab issue #{incident_iid} ({incident_id}): {error}"
             )
 
+    def find(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns the issue already created for the incident, found by the
+        channel name label, so a retried step doesn't create another one.
+        Returns the same dictionary as new, None if there is no such issue.
+        """
+        incident = self._get_incident_by_channel_name()
+        if not incident:
+            return None
+
+        return {
+            "id": incident.id,
+            "iid": incident.iid,
+            "web_url": incident.web_url,
+            "severity": self.severity,
+        }
+
     def new(self) -> Optional[Dict[str, Any]]:
         """
         Creates a new GitLab issue and optionally adds related links/severity.
@@ -5,6 +5,7 @@ import re
 from incidentbot.configuration.settings import settings
 from incidentbot.gitlab.api import GitLabApi
 from incidentbot.exceptions import PostmortemException
+from incidentbot.incident.event import EventLogHandler
 from incidentbot.models.database import (
     IncidentEvent,
     IncidentParticipant,
@@ -182,7 +183,7 @@ class IncidentPostmortem:
         for event in self.timeline:
             timestamp = event.created_at.strftime("%Y-%m-%d %H:%M:%S")
 
-            if event.image is not None and event.title in image_references:
+            if event.image_size and event.title in image_references:
                 # Use the markdown reference from uploaded image
                 markdown_ref = image_references[event.title]
                 rows.append(f"| {timestamp} | {markdown_ref} |")
@@ -204,13 +205,19 @@ class IncidentPostmortem:
         proj_id = proj.id
 
         for event in self.timeline:
-            if event.image is None:
+            if not event.image_size:
                 continue
 
             filename = self._sanitize_filename(event.title)
 
             try:
-                files = {"file": (filename, event.image, event.mimetype)}
+                files = {
+                    "file": (
+                        filename,
+                        EventLogHandler.read_image(event),
+                        event.mimetype,
+                    )
+                }
 
                 response = self.gitlab_api.api.http_post(
                     f"/projects/{proj_id}/uploads", files=files
@@ -4,7 +4,6 @@ from incidentbot.configuration.settings import settings
 from incidentbot.exceptions import IndexNotFoundError
 from incidentbot.incident.core import format_channel_name
 from incidentbot.incident.event import EventLogHandler
-from incidentbot.scheduler.core import process as TaskScheduler
 from incidentbot.logging import logger
 from incidentbot.models.incident import IncidentDatabaseInterface
 from incidentbot.models.slack import User
@@ -1171,28 +1170,10 @@ async def set_status(
             if config.final
         ]
         if final_statuses and status == final_statuses[0]:
-            # Remove comms reminder job if it exists
-            try:
-                job = TaskScheduler.get_job(
-                    job_id=f"{incident.slug}_comms_reminder"
-                )
-                if job:
-                    TaskScheduler.delete_job(job_to_delete=job.id)
-            except Exception as error:
-                logger.error(
-                    f"error removing job {incident.slug}_comms_reminder: {error}"
-                )
-
-            # Remove role watcher job if it exists
-            try:
-                job = TaskScheduler.get_job(
-                    job_id=f"{incident.slug}_role_watcher"
-                )
-                if job:
-                    TaskScheduler.delete_job(job_to_delete=job.id)
-            except Exception as error:
-                logger.error(
-                    f"error removing job {incident.slug}_role_watcher: {error}"
+            # Stop reminders
+            for kind in ("comms_reminder", "role_watcher"):
+                IncidentDatabaseInterface.set_reminder(
+                    kind=kind, id=incident.id, minutes=None
                 )
 
             # Resolution message
@@ -1,16 +1,26 @@
 from datetime import datetime
-import asyncio
 import re
 import slack_sdk.errors
+import time
 
 from incidentbot.configuration.settings import settings
 from incidentbot.incident.event import EventLogHandler
-from incidentbot.incident.util import comms_reminder, role_watcher
+from incidentbot.incident.pipeline import Pipeline
 from incidentbot.logging import logger
-from incidentbot.models.database import IncidentRecord, engine
+from incidentbot.models.analytics import AnalyticsDatabaseInterface
+from incidentbot.models.database import (
+    db_session,
+    engine,
+    IncidentCreationStep,
+    IncidentMetrics,
+    IncidentRecord,
+    IncidentStatusTime,
+)
+from incidentbot.models.incident import IncidentDatabaseInterface
 from incidentbot.models.pager import read_pager_auto_page_targets
-from incidentbot.scheduler.core import (
-    process as TaskScheduler,
+from incidentbot.queue.core import (
+    process as WorkQueue,
+    WorkQueueInterface,
 )
 from incidentbot.slack.messages import (
     BlockBuilder,
@@ -19,10 +29,11 @@ from incidentbot.slack.messages import (
 from incidentbot.statuspage.slack import return_new_statuspage_incident_message
 from incidentbot.zoom.meeting import ZoomMeeting
 from pydantic import BaseModel
-from sqlmodel import Session, select
+from sqlalchemy import delete, update
+from sqlmodel import select
+from typing import Any
 
 if not settings.IS_TEST_ENVIRONMENT:
-    from incidentbot.scheduler.core import process as TaskScheduler
     from incidentbot.slack.client import invite_user_to_channel
     from incidentbot.slack.client import (
         all_workspace_groups,
@@ -113,7 +124,8 @@ class Incident:
 
     def create_channel(self, channel_name: str, private: bool = False) -> dict:
         """
-        Create a Slack channel
+        Create a Slack channel - if the name is taken by a channel an earlier,
+        interrupted attempt created, that channel is returned instead
         """
 
         logger.info(f"Creating Slack channel: {channel_name}")
@@ -126,9 +138,32 @@ class Incident:
 
             return channel.get("channel")
         except slack_sdk.errors.SlackApiError as error:
+            if error.response.get("error") == "name_taken":
+                existing = self.find_channel(channel_name=channel_name)
+                if existing:
+                    logger.warning(
+                        f"Slack channel {channel_name} already exists, using it"
+                    )
+                    return existing
+
             logger.error(f"error creating channel {channel_name}: {error}")
             return
 
+    def find_channel(self, channel_name: str) -> dict | None:
+        """
+        Find an unarchived Slack channel by name
+        """
+
+        for res in slack_web_client.paginate(
+            "conversations_list",
+            exclude_archived=True,
+            limit=1000,
+            types="public_channel,private_channel",
+        ):
+            for channel in res.get("channels"):
+                if channel.get("name") == channel_name:
+                    return channel
+
     def generate_meeting_link(self, channel_name: str) -> str | None:
         if (
             settings.integrations
@@ -143,14 +178,44 @@ class Incident:
                 else None
             )
 
+    def creation_pipeline(
+        self, id: int, name: str, completed: dict[str, Any]
+    ) -> Pipeline:
+        """
+        Return a pipeline whose step state is recorded in the
+        incident_creation_step table
+
+        Parameters:
+            id (int): The incident id
+            name (str): Name of the pipeline
+            completed (dict[str, Any]): Values of steps that already succeeded
+        """
+
+        return Pipeline(
+            name=f"incident-{id}-{name}",
+            max_workers=settings.options.incident_creation_concurrency,
+            completed=completed,
+            on_change=lambda result: IncidentDatabaseInterface.save_creation_step(
+                parent=id,
+                pipeline=name,
+                name=result.name,
+                status=result.status,
+                error=result.error,
+                output=result.value,
+            ),
+        )
+
     def start(self) -> str:
         """
         Create an incident
+
+        The record and the creation request are stored together before any
+        other step runs so that an interrupted creation can be resumed
         """
 
         # Create initial record
         try:
-            with Session(engine) as session:
+            with db_session(engine) as session:
                 record = IncidentRecord(
                     additional_comms_channel=self.params.additional_comms_channel,
                     components=self.params.incident_components,
@@ -169,217 +234,455 @@ class Incident:
                 )
 
                 session.add(record)
+                session.flush()
+                session.add(
+                    IncidentCreationStep(
+                        attempts=1,
+                        name="request",
+                        output={"value": self.params.model_dump()},
+                        parent=record.id,
+                        pipeline="start",
+                        status="succeeded",
+                    )
+                )
                 session.commit()
                 session.refresh(record)
 
-                """
-                Create Slack channel for incident
-                """
+                id = record.id
+        except Exception as error:
+            logger.error(f"Error during incident creation: {error}")
+            return
 
-                channel_name = format_channel_name(
-                    id=record.id,
-                    description=self.params.incident_description,
-                    use_date_prefix=settings.options.channel_name_use_date_prefix,
-                )
-                channel = self.create_channel(
-                    channel_name=channel_name,
-                    private=self.params.private_channel
-                    | self.params.is_security_incident,
-                )
-                meeting_link = self.generate_meeting_link(
-                    channel_name=channel_name
-                )
+        AnalyticsDatabaseInterface.record_opened(record)
 
-                """
-                Update record
-                """
+        return self.run_creation(id=id, completed={})
 
-                record.channel_id = channel.get("id")
-                record.channel_name = channel_name
-                record.has_private_channel = (
-                    self.params.private_channel
-                    or self.params.is_security_incident
-                )
-                record.link = "https://{}.slack.com/archives/{}".format(
-                    slack_workspace_id, channel.get("id")
+    @staticmethod
+    def load_creation(
+        id: int,
+    ) -> tuple["Incident", dict[str, Any]] | None:
+        """
+        Rebuild an incident's creation request and the values of its
+        succeeded creation steps from the incident_creation_step table
+
+        Parameters:
+            id (int): The incident id
+        """
+
+        completed = {
+            step.name: (step.output or {}).get("value")
+            for step in IncidentDatabaseInterface.list_creation_steps(
+                parent=id
+            )
+            if step.status == "succeeded"
+        }
+
+        if "request" not in completed:
+            logger.error(f"No creation request found for incident {id}")
+            return
+
+        return (
+            Incident(params=IncidentRequestParameters(**completed["request"])),
+            completed,
+        )
+
+    @staticmethod
+    def resume(id: int) -> str | None:
+        """
+        Resume an interrupted incident creation from its recorded steps -
+        steps that already succeeded are not run again
+
+        Parameters:
+            id (int): The incident id
+        """
+
+        loaded = Incident.load_creation(id=id)
+
+        if not loaded:
+            return
+
+        incident, completed = loaded
+
+        return incident.run_creation(id=id, completed=completed)
+
+    @staticmethod
+    def run_optional_features(id: int):
+        """
+        Run the optional features of an incident from the work queue - raises
+        if any step failed so that the item is retried, only failed steps are
+        run again
+
+        Parameters:
+            id (int): The incident id
+        """
+
+        loaded = Incident.load_creation(id=id)
+
+        # The incident was deleted in the meantime
+        if not loaded:
+            return
+
+        incident, completed = loaded
+
+        if not incident.handle_incident_optional_features(
+            id=id, completed=completed
+        ):
+            raise RuntimeError(
+                f"optional features for incident {id} did not all succeed"
+            )
+
+        if all(
+            step.status == "succeeded"
+            for step in IncidentDatabaseInterface.list_creation_steps(
+                parent=id
+            )
+        ):
+            IncidentDatabaseInterface.save_creation_step(
+                parent=id,
+                pipeline="features",
+                name="complete",
+                status="succeeded",
+            )
+
+    def run_creation(self, id: int, completed: dict[str, Any]) -> str | None:
+        """
+        Run every incident creation step that hasn't completed yet - the
+        optional features are handed to the work queue so this returns as
+        soon as the channel is ready
+
+        Parameters:
+            id (int): The incident id
+            completed (dict[str, Any]): Values of steps that already succeeded
+        """
+
+        start = time.monotonic()
+
+        try:
+            channel_id = self.create_incident_channel(
+                id=id, completed=completed
+            )
+
+            if not channel_id:
+                logger.error(
+                    f"Error during incident creation: no channel for incident {id}"
                 )
-                record.meeting_link = meeting_link
-                record.slug = (
-                    f"{settings.options.channel_name_prefix}-{record.id}"
+                return
+
+            logger.info(
+                f"Incident channel for incident {id} ready in {time.monotonic() - start:.2f}s"
+            )
+        except Exception as error:
+            logger.error(f"Error during incident creation: {error}")
+            return
+
+        """
+        Run additional features
+        """
+
+        try:
+            if WorkQueueInterface.enqueue(
+                kind="incident_optional_features",
+                payload={"id": id},
+                key=f"incident_optional_features:{id}",
+            ):
+                WorkQueue.notify()
+        except Exception as error:
+            logger.error(
+                f"Could not queue optional features for incident {id}, running them now: {error}"
+            )
+
+            try:
+                Incident.run_optional_features(id=id)
+            except Exception as error:
+                logger.error(
+                    f"Error running optional features for incident {id}: {error}"
                 )
 
-                """
-                Notify incidents digest channel
-                """
+        return f"<#{channel_id}>"
+
+    def create_incident_channel(
+        self, id: int, completed: dict[str, Any]
+    ) -> str | None:
+        """
+        Create the incident channel and everything that only depends on it
+
+        The Slack channel and meeting link are created concurrently, after
+        which the remaining steps run concurrently up to
+        settings.options.incident_creation_concurrency steps at a time
+
+        Returns the channel id if the channel was created
+
+        Parameters:
+            id (int): The incident id
+            completed (dict[str, Any]): Values of steps that already succeeded
+        """
+
+        with db_session(engine) as session:
+            record = session.get(IncidentRecord, id)
+
+        channel_name = format_channel_name(
+            id=record.id,
+            description=record.description,
+            use_date_prefix=settings.options.channel_name_use_date_prefix,
+        )
+        private = bool(
+            self.params.private_channel or self.params.is_security_incident
+        )
+
+        pipeline = self.creation_pipeline(
+            id=id, name="start", completed=completed
+        )
+
+        """
+        Create Slack channel for incident
+        """
+
+        def create_channel(_):
+            channel = self.create_channel(
+                channel_name=channel_name, private=private
+            )
+            if not channel:
+                raise RuntimeError(f"channel {channel_name} was not created")
+
+            return channel.get("id")
+
+        pipeline.add("channel", create_channel)
+        pipeline.add(
+            "meeting_link",
+            lambda _: self.generate_meeting_link(channel_name=channel_name),
+        )
 
-                logger.info(
-                    f"Sending message to digest channel for: {record.channel_name}"
+        """
+        Update record
+        """
+
+        def update_record(results):
+            fields = {
+                "channel_id": results["channel"],
+                "channel_name": channel_name,
+                "has_private_channel": private,
+                "link": "https://{}.slack.com/archives/{}".format(
+                    slack_workspace_id, results["channel"]
+                ),
+                "meeting_link": results["meeting_link"],
+                "slug": f"{settings.options.channel_name_prefix}-{record.id}",
+            }
+
+            with db_session(engine) as session:
+                session.exec(
+                    update(IncidentRecord)
+                    .where(IncidentRecord.id == id)
+                    .values(**fields)
                 )
-                try:
-                    digest_message = slack_web_client.chat_postMessage(
-                        **IncidentChannelDigestNotification.create(
-                            channel_id=record.channel_id,
-                            has_private_channel=record.has_private_channel,
-                            incident_components=record.components,
-                            incident_description=record.description,
-                            incident_impact=record.impact,
-                            incident_slug=f"{settings.options.channel_name_prefix}-{record.id}",
-                            incident_type=record.incident_type,
-                            initial_status=record.status,
-                            meeting_link=record.meeting_link,
-                            severity=record.severity,
-                        ),
-                        text="A new incident has been declared!",
-                    )
-                except slack_sdk.errors.SlackApiError as error:
-                    logger.error(
-                        f"Error sending message to incident digest channel: {error}"
-                    )
+                session.commit()
 
-                """
-                Update record
-                """
+            for key, value in fields.items():
+                setattr(record, key, value)
 
-                record.digest_message_ts = digest_message.get("ts")
+            # Reminders are sent by the process_incident_reminders job
+            IncidentDatabaseInterface.set_reminder(
+                kind="comms_reminder",
+                id=id,
+                minutes=settings.initial_comms_reminder_minutes,
+            )
+            IncidentDatabaseInterface.set_reminder(
+                kind="role_watcher",
+                id=id,
+                minutes=settings.initial_role_watcher_minutes,
+            )
 
-                """
-                Set incident channel topic
-                """
+        pipeline.add(
+            "record",
+            update_record,
+            depends_on=["channel", "meeting_link"],
+        )
 
-                try:
-                    slack_web_client.conversations_setTopic(
-                        channel=record.channel_id,
-                        topic=f"Severity: {record.severity.upper()} | Status: {record.status.title()}",
-                    )
-                except slack_sdk.errors.SlackApiError as error:
-                    logger.error(
-                        f"Error setting incident channel topic: {error}"
-                    )
+        """
+        Notify incidents digest channel
+        """
 
-                """
-                Send boilerplate info to incident channel
-                """
+        def notify_digest(_):
+            logger.info(
+                f"Sending message to digest channel for: {record.channel_name}"
+            )
 
-                try:
-                    bp_message = slack_web_client.chat_postMessage(
-                        **BlockBuilder.boilerplate_message(
-                            incident=record,
-                        ),
-                        text="Incident details have been posted to an incident channel.",
-                    )
-                except slack_sdk.errors.SlackApiError as error:
-                    logger.error(
-                        f"Error sending message to incident channel: {error}"
-                    )
+            digest_message = slack_web_client.chat_postMessage(
+                **IncidentChannelDigestNotification.create(
+                    channel_id=record.channel_id,
+                    has_private_channel=record.has_private_channel,
+                    incident_components=record.components,
+                    incident_description=record.description,
+                    incident_impact=record.impact,
+                    incident_slug=record.slug,
+                    incident_type=record.incident_type,
+                    initial_status=record.status,
+                    meeting_link=record.meeting_link,
+                    severity=record.severity,
+                ),
+                text="A new incident has been declared!",
+            )
 
-                """
-                Update record
-                """
+            return digest_message.get("ts")
 
-                record.boilerplate_message_ts = bp_message.get("ts")
+        pipeline.add("digest", notify_digest, depends_on=["record"])
 
-                """
-                Send welcome message to incident channel
-                """
+        """
+        Set incident channel topic
+        """
 
-                try:
-                    slack_web_client.chat_postMessage(
-                        channel=record.channel_id,
-                        blocks=BlockBuilder.welcome_message(),
-                        text="Welcome Message",
-                    )
-                except slack_sdk.errors.SlackApiError as error:
-                    logger.error(
-                        f"Error sending welcome message to incident channel: {error}"
-                    )
+        def set_topic(_):
+            slack_web_client.conversations_setTopic(
+                channel=record.channel_id,
+                topic=f"Severity: {record.severity.upper()} | Status: {record.status.title()}",
+            )
 
-                """
-                Create bookmark for meeting (optional)
-                """
-
-                if record.meeting_link:
-                    try:
-                        # Try to sort out the meeting link provider
-                        meeting_link_provider = "Audio"
-                        if "zoom" in record.meeting_link.lower():
-                            meeting_link_provider = "Zoom"
-
-                        slack_web_client.bookmarks_add(
-                            channel_id=record.channel_id,
-                            emoji=settings.icons.get(settings.platform).get(
-                                "meeting"
-                            ),
-                            title=f"{meeting_link_provider} Meeting",
-                            type="link",
-                            link=record.meeting_link,
-                        )
-                    except slack_sdk.errors.SlackApiError as error:
-                        logger.error(
-                            f"Error adding meeting bookmark to channel: {error}"
-                        )
+        pipeline.add("topic", set_topic, depends_on=["record"])
 
-                """
-                Pin meeting link to channel (optional)
-                """
+        """
+        Send boilerplate info to incident channel
+        """
 
-                if (
-                    record.meeting_link
-                    and settings.options.pin_meeting_link_to_channel
-                ):
-                    try:
-                        resp = slack_web_client.chat_postMessage(
-                            channel=record.channel_id,
-                            text=f"Join the meeting here: {record.meeting_link}",
-                        )
-                        slack_web_client.pins_add(
-                            channel=record.channel_id,
-                            timestamp=resp["ts"],
-                        )
-                    except slack_sdk.errors.SlackApiError as error:
-                        logger.error(
-                            f"Error pinning meeting link to channel: {error}"
-                        )
+        def send_boilerplate(_):
+            bp_message = slack_web_client.chat_postMessage(
+                **BlockBuilder.boilerplate_message(
+                    incident=record,
+                ),
+                text="Incident details have been posted to an incident channel.",
+            )
 
-                """
-                Database commit
-                """
+            return bp_message.get("ts")
 
-                session.add(record)
-                session.commit()
+        pipeline.add("boilerplate", send_boilerplate, depends_on=["record"])
 
-                """
-                Run additional features
-                """
+        """
+        Send welcome message to incident channel
 
-                asyncio.run(
-                    self.handle_incident_optional_features(id=record.id)
-                )
+        Posted after the boilerplate message so the channel reads in the same
+        order regardless of timing
+        """
+
+        def send_welcome(_):
+            welcome_message = slack_web_client.chat_postMessage(
+                channel=record.channel_id,
+                blocks=BlockBuilder.welcome_message(),
+                text="Welcome Message",
+            )
+
+            return welcome_message.get("ts")
+
+        pipeline.add("welcome", send_welcome, depends_on=["boilerplate"])
+
+        """
+        Create bookmark for meeting (optional)
+        """
+
+        def add_meeting_bookmark(_):
+            if not record.meeting_link:
+                return
+
+            # Try to sort out the meeting link provider
+            meeting_link_provider = "Audio"
+            if "zoom" in record.meeting_link.lower():
+                meeting_link_provider = "Zoom"
+
+            slack_web_client.bookmarks_add(
+                channel_id=record.channel_id,
+                emoji=settings.icons.get(settings.platform).get("meeting"),
+                title=f"{meeting_link_provider} Meeting",
+                type="link",
+                link=record.meeting_link,
+            )
+
+        pipeline.add("bookmark", add_meeting_bookmark, depends_on=["record"])
+
+        """
+        Pin meeting link to channel (optional)
+        """
+
+        def pin_meeting_link(_):
+            if not (
+                record.meeting_link
+                and settings.options.pin_meeting_link_to_channel
+            ):
+                return
+
+            resp = slack_web_client.chat_postMessage(
+                channel=record.channel_id,
+                text=f"Join the meeting here: {record.meeting_link}",
+            )
+            slack_web_client.pins_add(
+                channel=record.channel_id,
+                timestamp=resp["ts"],
+            )
 
-                # Invite the user who started the incident to the channel
-                invite_user_to_channel(
+        pipeline.add(
+            "pin_meeting_link",
+            pin_meeting_link,
+            depends_on=["welcome"],
+        )
+
+        """
+        Invite the user who started the incident to the channel
+        """
+
+        if self.params.user:
+            pipeline.add(
+                "invite_reporter",
+                lambda _: invite_user_to_channel(
                     channel_id=record.channel_id, user=self.params.user
-                )
+                ),
+                depends_on=["record"],
+            )
 
-                # Write event log
-                EventLogHandler.create(
-                    event="The incident was reported by {}".format(
-                        get_slack_user(self.params.user).get(
-                            "real_name", "NotAvailable"
-                        )
-                    ),
-                    incident_id=record.id,
-                    incident_slug=record.slug,
-                    source="system",
-                    user=get_slack_user(self.params.user).get(
+        """
+        Write event log
+        """
+
+        pipeline.add(
+            "event_log",
+            lambda _: EventLogHandler.create(
+                event="The incident was reported by {}".format(
+                    (get_slack_user(self.params.user) or {}).get(
                         "real_name", "NotAvailable"
-                    ),
-                )
+                    )
+                ),
+                incident_id=record.id,
+                incident_slug=record.slug,
+                source="system",
+                user=self.params.user,
+            ),
+            depends_on=["record"],
+        )
 
-                return f"<#{record.channel_id}>"
-        except Exception as error:
-            logger.error(f"Error during incident creation: {error}")
+        results = pipeline.run()
+
+        if results["record"].status != "succeeded":
             return
 
+        """
+        Database commit
+
+        Message timestamps are only written for messages that were sent, a
+        failed step is retried when the incident is resumed
+        """
+
+        message_ts = {
+            f"{name}_message_ts": results[name].value
+            for name in ("boilerplate", "digest")
+            if results[name].status == "succeeded"
+        }
+
+        if message_ts:
+            with db_session(engine) as session:
+                session.exec(
+                    update(IncidentRecord)
+                    .where(IncidentRecord.id == id)
+                    .values(**message_ts)
+                )
+                session.commit()
+
+        return record.channel_id
+
     @staticmethod
     def delete(id: int) -> bool:
         """
@@ -387,21 +690,22 @@ class Incident:
         """
 
         try:
-            with Session(engine) as session:
+            with db_session(engine) as session:
                 # Remove record
                 record = session.exec(
                     select(IncidentRecord).filter(IncidentRecord.id == id)
                 ).one()
+                channel_id = record.channel_id
                 session.delete(record)
-                session.commit()
 
-                # Clean up jobs
-                for job in TaskScheduler.list_jobs():
-                    if f"inc-{record.id}" in job.id:
-                        TaskScheduler.delete_job(job.id)
+                # Analytics rows aren't removed by a foreign key so that they
+                # outlive archived incidents
+                for table in (IncidentMetrics, IncidentStatusTime):
+                    session.exec(delete(table).where(table.parent == id))
+                session.commit()
 
                 slack_web_client.chat_postMessage(
-                    channel=record.channel_id,
+                    channel=channel_id,
                     text=":octagonal_sign: This incident has been deleted from the application. "
                     + "You will no longer be able to use the bot to manage it.",
                 )
@@ -411,399 +715,427 @@ class Incident:
             logger.error(f"Error deleting incident: {error}")
             return
 
-    async def handle_incident_optional_features(self, id: int):
+    def handle_incident_optional_features(
+        self, id: int, completed: dict[str, Any] | None = None
+    ) -> bool:
         """
-        Invite required participants (optional)
+        Run optional incident features concurrently - group invites,
+        integration issues, prompts and additional channel messages
+
+        Returns whether every step succeeded
+
+        Parameters:
+            id (int): The incident id
+            completed (dict[str, Any]): Values of steps that already succeeded
         """
 
-        with Session(engine) as session:
-            record = session.exec(
-                select(IncidentRecord).filter(IncidentRecord.id == id)
-            ).one()
-
-            if settings.options.auto_invite_groups:
-                for gr in settings.options.auto_invite_groups:
-                    if (
-                        record.severity in gr.severities.split(",")
-                        or gr.severities == "all"
-                    ):
-                        # Get group members
-                        try:
-                            required_participants_group_members = (
-                                slack_web_client.usergroups_users_list(
-                                    usergroup=[
-                                        g
-                                        for g in all_workspace_groups.get(
-                                            "usergroups"
-                                        )
-                                        if g["handle"] == gr.name
-                                    ][0]["id"],
-                                )
-                            )["users"]
-                        except Exception as error:
-                            logger.error(
-                                f"Error getting group members for {gr.name}: {error}"
-                            )
-                            raise
-
-                        # Invite group members to channel
-                        try:
-                            slack_web_client.conversations_invite(
-                                channel=record.channel_id,
-                                users=",".join(
-                                    required_participants_group_members
-                                ),
-                            )
-
-                            # Write event log
-                            EventLogHandler.create(
-                                event=f"Group {gr.name} was invited to the incident channel based on configured settings",
-                                incident_id=record.id,
-                                incident_slug=record.slug,
-                                source="system",
-                            )
-                        except slack_sdk.errors.SlackApiError as error:
-                            logger.error(
-                                f"Error when inviting auto users: {error}"
-                            )
-
-                        # If the PagerDuty integration is enabled
-                        # and the group declaration has an escalation
-                        # issue a page
-                        if (
-                            settings.integrations
-                            and settings.integrations.pagerduty
-                            and settings.integrations.pagerduty.enabled
-                            and gr.pagerduty_escalation_policy
-                        ):
-                            from incidentbot.pagerduty.api import (
-                                PagerDutyInterface,
-                            )
-
-                            pagerduty_interface = PagerDutyInterface(
-                                escalation_policy=gr.pagerduty_escalation_policy
-                            )
-
-                            pagerduty_interface.page(
-                                priority=gr.pagerduty_escalation_priority,
-                                channel_name=record.channel_name,
-                                channel_id=record.channel_id,
-                                paging_user="auto",
-                            )
+        with db_session(engine) as session:
+            record = session.get(IncidentRecord, id)
 
-                            # Write event log
-                            EventLogHandler.create(
-                                event="Created PagerDuty incident based on automatic configuration",
-                                incident_id=record.id,
-                                incident_slug=record.slug,
-                                source="system",
-                            )
-
-            """
-            Post prompt for creating Statuspage incident if enabled (optional)
-            """
-
-            if (
-                settings.integrations
-                and settings.integrations.atlassian
-                and settings.integrations.atlassian.statuspage
-                and settings.integrations.atlassian.statuspage.enabled
-            ):
-                sp_starter_message_content = (
-                    return_new_statuspage_incident_message(
-                        channel_id=record.channel_id
-                    )
+        pipeline = self.creation_pipeline(
+            id=id, name="features", completed=completed
+        )
+
+        """
+        Invite required participants (optional)
+        """
+
+        def invite_group(gr):
+            # Get group members
+            required_participants_group_members = (
+                slack_web_client.usergroups_users_list(
+                    usergroup=[
+                        g
+                        for g in all_workspace_groups.get("usergroups")
+                        if g["handle"] == gr.name
+                    ][0]["id"],
                 )
+            )["users"]
 
-                logger.info(
-                    f"Sending Statuspage prompt to {record.channel_name}"
+            # Invite group members to channel - force invites the members
+            # that aren't in it yet when some are
+            try:
+                slack_web_client.conversations_invite(
+                    channel=record.channel_id,
+                    force=True,
+                    users=",".join(required_participants_group_members),
                 )
+            except slack_sdk.errors.SlackApiError as error:
+                # All of them were invited by an earlier, interrupted attempt
+                if error.response.get("error") != "already_in_channel":
+                    raise
+
+            # Write event log
+            EventLogHandler.create(
+                event=f"Group {gr.name} was invited to the incident channel based on configured settings",
+                incident_id=record.id,
+                incident_slug=record.slug,
+                source="system",
+            )
 
-                try:
-                    slack_web_client.chat_postMessage(
-                        **sp_starter_message_content,
-                        text="Statuspage prompt has been posted to an incident.",
-                    )
-                except slack_sdk.errors.SlackApiError as error:
-                    logger.error(
-                        f"Error sending Statuspage prompt to incident channel {record.channel_name}: {error}"
+        def page(escalation_policy: str, priority: str, event: str, step: str):
+            from incidentbot.pagerduty.api import PagerDutyInterface
+
+            pagerduty_interface = PagerDutyInterface(
+                escalation_policy=escalation_policy
+            )
+
+            # The incident key is stable across attempts so PagerDuty
+            # rejects a repeated page instead of paging twice
+            pagerduty_interface.page(
+                priority=priority,
+                channel_name=record.channel_name,
+                channel_id=record.channel_id,
+                incident_key=f"{record.slug}-{step}",
+                paging_user="auto",
+            )
+
+            # Write event log
+            EventLogHandler.create(
+                event=event,
+                incident_id=record.id,
+                incident_slug=record.slug,
+                source="system",
+            )
+
+        pagerduty_enabled = (
+            settings.integrations
+            and settings.integrations.pagerduty
+            and settings.integrations.pagerduty.enabled
+        )
+
+        if settings.options.auto_invite_groups:
+            for gr in settings.options.auto_invite_groups:
+                if (
+                    record.severity in gr.severities.split(",")
+                    or gr.severities == "all"
+                ):
+                    pipeline.add(
+                        f"invite_group_{gr.name}",
+                        lambda _, gr=gr: invite_group(gr),
                     )
 
-            """
-            Page groups that are required to be automatically paged (optional)
-            """
+                    # If the PagerDuty integration is enabled
+                    # and the group declaration has an escalation
+                    # issue a page
+                    if pagerduty_enabled and gr.pagerduty_escalation_policy:
+                        pipeline.add(
+                            f"page_group_{gr.name}",
+                            lambda _, gr=gr: page(
+                                escalation_policy=gr.pagerduty_escalation_policy,
+                                priority=gr.pagerduty_escalation_priority,
+                                event="Created PagerDuty incident based on automatic configuration",
+                                step=f"page_group_{gr.name}",
+                            ),
+                        )
+
+        """
+        Post prompt for creating Statuspage incident if enabled (optional)
+        """
 
-            if (
-                settings.integrations
-                and settings.integrations.pagerduty
-                and settings.integrations.pagerduty.enabled
-            ):
-                from incidentbot.pagerduty.api import PagerDutyInterface
+        def post_statuspage_prompt(_):
+            sp_starter_message_content = (
+                return_new_statuspage_incident_message(
+                    channel_id=record.channel_id
+                )
+            )
 
-                auto_page_targets = read_pager_auto_page_targets()
+            logger.info(f"Sending Statuspage prompt to {record.channel_name}")
 
-                if auto_page_targets:
-                    for i in auto_page_targets:
-                        for k, v in i.items():
-                            logger.info(f"Paging {k}...")
+            slack_web_client.chat_postMessage(
+                **sp_starter_message_content,
+                text="Statuspage prompt has been posted to an incident.",
+            )
 
-                            pagerduty_interface = PagerDutyInterface(
-                                escalation_policy=v
-                            )
+        if (
+            settings.integrations
+            and settings.integrations.atlassian
+            and settings.integrations.atlassian.statuspage
+            and settings.integrations.atlassian.statuspage.enabled
+        ):
+            pipeline.add("statuspage_prompt", post_statuspage_prompt)
 
-                            pagerduty_interface.page(
-                                priority="high",
-                                channel_name=record.channel_name,
-                                channel_id=record.channel_id,
-                                paging_user="auto",
-                            )
+        """
+        Page groups that are required to be automatically paged (optional)
+        """
+
+        if pagerduty_enabled:
+            auto_page_targets = read_pager_auto_page_targets()
+
+            if auto_page_targets:
+                for i in auto_page_targets:
+                    for k, v in i.items():
+                        logger.info(f"Paging {k}...")
 
-                            # Write event log
-                            EventLogHandler.create(
+                        pipeline.add(
+                            f"page_{k}",
+                            lambda _, k=k, v=v: page(
+                                escalation_policy=v,
+                                priority="high",
                                 event=f"Created PagerDuty incident for team {k} at user request",
-                                incident_id=record.id,
-                                incident_slug=record.slug,
-                                source="system",
-                            )
-
-            """
-            Provide additional information if this is a security incident (optional)
-            """
-
-            if record.is_security_incident:
-                try:
-                    slack_web_client.chat_postMessage(
-                        channel=record.channel_id,
-                        text=":warning: This incident was flagged as a security incident and the channel is private. You must invite other users to this channel manually.",
-                    )
-                except slack_sdk.errors.SlackApiError as error:
-                    logger.error(
-                        f"Error sending additional information to the incident channel {record.channel_name}: {error}"
-                    )
+                                step=f"page_{k}",
+                            ),
+                        )
 
-            """
-            If a Jira issue should be created automatically, create it (optional)
-            """
+        """
+        Provide additional information if this is a security incident (optional)
+        """
 
-            if (
-                settings.integrations
-                and settings.integrations.atlassian
-                and settings.integrations.atlassian.jira
-                and settings.integrations.atlassian.jira.enabled
-                and settings.integrations.atlassian.jira.auto_create_issue
-            ):
-                from incidentbot.jira.issue import JiraIssue
-                from incidentbot.models.database import JiraIssueRecord
-
-                try:
-                    issue_obj = JiraIssue(
-                        description=record.channel_name,
-                        incident_id=record.id,
-                        issue_type=settings.integrations.atlassian.jira.auto_create_issue_type,
-                        summary=record.description,
-                    )
+        def send_security_notice(_):
+            notice = slack_web_client.chat_postMessage(
+                channel=record.channel_id,
+                text=":warning: This incident was flagged as a security incident and the channel is private. You must invite other users to this channel manually.",
+            )
+
+            return notice.get("ts")
 
-                    resp = issue_obj.new()
+        if record.is_security_incident:
+            pipeline.add("security_notice", send_security_notice)
 
-                    if resp is not None:
-                        issue_link = f"{settings.ATLASSIAN_API_URL}/browse/{resp.get('key')}"
+        """
+        If a Jira issue should be created automatically, create it (optional)
+        """
+
+        def create_jira_issue(_):
+            from incidentbot.jira.issue import JiraIssue
+            from incidentbot.models.database import JiraIssueRecord
+
+            issue_obj = JiraIssue(
+                description=record.channel_name,
+                incident_id=record.id,
+                issue_type=settings.integrations.atlassian.jira.auto_create_issue_type,
+                summary=record.description,
+            )
 
-                        jira_issue_record = JiraIssueRecord(
+            # An earlier attempt may have created the issue without getting
+            # to record it
+            resp = issue_obj.find() or issue_obj.new()
+
+            if resp is None:
+                raise RuntimeError(
+                    f"Jira issue for {record.channel_name} was not created"
+                )
+
+            issue_link = (
+                f"{settings.ATLASSIAN_API_URL}/browse/{resp.get('key')}"
+            )
+
+            with db_session(engine) as session:
+                if not session.get(JiraIssueRecord, resp.get("key")):
+                    session.add(
+                        JiraIssueRecord(
                             key=resp.get("key"),
                             parent=record.id,
                             status="Unassigned",
                             url=issue_link,
                         )
+                    )
+                    session.commit()
+
+            return {
+                "key": resp.get("key"),
+                "self": resp.get("self"),
+                "url": issue_link,
+            }
+
+        def send_jira_issue_message(results):
+            issue = results["jira_issue"]
+
+            resp = slack_web_client.chat_postMessage(
+                channel=record.channel_id,
+                blocks=BlockBuilder.jira_issue_message(
+                    key=issue.get("key"),
+                    summary=record.description,
+                    type=settings.integrations.atlassian.jira.auto_create_issue_type,
+                    link=issue.get("url"),
+                ),
+                text=f"A Jira issue has been created for this incident: {issue.get('self')}",
+            )
+            slack_web_client.pins_add(
+                channel=record.channel_id,
+                timestamp=resp["ts"],
+            )
 
-                        session.add(jira_issue_record)
-
-                        from incidentbot.slack.messages import (
-                            BlockBuilder,
-                        )
+        if (
+            settings.integrations
+            and settings.integrations.atlassian
+            and settings.integrations.atlassian.jira
+            and settings.integrations.atlassian.jira.enabled
+            and settings.integrations.atlassian.jira.auto_create_issue
+        ):
+            pipeline.add("jira_issue", create_jira_issue)
+            pipeline.add(
+                "jira_issue_message",
+                send_jira_issue_message,
+                depends_on=["jira_issue"],
+            )
 
-                        try:
-                            resp = slack_web_client.chat_postMessage(
-                                channel=record.channel_id,
-                                blocks=BlockBuilder.jira_issue_message(
-                                    key=resp.get("key"),
-                                    summary=record.description,
-                                    type=settings.integrations.atlassian.jira.auto_create_issue_type,
-                                    link=issue_link,
-                                ),
-                                text=f"A Jira issue has been created for this incident: {resp.get('self')}",
-                            )
-                            slack_web_client.pins_add(
-                                channel=record.channel_id,
-                                timestamp=resp["ts"],
-                            )
-                        except Exception as error:
-                            logger.error(
-                                f"Error sending Jira issue message for {record.channel_name}: {error}"
-                            )
-                except Exception as error:
-                    logger.error(
-                        f"Error creating Jira incident for {record.channel_name}: {error}"
-                    )
+        """
+        If a Gitlab issue should be created automatically, create it (optional)
+        """
 
-            """
-            If a Gitlab issue should be created automatically, create it (optional)
-            """
+        def create_gitlab_issue(_):
+            from incidentbot.gitlab.issue import GitLabIncident
+            from incidentbot.models.database import GitlabIssueRecord
 
-            if (
-                settings.integrations
-                and settings.integrations.gitlab
-                and settings.integrations.gitlab.enabled
-                and settings.integrations.gitlab.auto_create_incident
-            ):
-                from incidentbot.gitlab.issue import GitLabIncident
-                from incidentbot.models.database import GitlabIssueRecord
-
-                try:
-                    issue_obj = GitLabIncident(
-                        description=record.channel_name,
-                        incident_id=record.id,
-                        summary=record.description,
-                        status=record.status,
-                        severity=record.severity,
-                    )
+            issue_obj = GitLabIncident(
+                description=record.channel_name,
+                incident_id=record.id,
+                summary=record.description,
+                status=record.status,
+                severity=record.severity,
+            )
 
-                    resp = issue_obj.new()
+            # An earlier attempt may have created the issue without getting
+            # to record it
+            resp = issue_obj.find() or issue_obj.new()
 
-                    if resp is not None:
-                        issue_link = resp.get("web_url")
+            if resp is None:
+                raise RuntimeError(
+                    f"Gitlab {settings.integrations.gitlab.issue_type.title()} for {record.channel_name} was not created"
+                )
 
-                        gitlab_incident_record = GitlabIssueRecord(
+            with db_session(engine) as session:
+                if not session.get(GitlabIssueRecord, str(resp.get("id"))):
+                    session.add(
+                        GitlabIssueRecord(
                             id=resp.get("id"),
                             iid=resp.get("iid"),
                             parent=record.id,
                             status="Unassigned",
-                            url=issue_link,
+                            url=resp.get("web_url"),
                         )
+                    )
+                    session.commit()
+
+            return {
+                "id": resp.get("id"),
+                "self": resp.get("self"),
+                "url": resp.get("web_url"),
+            }
+
+        def send_gitlab_issue_message(results):
+            issue = results["gitlab_issue"]
+
+            resp = slack_web_client.chat_postMessage(
+                channel=record.channel_id,
+                blocks=BlockBuilder.gitlab_incident_message(
+                    id=issue.get("id"),
+                    summary=record.description,
+                    link=issue.get("url"),
+                ),
+                text=f"A Gitlab {settings.integrations.gitlab.issue_type.title()} has been created for this incident: {issue.get('self')}",
+            )
+            slack_web_client.pins_add(
+                channel=record.channel_id,
+                timestamp=resp["ts"],
+            )
 
-                        session.add(gitlab_incident_record)
-
-                        from incidentbot.slack.messages import (
-                            BlockBuilder,
-                        )
+        if (
+            settings.integrations
+            and settings.integrations.gitlab
+            and settings.integrations.gitlab.enabled
+            and settings.integrations.gitlab.auto_create_incident
+        ):
+            pipeline.add("gitlab_issue", create_gitlab_issue)
+            pipeline.add(
+                "gitlab_issue_message",
+                send_gitlab_issue_message,
+                depends_on=["gitlab_issue"],
+            )
 
-                        try:
-                            resp = slack_web_client.chat_postMessage(
-                                channel=record.channel_id,
-                                blocks=BlockBuilder.gitlab_incident_message(
-                                    id=resp.get("id"),
-                                    summary=record.description,
-                                    link=issue_link,
-                                ),
-                                text=f"A Gitlab {settings.integrations.gitlab.issue_type.title()} has been created for this incident: {resp.get('self')}",
-                            )
-                            slack_web_client.pins_add(
-                                channel=record.channel_id,
-                                timestamp=resp["ts"],
-                            )
-                        except Exception as error:
-                            logger.error(
-                                f"Error sending Gitlab {settings.integrations.gitlab.issue_type.title()} message for {record.channel_name}: {error}"
-                            )
-                except Exception as error:
-                    logger.error(
-                        f"Error creating Gitlab {settings.integrations.gitlab.issue_type.title()} for {record.channel_name}: {error}"
-                    )
+        """
+        Additional comms channel (optional)
+        """
 
-            """
-            Additional comms channel (optional)
-            """
-
-            if record.additional_comms_channel:
-                try:
-                    comms_channel = self.create_channel(
-                        channel_name=format_channel_name(
-                            id=record.id,
-                            description=record.description,
-                            use_date_prefix=settings.options.channel_name_use_date_prefix,
-                            comms=True,
-                        ),
-                        private=False,
-                    )
-                    resp = slack_web_client.chat_postMessage(
-                        channel=record.channel_id,
-                        text="As requested, here is the dedicated communications channel for this incident: <#{}>".format(
-                            comms_channel.get("id")
-                        ),
-                    )
-                    slack_web_client.pins_add(
-                        channel=record.channel_id,
-                        timestamp=resp["ts"],
-                    )
-                except Exception as error:
-                    logger.error(f"Error creating comms channel: {error}")
+        def create_comms_channel(_):
+            comms_channel = self.create_channel(
+                channel_name=format_channel_name(
+                    id=record.id,
+                    description=record.description,
+                    use_date_prefix=settings.options.channel_name_use_date_prefix,
+                    comms=True,
+                ),
+                private=False,
+            )
+            if not comms_channel:
+                raise RuntimeError("comms channel was not created")
 
-                record.additional_comms_channel_id = comms_channel.get("id")
-                record.additional_comms_channel_link = (
-                    "https://{}.slack.com/archives/{}".format(
-                        slack_workspace_id, comms_channel.get("id")
-                    )
-                )
+            return comms_channel.get("id")
 
-            """
-            Create task to remind channel about status updates
-            """
+        def send_comms_channel_message(results):
+            resp = slack_web_client.chat_postMessage(
+                channel=record.channel_id,
+                text="As requested, here is the dedicated communications channel for this incident: <#{}>".format(
+                    results["comms_channel"]
+                ),
+            )
+            slack_web_client.pins_add(
+                channel=record.channel_id,
+                timestamp=resp["ts"],
+            )
 
-            try:
-                if settings.initial_comms_reminder_minutes != 0:
-                    TaskScheduler.scheduler.add_job(
-                        id=f"{record.slug}_comms_reminder",
-                        func=comms_reminder,
-                        args=[record.channel_id],
-                        trigger="interval",
-                        name=f"{record.slug}_comms_reminder",
-                        minutes=settings.initial_comms_reminder_minutes,
-                        replace_existing=True,
-                    )
-            except Exception as error:
-                logger.error(f"Error adding job: {error}")
+        if record.additional_comms_channel:
+            pipeline.add("comms_channel", create_comms_channel)
+            pipeline.add(
+                "comms_channel_message",
+                send_comms_channel_message,
+                depends_on=["comms_channel"],
+            )
 
-            """
-            Create task to watch for unassigned roles
-            """
+        """
+        Additional welcome messages
 
-            try:
-                if settings.initial_role_watcher_minutes != 0:
-                    TaskScheduler.scheduler.add_job(
-                        id=f"{record.slug}_role_watcher",
-                        func=role_watcher,
-                        args=[record.channel_id],
-                        trigger="interval",
-                        name=f"{record.slug}_role_watcher",
-                        minutes=settings.initial_role_watcher_minutes,
-                        replace_existing=True,
-                    )
-            except Exception as error:
-                logger.error(f"Error adding job: {error}")
+        Each message waits for the previous one to keep them in order
+        """
 
-            """
-            Additional welcome messages
-            """
+        def send_additional_welcome_message(entry):
+            resp = slack_web_client.chat_postMessage(
+                channel=record.channel_id,
+                text=entry.message,
+            )
+            if entry.pin:
+                slack_web_client.pins_add(
+                    channel=record.channel_id,
+                    timestamp=resp["ts"],
+                )
 
-            try:
-                if settings.options.additional_welcome_messages:
-                    for entry in settings.options.additional_welcome_messages:
-                        resp = slack_web_client.chat_postMessage(
-                            channel=record.channel_id,
-                            text=entry.message,
-                        )
-                        if entry.pin:
-                            slack_web_client.pins_add(
-                                channel=record.channel_id,
-                                timestamp=resp["ts"],
-                            )
-            except Exception as error:
-                logger.error(
-                    f"Error sending additional welcome message to {record.slug}: {error}"
+        if settings.options.additional_welcome_messages:
+            for idx, entry in enumerate(
+                settings.options.additional_welcome_messages
+            ):
+                pipeline.add(
+                    f"additional_welcome_message_{idx}",
+                    lambda _, entry=entry: send_additional_welcome_message(
+                        entry
+                    ),
+                    depends_on=(
+                        [f"additional_welcome_message_{idx - 1}"]
+                        if idx
+                        else []
+                    ),
                 )
 
-            """
-            Final mutation
-            """
+        results = pipeline.run()
+
+        """
+        Final mutation
+        """
+
+        if "comms_channel" in results and results["comms_channel"].value:
+            with db_session(engine) as session:
+                session.exec(
+                    update(IncidentRecord)
+                    .where(IncidentRecord.id == id)
+                    .values(
+                        additional_comms_channel_id=results[
+                            "comms_channel"
+                        ].value,
+                        additional_comms_channel_link="https://{}.slack.com/archives/{}".format(
+                            slack_workspace_id, results["comms_channel"].value
+                        ),
+                    )
+                )
+                session.commit()
 
-            session.add(record)
-            session.commit()
+        return all(r.status == "succeeded" for r in results.values())
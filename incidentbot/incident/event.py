@@ -1,15 +1,241 @@
-from datetime import datetime
+import atexit
+import queue
+import threading
+import time
+import uuid
 
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from incidentbot.blobstore.core import get_blob_store
 from incidentbot.configuration.settings import settings
 from incidentbot.logging import logger
-from incidentbot.models.database import engine, IncidentEvent
+from incidentbot.models.database import (
+    db_session,
+    engine,
+    IncidentArchiveRecord,
+    IncidentEvent,
+    IncidentEventBase,
+    IncidentRecord,
+)
 from incidentbot.util.gen import fetch_timestamp
-from sqlmodel import Session, select, or_
+from sqlalchemy import insert, tuple_, update
+from sqlalchemy.orm import defer
+from sqlmodel import select, or_, Session
+from typing import Any, Iterable, Iterator
 
 if not settings.IS_TEST_ENVIRONMENT:
     from incidentbot.slack.client import get_slack_user
 
 
+def incident_id_for_slug(incident_slug: str):
+    """
+    Return a subquery resolving an incident slug to its id, so events can be
+    filtered on their indexed parent column
+
+    Parameters:
+        incident_slug (str): The incident slug
+    """
+
+    return (
+        select(IncidentRecord.id)
+        .filter(IncidentRecord.slug == incident_slug)
+        .scalar_subquery()
+    )
+
+
+def lock_incidents(session: Session, incident_ids: Iterable[int]):
+    """
+    Lock incidents against other event writes until the session commits -
+    change_seq values are taken while the lock is held, so each incident's
+    events become visible in change_seq order
+
+    Parameters:
+        session (Session): The session the events are written in
+        incident_ids (Iterable[int]): Ids of the incidents
+    """
+
+    session.exec(
+        select(IncidentRecord.id)
+        .filter(IncidentRecord.id.in_(set(incident_ids)))
+        .order_by(IncidentRecord.id)
+        .with_for_update(key_share=True)
+    ).all()
+
+
+class EventLogWriter:
+    """
+    Queues events in memory and writes them with multi-row inserts from a
+    background thread, either once batch_size events are waiting or every
+    flush_interval_seconds
+
+    The queue is bounded - when it is full the caller writes the queued
+    events itself rather than dropping any
+    """
+
+    def __init__(self):
+        self._flush = threading.Event()
+        self._names: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._queue: queue.Queue | None = None
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def _start(self):
+        with self._lock:
+            if self._thread:
+                return
+
+            self._queue = queue.Queue(
+                maxsize=settings.event_log.max_queue_size
+            )
+            self._thread = threading.Thread(
+                target=self._run,
+                daemon=True,
+                name="event-log-writer",
+            )
+            self._thread.start()
+
+        atexit.register(self.flush)
+
+    def put(self, row: dict[str, Any]):
+        """
+        Queue an event for writing
+
+        Parameters:
+            row (dict[str, Any]): Column values of the event
+        """
+
+        self._start()
+
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            logger.warning("event log queue is full, flushing in caller")
+            self._drain()
+            self._queue.put(row)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Return once every event queued so far has been written, or after
+        timeout seconds - returns whether everything was written
+
+        Parameters:
+            timeout (float): Seconds to wait for the writer thread, defaults
+                to settings.event_log.flush_timeout_seconds
+        """
+
+        if not self._thread or not self._queue.unfinished_tasks:
+            return True
+
+        self._flush.set()
+        self._drain()
+
+        # Wait for a batch the writer thread may be in the middle of
+        deadline = time.monotonic() + (
+            settings.event_log.flush_timeout_seconds
+            if timeout is None
+            else timeout
+        )
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning(
+                        f"event log flush timed out with {self._queue.unfinished_tasks} events unwritten"
+                    )
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+
+        return True
+
+    def user_name(self, user: str | None) -> str:
+        """
+        Return the display name of a Slack user, cached for a while so busy
+        incidents don't look up the same users over and over - the least
+        recently used names are dropped once the cache is full
+
+        Parameters:
+            user (str): User id or name
+        """
+
+        if not user:
+            return "NotAvailable"
+
+        now = time.monotonic()
+        with self._lock:
+            cached = self._names.get(user)
+            if cached and cached[0] > now:
+                self._names.move_to_end(user)
+                return cached[1]
+
+        name = (get_slack_user(user) or {}).get("real_name", "NotAvailable")
+
+        with self._lock:
+            self._names[user] = (
+                now + settings.event_log.user_name_cache_seconds,
+                name,
+            )
+            self._names.move_to_end(user)
+            while len(self._names) > settings.event_log.user_name_cache_size:
+                self._names.popitem(last=False)
+
+        return name
+
+    def _take(self, first: dict[str, Any] | None = None) -> list[dict]:
+        batch = [first] if first else []
+
+        while len(batch) < settings.event_log.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _drain(self):
+        while batch := self._take():
+            self._write(batch)
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            # Give other events a moment to arrive so they share the insert
+            if self._queue.qsize() + 1 < settings.event_log.batch_size:
+                self._flush.wait(settings.event_log.flush_interval_seconds)
+            self._flush.clear()
+            self._write(self._take(first))
+
+    def _write(self, batch: list[dict[str, Any]]):
+        try:
+            with db_session(engine) as session:
+                lock_incidents(session, [row["parent"] for row in batch])
+                session.exec(insert(IncidentEvent), params=batch)
+                session.commit()
+        except Exception as error:
+            logger.error(
+                f"Event log batch insert failed, writing {len(batch)} events one by one: {error}"
+            )
+
+            # Keep one bad event, e.g. for a deleted incident, from taking
+            # the rest of the batch with it
+            for row in batch:
+                try:
+                    with db_session(engine) as session:
+                        lock_incidents(session, [row["parent"]])
+                        session.exec(insert(IncidentEvent), params=[row])
+                        session.commit()
+                except Exception as error:
+                    logger.error(
+                        f"Event log creation failed for incident {row['parent']}: {error}"
+                    )
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+
+writer = EventLogWriter()
+
+
 class EventLogHandler:
     @classmethod
     def create(
@@ -26,34 +252,57 @@ class EventLogHandler:
         user: str | None = None,
     ):
         """
-        Create an event log for an incident
+        Create an event log for an incident - images are written to the blob
+        store and referenced by digest, the event itself is queued and
+        written in a batch shortly after
         """
 
-        with Session(engine) as session:
+        image_ref = None
+        if image is not None:
             try:
-                event = IncidentEvent(
-                    image=image,
-                    incident_slug=incident_slug,
-                    message_ts=(
+                image_ref = get_blob_store().put(image)
+            except Exception as error:
+                # Keep the image inline rather than losing it, it is moved to
+                # the blob store by the migrate_event_images job
+                logger.error(
+                    f"Error storing image for incident {incident_id}, storing it inline: {error}"
+                )
+
+        try:
+            writer.put(
+                {
+                    "id": uuid.uuid4(),
+                    "image": image if image_ref is None else None,
+                    "image_ref": image_ref,
+                    "image_size": len(image) if image is not None else None,
+                    "incident_slug": incident_slug,
+                    "message_ts": (
                         message_ts
                         if message_ts
                         else fetch_timestamp(epoch=True)
                     ),
-                    mimetype=mimetype,
-                    parent=incident_id,
-                    source=source,
-                    text=event,
-                    timestamp=timestamp,
-                    title=title,
-                    user=get_slack_user(user).get("real_name", "NotAvailable"),
-                )
+                    "mimetype": mimetype,
+                    "parent": incident_id,
+                    "source": source,
+                    "text": event,
+                    "timestamp": timestamp,
+                    "title": title,
+                    "user": writer.user_name(user),
+                }
+            )
+        except Exception as error:
+            logger.error(
+                f"Event log creation failed for incident {incident_id}: {error}"
+            )
 
-                session.add(event)
-                session.commit()
-            except Exception as error:
-                logger.error(
-                    f"Event log creation failed for incident {incident_id}: {error}"
-                )
+    @classmethod
+    def flush(self):
+        """
+        Write all queued events before returning, for callers that read the
+        events back
+        """
+
+        writer.flush()
 
     @classmethod
     def delete(
@@ -67,7 +316,7 @@ class EventLogHandler:
             id (str): The event's uuid
         """
 
-        with Session(engine) as session:
+        with db_session(engine) as session:
             try:
                 record = session.exec(
                     select(IncidentEvent).filter(IncidentEvent.id == id)
@@ -98,10 +347,14 @@ class EventLogHandler:
             incident_slug (str): The incident slug
         """
 
-        with Session(engine) as session:
+        # Used to build postmortems, which must include the latest events
+        writer.flush()
+
+        with db_session(engine) as session:
             try:
                 records = session.exec(
                     select(IncidentEvent)
+                    .options(defer(IncidentEvent.image))
                     .filter(
                         or_(
                             IncidentEvent.incident_slug == incident_slug,
@@ -119,6 +372,67 @@ class EventLogHandler:
                     f"Event log lookup failed for incident {incident_id}: {error}"
                 )
 
+    @classmethod
+    def read_summaries(
+        self,
+        incident_slug: str,
+        after: tuple[str, uuid.UUID] | None = None,
+        since: int | None = None,
+        limit: int | None = None,
+    ) -> list[IncidentEventBase]:
+        """
+        Read an incident's event logs without selecting image content
+
+        Events are ordered by (message_ts, id) and after continues from the
+        last event of a previous page. When since is given only events
+        added or edited after that change_seq are returned, ordered by
+        change_seq, so polling clients receive just the changes
+
+        Parameters:
+            incident_slug (str): The incident slug
+            after (tuple[str, uuid.UUID]): message_ts and id of the last event
+                of the previous page
+            since (int): change_seq of the last change already seen
+            limit (int): How many events to return, all when omitted
+        """
+
+        columns = [
+            getattr(IncidentEvent, name)
+            for name in IncidentEventBase.model_fields
+        ]
+
+        query = select(*columns).filter(
+            IncidentEvent.parent == incident_id_for_slug(incident_slug)
+        )
+
+        if since is not None:
+            query = query.filter(IncidentEvent.change_seq > since).order_by(
+                IncidentEvent.change_seq
+            )
+        else:
+            if after:
+                query = query.filter(
+                    tuple_(IncidentEvent.message_ts, IncidentEvent.id)
+                    > tuple_(*after)
+                )
+            query = query.order_by(IncidentEvent.message_ts, IncidentEvent.id)
+
+        if limit is not None:
+            query = query.limit(limit)
+
+        # Include events logged just before the request
+        writer.flush()
+
+        with db_session(engine) as session:
+            try:
+                rows = session.exec(query).all()
+
+                return [IncidentEventBase(**row._mapping) for row in rows]
+            except Exception as error:
+                logger.error(
+                    f"Event log lookup failed for incident {incident_slug}: {error}"
+                )
+
     @classmethod
     def read_one(
         self,
@@ -135,10 +449,11 @@ class EventLogHandler:
             incident_slug (str): The incident slug
         """
 
-        with Session(engine) as session:
+        with db_session(engine) as session:
             try:
                 records = session.exec(
                     select(IncidentEvent)
+                    .options(defer(IncidentEvent.image))
                     .filter(
                         IncidentEvent.incident_slug == incident_slug,
                         IncidentEvent.id == id,
@@ -154,6 +469,49 @@ class EventLogHandler:
                     f"Event log lookup failed for incident {incident_id}: {error}"
                 )
 
+    @classmethod
+    def read_image(self, event: IncidentEvent) -> bytes | None:
+        """
+        Return the image attached to an event, if any
+
+        Parameters:
+            event (IncidentEvent): The event, as returned by read or read_one
+        """
+
+        if event.image_ref:
+            return get_blob_store().get(event.image_ref)
+
+        # Not yet moved to the blob store
+        if event.image_size:
+            with db_session(engine) as session:
+                return session.exec(
+                    select(IncidentEvent.image).filter(
+                        IncidentEvent.id == event.id
+                    )
+                ).first()
+
+        return None
+
+    @classmethod
+    def stream_image(
+        self, event: IncidentEvent, start: int, end: int
+    ) -> Iterator[bytes]:
+        """
+        Yield a byte range of the image attached to an event
+
+        Parameters:
+            event (IncidentEvent): The event, as returned by read_one
+            start (int): Offset of the first byte
+            end (int): Offset of the last byte, inclusive
+        """
+
+        if event.image_ref:
+            yield from get_blob_store().stream(
+                digest=event.image_ref, start=start, end=end
+            )
+        else:
+            yield (self.read_image(event) or b"")[start : end + 1]
+
     @classmethod
     def update(
         self,
@@ -166,7 +524,7 @@ class EventLogHandler:
             request (IncidentEvent): The record to be updated
         """
 
-        with Session(engine) as session:
+        with db_session(engine) as session:
             try:
                 record = session.exec(
                     select(IncidentEvent).filter(
@@ -174,6 +532,8 @@ class EventLogHandler:
                     )
                 ).one()
 
+                lock_incidents(session, [record.parent])
+
                 # Compare existing record fields to new record fields
                 # Update what has changed
                 # Commit record
@@ -191,3 +551,91 @@ class EventLogHandler:
                 logger.info(f"edited event {request.id}")
             except Exception as error:
                 logger.error(f"Event log updated failed: {error}")
+
+    """
+    Blob Store
+    """
+
+    @classmethod
+    def migrate_images(self, batch_size: int = 100) -> int:
+        """
+        Move a batch of images stored inline on events to the blob store and
+        return how many were moved
+
+        Parameters:
+            batch_size (int): Maximum number of events to migrate
+        """
+
+        store = get_blob_store()
+
+        with db_session(engine) as session:
+            rows = session.exec(
+                select(IncidentEvent.id, IncidentEvent.image)
+                .filter(
+                    IncidentEvent.image.is_not(None),
+                    IncidentEvent.image_ref.is_(None),
+                )
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            ).all()
+
+            for id, image in rows:
+                session.exec(
+                    update(IncidentEvent)
+                    .where(IncidentEvent.id == id)
+                    .values(
+                        image=None,
+                        image_ref=store.put(image),
+                        image_size=len(image),
+                        # Not a user visible change
+                        change_seq=IncidentEvent.change_seq,
+                        updated_at=IncidentEvent.updated_at,
+                    )
+                )
+            session.commit()
+
+        if rows:
+            logger.info(f"moved {len(rows)} event images to the blob store")
+
+        return len(rows)
+
+    @classmethod
+    def delete_unreferenced_images(self, min_age_minutes: int = 60) -> int:
+        """
+        Delete blobs no longer referenced by any event or archive and return
+        how many were deleted - recently written blobs are kept since the
+        event referencing them may not have been committed yet
+
+        Parameters:
+            min_age_minutes (int): Minimum age of a blob that may be deleted
+        """
+
+        store = get_blob_store()
+        cutoff = datetime.now() - timedelta(minutes=min_age_minutes)
+
+        with db_session(engine) as session:
+            referenced = set(
+                session.exec(
+                    select(IncidentEvent.image_ref)
+                    .filter(IncidentEvent.image_ref.is_not(None))
+                    .distinct()
+                ).all()
+            )
+            # Archives may share the blob store with event images
+            for archive, images in session.exec(
+                select(
+                    IncidentArchiveRecord.archive, IncidentArchiveRecord.images
+                )
+            ).all():
+                referenced.update([archive, images])
+
+        deleted = 0
+        for digest, created_at in list(store.list()):
+            if digest not in referenced and created_at < cutoff:
+                store.delete(digest)
+                deleted += 1
+
+        if deleted:
+            logger.info(f"deleted {deleted} unreferenced event images")
+
+        return deleted
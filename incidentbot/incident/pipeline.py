@@ -0,0 +1,224 @@
+import time
+
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from incidentbot.logging import logger
+from pydantic import BaseModel
+from typing import Any, Callable
+
+
+class PipelineStep(BaseModel):
+    """
+    A unit of work in a pipeline - func receives the results of all completed
+    steps keyed by step name
+    """
+
+    depends_on: list[str] = []
+    func: Callable[[dict[str, Any]], Any]
+    name: str
+
+
+class PipelineStepResult(BaseModel):
+    """
+    Outcome of a pipeline step
+    """
+
+    elapsed: float = 0.0
+    error: str | None = None
+    name: str
+    status: str = "pending"
+    value: Any = None
+
+
+class Pipeline:
+    """
+    Runs steps concurrently as soon as the steps they depend on have
+    succeeded
+
+    A step that fails is logged and every step depending on it is skipped,
+    other branches of the graph keep running
+
+    Steps listed in completed are not run again, their stored value is handed
+    to dependents instead, which allows an interrupted pipeline to be resumed
+
+    Parameters:
+        name (str): Name used when logging
+        max_workers (int): How many steps may run at the same time
+        completed (dict[str, Any]): Values of steps that already succeeded
+        on_change (Callable): Called from the calling thread whenever a step
+            starts, succeeds, fails or is skipped
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int = 4,
+        completed: dict[str, Any] | None = None,
+        on_change: Callable[[PipelineStepResult], None] | None = None,
+    ):
+        self.completed = completed or {}
+        self.max_workers = max(1, max_workers)
+        self.name = name
+        self.on_change = on_change
+        self.steps: dict[str, PipelineStep] = {}
+
+    def add(
+        self,
+        name: str,
+        func: Callable[[dict[str, Any]], Any],
+        depends_on: list[str] = [],
+    ):
+        """
+        Add a step to the pipeline
+
+        Parameters:
+            name (str): Unique name of the step
+            func (Callable): Called with the results of completed steps
+            depends_on (list[str]): Steps that must succeed first
+        """
+
+        if name in self.steps:
+            raise ValueError(f"duplicate pipeline step {name}")
+
+        self.steps[name] = PipelineStep(
+            depends_on=depends_on, func=func, name=name
+        )
+
+    def _validate(self):
+        for step in self.steps.values():
+            for dep in step.depends_on:
+                if dep not in self.steps:
+                    raise ValueError(
+                        f"pipeline step {step.name} depends on unknown step {dep}"
+                    )
+
+        # Kahn's algorithm - anything left over is part of a cycle
+        remaining = {
+            name: set(step.depends_on) for name, step in self.steps.items()
+        }
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(
+                    f"pipeline {self.name} has a dependency cycle between {sorted(remaining)}"
+                )
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    def _changed(self, result: PipelineStepResult):
+        if not self.on_change:
+            return
+
+        try:
+            self.on_change(result)
+        except Exception as error:
+            logger.error(
+                f"{self.name}: could not record state of step {result.name}: {error}"
+            )
+
+    def _run_step(
+        self, step: PipelineStep, values: dict[str, Any]
+    ) -> PipelineStepResult:
+        start = time.monotonic()
+
+        try:
+            value = step.func(values)
+        except Exception as error:
+            logger.error(f"{self.name}: step {step.name} failed: {error}")
+
+            return PipelineStepResult(
+                elapsed=time.monotonic() - start,
+                error=str(error),
+                name=step.name,
+                status="failed",
+            )
+
+        return PipelineStepResult(
+            elapsed=time.monotonic() - start,
+            name=step.name,
+            status="succeeded",
+            value=value,
+        )
+
+    def run(self) -> dict[str, PipelineStepResult]:
+        """
+        Run all steps and return their results keyed by step name
+        """
+
+        self._validate()
+
+        start = time.monotonic()
+        results = {name: PipelineStepResult(name=name) for name in self.steps}
+        values: dict[str, Any] = {}
+
+        for name in self.steps:
+            if name in self.completed:
+                results[name].status = "succeeded"
+                results[name].value = values[name] = self.completed[name]
+        running: dict[Future, str] = {}
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix=self.name,
+        ) as executor:
+            while True:
+                for name, step in self.steps.items():
+                    if results[name].status != "pending":
+                        continue
+
+                    dep_statuses = [
+                        results[dep].status for dep in step.depends_on
+                    ]
+
+                    if any(
+                        status in ("failed", "skipped")
+                        for status in dep_statuses
+                    ):
+                        results[name].status = "skipped"
+                        logger.warning(
+                            f"{self.name}: skipping step {name} because a dependency did not succeed"
+                        )
+                        self._changed(results[name])
+                    elif all(status == "succeeded" for status in dep_statuses):
+                        results[name].status = "running"
+                        self._changed(results[name])
+                        running[
+                            executor.submit(self._run_step, step, dict(values))
+                        ] = name
+
+                # Skipping a step can unblock others, so only wait once
+                # nothing new was scheduled
+                if any(r.status == "pending" for r in results.values()) and (
+                    not running
+                ):
+                    continue
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    name = running.pop(future)
+                    results[name] = future.result()
+                    if results[name].status == "succeeded":
+                        values[name] = results[name].value
+                    self._changed(results[name])
+
+        logger.info(
+            f"{self.name}: finished {len(results)} steps in {time.monotonic() - start:.2f}s "
+            + "("
+            + ", ".join(
+                f"{r.name}={r.status}/{r.elapsed:.2f}s"
+                for r in results.values()
+            )
+            + ")"
+        )
+
+        return results
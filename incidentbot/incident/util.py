@@ -18,19 +18,17 @@ if not settings.IS_TEST_ENVIRONMENT:
 
 def _disable_failed_incident_job(channel_id: str, job_suffix: str) -> None:
     """
-    Disable a per-incident scheduler job to prevent repeated Slack errors.
+    Stop a per-incident reminder to prevent repeated Slack errors.
     """
 
     try:
-        from incidentbot.scheduler.core import process as TaskScheduler
-
         incident = IncidentDatabaseInterface.get_one(channel_id=channel_id)
-        job = TaskScheduler.get_job(job_id=f"{incident.slug}_{job_suffix}")
-        if job:
-            TaskScheduler.delete_job(job_to_delete=job.id)
-            logger.warning(
-                f"disabled job {incident.slug}_{job_suffix} after repeated Slack post failures"
-            )
+        IncidentDatabaseInterface.set_reminder(
+            kind=job_suffix, id=incident.id, minutes=None
+        )
+        logger.warning(
+            f"disabled {job_suffix} for {incident.slug} after repeated Slack post failures"
+        )
     except Exception as error:
         logger.warning(
             f"could not disable failed job for incident channel {channel_id}: {error}"
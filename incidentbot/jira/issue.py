@@ -55,6 +55,23 @@ class JiraIssue:
         except requests.exceptions.HTTPError as error:
             logger.error(f"Error creating Jira issue: {error}")
 
+    def find(self):
+        """
+        Returns the issue already created for the incident, found by the
+        channel name label, so a retried step doesn't create another one
+        """
+
+        resp = self.jira.api.jql(
+            f'project = "{settings.integrations.atlassian.jira.project}" '
+            + f'AND labels = "{self.incident_data.channel_name}" '
+            + f'AND issuetype = "{self.issue_type}" ORDER BY created ASC',
+            fields="key",
+            limit=1,
+        )
+        issues = resp.get("issues") if resp else None
+
+        return issues[0] if issues else None
+
     def __get_priority_id(self, priority: str):
         """
         Returns a priority id by name
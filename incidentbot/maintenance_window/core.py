@@ -1,9 +1,12 @@
 from datetime import datetime
 from incidentbot.logging import logger
 from incidentbot.configuration.settings import settings
-from incidentbot.models.database import MaintenanceWindowRecord, engine
+from incidentbot.models.database import (
+    MaintenanceWindowRecord,
+    db_session,
+    engine,
+)
 from pydantic import BaseModel
-from sqlmodel import Session
 
 
 class MaintenanceWindowRequestParameters(BaseModel):
@@ -46,7 +49,7 @@ class MaintenanceWindow:
             f"Writing maintenance window entry to database for {self.params.title}..."
         )
         try:
-            with Session(engine) as session:
+            with db_session(engine) as session:
                 maintenance_window = MaintenanceWindowRecord(
                     channels=self.params.channels,
                     components=self.params.components,
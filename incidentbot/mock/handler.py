@@ -2,8 +2,7 @@ import random
 import string
 
 from incidentbot.logging import logger
-from incidentbot.models.database import engine, IncidentRecord
-from sqlmodel import Session
+from incidentbot.models.database import db_session, engine, IncidentRecord
 
 
 def create_mock_incident_data(amount: int):
@@ -20,7 +19,7 @@ def create_mock_incident_data(amount: int):
             )
             identifier = f"mock-{suffix}"
 
-            with Session(engine) as session:
+            with db_session(engine) as session:
                 incident = IncidentRecord(
                     id=identifier,
                     boilerplate_message_ts="",
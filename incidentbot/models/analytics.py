@@ -0,0 +1,649 @@
+from datetime import date, datetime, timedelta
+from incidentbot.configuration.settings import settings
+from incidentbot.logging import logger
+from incidentbot.models.database import (
+    db_session,
+    engine,
+    IncidentArchiveRecord,
+    IncidentMetrics,
+    IncidentParticipant,
+    IncidentRecord,
+    IncidentRollup,
+    IncidentStatusTime,
+)
+from pydantic import BaseModel
+from sqlalchemy import delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, select
+
+"""
+API Models
+"""
+
+
+class ResolveTimes(BaseModel):
+    """
+    Seconds from creation to resolution
+    """
+
+    mean: float | None = None
+    p50: float | None = None
+    p90: float | None = None
+    p95: float | None = None
+    p99: float | None = None
+
+
+class AnalyticsSummary(BaseModel):
+    opened: int
+    resolved: int
+    participants_mean: float | None = None
+    time_to_resolve: ResolveTimes
+    by_severity: dict[str, int]
+    by_status: dict[str, int]
+    by_type: dict[str, int]
+
+
+class StatusTime(BaseModel):
+    status: str
+    incidents: int
+    mean: float
+    p50: float
+    p90: float
+
+
+class TrendPoint(BaseModel):
+    bucket: date
+    value: str
+    opened: int
+    resolved: int
+    resolve_seconds_mean: float | None = None
+    participants_mean: float | None = None
+
+
+"""
+Rollups
+"""
+
+periods = ["day", "week"]
+dimensions = ["all", "component", "severity", "type"]
+percentiles = {"p50": 0.5, "p90": 0.9, "p95": 0.95, "p99": 0.99}
+
+
+def bucket_start(at: datetime, period: str) -> date:
+    """
+    Return the first day of the period containing a timestamp
+
+    Parameters:
+        at (datetime): The timestamp
+        period (str): day or week, weeks start on Monday
+    """
+
+    match period:
+        case "day":
+            return at.date()
+        case "week":
+            return at.date() - timedelta(days=at.weekday())
+        case _:
+            raise ValueError(f"unknown rollup period {period}")
+
+
+def incident_dimensions(
+    metrics: IncidentMetrics,
+) -> list[tuple[str, str]]:
+    """
+    Return the rollup dimension values an incident is counted under
+
+    Parameters:
+        metrics (IncidentMetrics): The incident's metrics
+    """
+
+    values = [
+        ("all", "all"),
+        ("severity", metrics.severity or "none"),
+        ("type", metrics.incident_type or "none"),
+    ]
+    values.extend(
+        ("component", component)
+        for component in dict.fromkeys(
+            component.strip()
+            for component in (metrics.components or "").split(",")
+        )
+        if component
+    )
+
+    return values
+
+
+def is_final(status: str | None) -> bool:
+    """
+    Return whether a status ends an incident
+
+    Parameters:
+        status (str): The status
+    """
+
+    config = settings.statuses.get(status) if status else None
+
+    return bool(config and config.final)
+
+
+"""
+Database Interface
+"""
+
+
+class AnalyticsDatabaseInterface:
+    """
+    Maintains incident analytics rollups and serves queries from them
+
+    Rollups are updated as incidents are created and change, so queries
+    only read incident_metrics, incident_status_time and incident_rollup
+    """
+
+    """
+    Record
+    """
+
+    @classmethod
+    def record_opened(self, incident: IncidentRecord):
+        """
+        Start tracking a newly created incident
+
+        Parameters:
+            incident (IncidentRecord): The incident
+        """
+
+        try:
+            with db_session(engine) as session:
+                metrics = IncidentMetrics(
+                    components=incident.components,
+                    created_at=incident.created_at,
+                    incident_type=incident.incident_type,
+                    parent=incident.id,
+                    severity=incident.severity,
+                    status=incident.status,
+                    status_entered_at=incident.created_at,
+                )
+                result = session.exec(
+                    insert(IncidentMetrics)
+                    .values(**metrics.model_dump())
+                    .on_conflict_do_nothing(index_elements=["parent"])
+                )
+
+                # Already tracked, e.g. by a resumed creation
+                if result.rowcount == 0:
+                    return
+
+                self._bump(
+                    session=session,
+                    at=metrics.created_at,
+                    values=incident_dimensions(metrics),
+                    opened=1,
+                )
+                session.commit()
+        except Exception as error:
+            logger.error(
+                f"recording analytics for new incident {incident.id} failed: {error}"
+            )
+
+    @classmethod
+    def record_change(
+        self,
+        id: int,
+        col_name: str,
+        value: str,
+        at: datetime | None = None,
+    ):
+        """
+        Update rollups after an incident's severity or status changed
+
+        Parameters:
+            id (int): The incident id
+            col_name (str): severity or status
+            value (str): The new value
+            at (datetime): When the change happened, defaults to now
+        """
+
+        if col_name not in ("severity", "status"):
+            return
+
+        at = at or datetime.now()
+
+        try:
+            with db_session(engine) as session:
+                metrics = session.get(
+                    IncidentMetrics, id, with_for_update=True
+                )
+
+                if metrics is None or getattr(metrics, col_name) == value:
+                    return
+
+                match col_name:
+                    case "severity":
+                        self._change_severity(session, metrics, value)
+                    case "status":
+                        self._change_status(session, metrics, value, at)
+
+                session.add(metrics)
+                session.commit()
+        except Exception as error:
+            logger.error(
+                f"recording analytics for incident {id} {col_name} change failed: {error}"
+            )
+
+    @classmethod
+    def record_participants(self, id: int):
+        """
+        Update the participant count of an incident, participants who leave
+        a role still count as having taken part
+
+        Parameters:
+            id (int): The incident id
+        """
+
+        try:
+            with db_session(engine) as session:
+                metrics = session.get(
+                    IncidentMetrics, id, with_for_update=True
+                )
+
+                if metrics is None:
+                    return
+
+                participants = session.exec(
+                    select(
+                        func.count(func.distinct(IncidentParticipant.user_id))
+                    ).where(IncidentParticipant.parent == id)
+                ).one()
+
+                if participants <= metrics.participants:
+                    return
+
+                self._bump(
+                    session=session,
+                    at=metrics.created_at,
+                    values=incident_dimensions(metrics),
+                    participants=participants - metrics.participants,
+                )
+                metrics.participants = participants
+                session.add(metrics)
+                session.commit()
+        except Exception as error:
+            logger.error(
+                f"recording analytics participants for incident {id} failed: {error}"
+            )
+
+    @classmethod
+    def rebuild(self):
+        """
+        Recreate all rollups from incident records
+
+        Time in status can't be recovered for past changes, and incidents
+        already in a final status are taken to have been resolved at their
+        last update. Archived incidents keep their stored metrics
+        """
+
+        archived = select(IncidentArchiveRecord.id)
+
+        participants = (
+            select(
+                IncidentParticipant.parent,
+                func.count(func.distinct(IncidentParticipant.user_id)).label(
+                    "count"
+                ),
+            )
+            .group_by(IncidentParticipant.parent)
+            .subquery()
+        )
+
+        try:
+            with db_session(engine) as session:
+                session.exec(delete(IncidentRollup))
+                session.exec(
+                    delete(IncidentStatusTime).where(
+                        IncidentStatusTime.parent.not_in(archived)
+                    )
+                )
+                session.exec(
+                    delete(IncidentMetrics).where(
+                        IncidentMetrics.parent.not_in(archived)
+                    )
+                )
+
+                for metrics in session.exec(select(IncidentMetrics)).all():
+                    self._bump_totals(session=session, metrics=metrics)
+
+                rows = session.exec(
+                    select(IncidentRecord, participants.c.count).outerjoin(
+                        participants,
+                        participants.c.parent == IncidentRecord.id,
+                    )
+                ).all()
+
+                for incident, participant_count in rows:
+                    resolved_at = (
+                        incident.updated_at or incident.created_at
+                        if is_final(incident.status)
+                        else None
+                    )
+                    metrics = IncidentMetrics(
+                        components=incident.components,
+                        created_at=incident.created_at,
+                        incident_type=incident.incident_type,
+                        parent=incident.id,
+                        participants=participant_count or 0,
+                        resolved_at=resolved_at,
+                        severity=incident.severity,
+                        status=incident.status,
+                        status_entered_at=resolved_at or incident.created_at,
+                        time_to_resolve=(
+                            int(
+                                (
+                                    resolved_at - incident.created_at
+                                ).total_seconds()
+                            )
+                            if resolved_at
+                            else None
+                        ),
+                    )
+                    session.add(metrics)
+                    self._bump_totals(session=session, metrics=metrics)
+
+                session.commit()
+        except Exception as error:
+            logger.error(f"rebuilding analytics rollups failed: {error}")
+
+    @classmethod
+    def _bump_totals(self, session: Session, metrics: IncidentMetrics):
+        """
+        Add an incident's opening, participants and resolution to the rollups
+        """
+
+        self._bump(
+            session=session,
+            at=metrics.created_at,
+            values=incident_dimensions(metrics),
+            opened=1,
+            participants=metrics.participants,
+        )
+        if metrics.resolved_at:
+            self._bump(
+                session=session,
+                at=metrics.resolved_at,
+                values=incident_dimensions(metrics),
+                resolved=1,
+                resolve_seconds=metrics.time_to_resolve,
+            )
+
+    @classmethod
+    def _change_severity(
+        self,
+        session: Session,
+        metrics: IncidentMetrics,
+        severity: str,
+    ):
+        """
+        Move an incident's counts from its old severity to the new one
+        """
+
+        for sign, value in [(-1, metrics.severity), (1, severity)]:
+            values = [("severity", value or "none")]
+            self._bump(
+                session=session,
+                at=metrics.created_at,
+                values=values,
+                opened=sign,
+                participants=sign * metrics.participants,
+            )
+            if metrics.resolved_at:
+                self._bump(
+                    session=session,
+                    at=metrics.resolved_at,
+                    values=values,
+                    resolved=sign,
+                    resolve_seconds=sign * metrics.time_to_resolve,
+                )
+
+        metrics.severity = severity
+
+    @classmethod
+    def _change_status(
+        self,
+        session: Session,
+        metrics: IncidentMetrics,
+        status: str,
+        at: datetime,
+    ):
+        """
+        Close out time spent in the old status and count resolutions and
+        reopenings
+        """
+
+        stmt = insert(IncidentStatusTime).values(
+            parent=metrics.parent,
+            seconds=max(
+                int((at - metrics.status_entered_at).total_seconds()), 0
+            ),
+            status=metrics.status,
+        )
+        session.exec(
+            stmt.on_conflict_do_update(
+                index_elements=["parent", "status"],
+                set_={
+                    "seconds": IncidentStatusTime.seconds
+                    + stmt.excluded.seconds
+                },
+            )
+        )
+
+        if is_final(status) and metrics.resolved_at is None:
+            metrics.resolved_at = at
+            metrics.time_to_resolve = int(
+                (at - metrics.created_at).total_seconds()
+            )
+            self._bump(
+                session=session,
+                at=at,
+                values=incident_dimensions(metrics),
+                resolved=1,
+                resolve_seconds=metrics.time_to_resolve,
+            )
+        elif not is_final(status) and metrics.resolved_at is not None:
+            self._bump(
+                session=session,
+                at=metrics.resolved_at,
+                values=incident_dimensions(metrics),
+                resolved=-1,
+                resolve_seconds=-metrics.time_to_resolve,
+            )
+            metrics.resolved_at = None
+            metrics.time_to_resolve = None
+
+        metrics.status = status
+        metrics.status_entered_at = at
+
+    @staticmethod
+    def _bump(
+        session: Session,
+        at: datetime,
+        values: list[tuple[str, str]],
+        **deltas: int,
+    ):
+        """
+        Add to the rollup counters of every period bucket containing a
+        timestamp
+
+        Parameters:
+            session (Session): The session to write in
+            at (datetime): The timestamp
+            values (list[tuple[str, str]]): Dimensions and their values
+            deltas (int): Amounts to add, keyed by counter column
+        """
+
+        rows = [
+            {
+                "bucket": bucket_start(at, period),
+                "dimension": dimension,
+                "period": period,
+                "value": value,
+                **deltas,
+            }
+            for period in periods
+            for dimension, value in values
+        ]
+        stmt = insert(IncidentRollup).values(rows)
+        session.exec(
+            stmt.on_conflict_do_update(
+                index_elements=["period", "dimension", "value", "bucket"],
+                set_={
+                    counter: getattr(IncidentRollup, counter)
+                    + getattr(stmt.excluded, counter)
+                    for counter in deltas
+                },
+            )
+        )
+
+    """
+    Query
+    """
+
+    @classmethod
+    def summary(self, since: datetime, until: datetime) -> AnalyticsSummary:
+        """
+        Return counts and resolution times for incidents opened in a window
+
+        Parameters:
+            since (datetime): Start of the window
+            until (datetime): End of the window
+        """
+
+        window = IncidentMetrics.created_at.between(since, until)
+
+        with db_session(engine) as session:
+            totals = session.exec(
+                select(
+                    func.count(),
+                    func.count(IncidentMetrics.resolved_at),
+                    func.avg(IncidentMetrics.participants),
+                    func.avg(IncidentMetrics.time_to_resolve),
+                    *[
+                        func.percentile_cont(fraction).within_group(
+                            IncidentMetrics.time_to_resolve
+                        )
+                        for fraction in percentiles.values()
+                    ],
+                ).where(window)
+            ).one()
+
+            def counts(column) -> dict[str, int]:
+                return {
+                    value or "none": count
+                    for value, count in session.exec(
+                        select(column, func.count())
+                        .where(window)
+                        .group_by(column)
+                    ).all()
+                }
+
+            return AnalyticsSummary(
+                opened=totals[0],
+                resolved=totals[1],
+                participants_mean=totals[2],
+                time_to_resolve=ResolveTimes(
+                    mean=totals[3],
+                    **dict(zip(percentiles.keys(), totals[4:])),
+                ),
+                by_severity=counts(IncidentMetrics.severity),
+                by_status=counts(IncidentMetrics.status),
+                by_type=counts(IncidentMetrics.incident_type),
+            )
+
+    @classmethod
+    def status_times(
+        self, since: datetime, until: datetime
+    ) -> list[StatusTime]:
+        """
+        Return how long incidents opened in a window spent in each status
+
+        Parameters:
+            since (datetime): Start of the window
+            until (datetime): End of the window
+        """
+
+        with db_session(engine) as session:
+            rows = session.exec(
+                select(
+                    IncidentStatusTime.status,
+                    func.count(),
+                    func.avg(IncidentStatusTime.seconds),
+                    func.percentile_cont(0.5).within_group(
+                        IncidentStatusTime.seconds
+                    ),
+                    func.percentile_cont(0.9).within_group(
+                        IncidentStatusTime.seconds
+                    ),
+                )
+                .join(
+                    IncidentMetrics,
+                    IncidentMetrics.parent == IncidentStatusTime.parent,
+                )
+                .where(IncidentMetrics.created_at.between(since, until))
+                .group_by(IncidentStatusTime.status)
+                .order_by(IncidentStatusTime.status)
+            ).all()
+
+            return [
+                StatusTime(
+                    status=status, incidents=count, mean=mean, p50=p50, p90=p90
+                )
+                for status, count, mean, p50, p90 in rows
+            ]
+
+    @classmethod
+    def trends(
+        self,
+        period: str,
+        dimension: str,
+        since: datetime,
+        until: datetime,
+    ) -> list[TrendPoint]:
+        """
+        Return rollup counters per bucket for each value of a dimension
+
+        Parameters:
+            period (str): day or week
+            dimension (str): all, component, severity or type
+            since (datetime): Start of the window
+            until (datetime): End of the window
+        """
+
+        with db_session(engine) as session:
+            rows = session.exec(
+                select(IncidentRollup)
+                .where(
+                    IncidentRollup.period == period,
+                    IncidentRollup.dimension == dimension,
+                    IncidentRollup.bucket.between(
+                        bucket_start(since, period), until.date()
+                    ),
+                )
+                .order_by(IncidentRollup.bucket, IncidentRollup.value)
+            ).all()
+
+            return [
+                TrendPoint(
+                    bucket=row.bucket,
+                    value=row.value,
+                    opened=row.opened,
+                    resolved=row.resolved,
+                    resolve_seconds_mean=(
+                        row.resolve_seconds / row.resolved
+                        if row.resolved
+                        else None
+                    ),
+                    participants_mean=(
+                        row.participants / row.opened if row.opened else None
+                    ),
+                )
+                for row in rows
+            ]
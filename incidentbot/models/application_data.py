@@ -0,0 +1,301 @@
+import hashlib
+import json
+import threading
+import time
+import uuid
+
+from incidentbot.configuration.settings import settings
+from incidentbot.logging import logger
+from incidentbot.models.database import db_session, engine, ApplicationData
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, select
+from typing import Any, Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+"""
+Keys
+"""
+
+
+class ApplicationDataKey(Generic[T]):
+    """
+    A named value in the applicationdata table and the type of its payload
+
+    Parameters:
+        name (str): Name of the row
+        default (Callable): Returns the value to use when the row is missing
+    """
+
+    def __init__(self, name: str, default: Callable[[], T]):
+        self.name = name
+        self.default = default
+
+
+auto_page_teams: ApplicationDataKey[dict[str, list[str]]] = ApplicationDataKey(
+    "auto_page_teams", lambda: {"teams": []}
+)
+pagerduty_auto_mapping: ApplicationDataKey[dict[str, Any]] = (
+    ApplicationDataKey("pagerduty_auto_mapping", dict)
+)
+pagerduty_oc_data: ApplicationDataKey[dict[str, Any]] = ApplicationDataKey(
+    "pagerduty_oc_data", dict
+)
+slack_channels: ApplicationDataKey[list[dict[str, Any]]] = ApplicationDataKey(
+    "slack_channels", list
+)
+
+
+def content_digest(value: Any) -> str:
+    """
+    Return the SHA-256 digest of a payload's canonical JSON encoding
+
+    Parameters:
+        value (Any): The payload
+    """
+
+    return hashlib.sha256(
+        json.dumps(
+            value, sort_keys=True, separators=(",", ":"), default=str
+        ).encode()
+    ).hexdigest()
+
+
+"""
+Cache
+"""
+
+
+class ApplicationDataCache:
+    """
+    In-process cache of applicationdata rows
+
+    Writes through ApplicationDataInterface invalidate the entry right away,
+    entries also expire after ttl_seconds so that writes made by other
+    replicas are picked up
+
+    Parameters:
+        ttl_seconds (float): How long an entry is served before it's reloaded
+    """
+
+    def __init__(self, ttl_seconds: float = 60):
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[str, tuple[float, ApplicationData | None]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> tuple[bool, ApplicationData | None]:
+        """
+        Return whether a row is cached and the row, None if it doesn't exist
+        """
+
+        with self._lock:
+            entry = self._entries.get(name)
+
+        if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+            return False, None
+
+        return True, entry[1]
+
+    def set(self, name: str, record: ApplicationData | None):
+        with self._lock:
+            self._entries[name] = (time.monotonic(), record)
+
+    def invalidate(self, name: str | None = None):
+        """
+        Drop one entry, or every entry when no name is given
+        """
+
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(name, None)
+
+
+cache = ApplicationDataCache(
+    ttl_seconds=settings.options.application_data_cache_seconds
+)
+
+
+"""
+Database Interface
+"""
+
+
+class ApplicationDataInterface:
+    """
+    Typed key-value access to the applicationdata table
+
+    Cached values are shared, callers must not modify them in place
+    """
+
+    @classmethod
+    def get(self, key: ApplicationDataKey[T]) -> T:
+        """
+        Return the payload stored under a key, or the key's default
+
+        Parameters:
+            key (ApplicationDataKey): The key
+        """
+
+        record = self.get_record(key.name)
+
+        if record is None or record.json_data is None:
+            return key.default()
+
+        return record.json_data
+
+    @classmethod
+    def get_record(self, name: str) -> ApplicationData | None:
+        """
+        Return the row stored under a name, None if there isn't one
+
+        Parameters:
+            name (str): Name of the row
+        """
+
+        cached, record = cache.get(name)
+        if cached:
+            return record
+
+        try:
+            with db_session(engine) as session:
+                record = session.exec(
+                    select(ApplicationData).filter(
+                        ApplicationData.name == name
+                    )
+                ).first()
+        except Exception as error:
+            logger.error(f"ApplicationData lookup failed for {name}: {error}")
+
+            return None
+
+        cache.set(name, record)
+
+        return record
+
+    @classmethod
+    def put(self, key: ApplicationDataKey[T], value: T) -> bool:
+        """
+        Store a payload under a key and return whether anything was written -
+        payloads equal to the stored one are skipped
+
+        Parameters:
+            key (ApplicationDataKey): The key
+            value (Any): The payload
+        """
+
+        digest = content_digest(value)
+
+        cached, record = cache.get(key.name)
+        if cached and record is not None and record.digest == digest:
+            return False
+
+        try:
+            with db_session(engine) as session:
+                written = self._upsert(session, key.name, value, digest)
+                session.commit()
+        finally:
+            cache.invalidate(key.name)
+
+        return written
+
+    @classmethod
+    def create(self, key: ApplicationDataKey[T], value: T) -> bool:
+        """
+        Store a payload under a key unless the key already exists and return
+        whether it was created
+
+        Parameters:
+            key (ApplicationDataKey): The key
+            value (Any): The payload
+        """
+
+        try:
+            with db_session(engine) as session:
+                result = session.exec(
+                    insert(ApplicationData)
+                    .values(
+                        digest=content_digest(value),
+                        id=uuid.uuid4(),
+                        json_data=value,
+                        name=key.name,
+                    )
+                    .on_conflict_do_nothing(index_elements=["name"])
+                )
+                session.commit()
+        finally:
+            cache.invalidate(key.name)
+
+        return result.rowcount > 0
+
+    @classmethod
+    def update(
+        self,
+        key: ApplicationDataKey[T],
+        change: Callable[[T], T],
+    ) -> bool:
+        """
+        Replace the payload stored under an existing key with the result of
+        change, holding a row lock so concurrent updates aren't lost - does
+        nothing when the key doesn't exist
+
+        Parameters:
+            key (ApplicationDataKey): The key
+            change (Callable): Receives the current payload, returns the new
+        """
+
+        try:
+            with db_session(engine) as session:
+                record = session.exec(
+                    select(ApplicationData)
+                    .filter(ApplicationData.name == key.name)
+                    .with_for_update()
+                ).first()
+
+                if record is None:
+                    return False
+
+                value = change(
+                    key.default()
+                    if record.json_data is None
+                    else record.json_data
+                )
+                written = self._upsert(
+                    session, key.name, value, content_digest(value)
+                )
+                session.commit()
+        finally:
+            cache.invalidate(key.name)
+
+        return written
+
+    @staticmethod
+    def _upsert(session: Session, name: str, value: Any, digest: str) -> bool:
+        """
+        Insert or update a row in one statement, leaving it untouched when
+        its digest matches
+        """
+
+        stmt = insert(ApplicationData).values(
+            digest=digest,
+            id=uuid.uuid4(),
+            json_data=value,
+            name=name,
+        )
+        result = session.exec(
+            stmt.on_conflict_do_update(
+                index_elements=["name"],
+                set_={
+                    "digest": stmt.excluded.digest,
+                    "json_data": stmt.excluded.json_data,
+                    "updated_at": func.now(),
+                },
+                where=ApplicationData.digest.is_distinct_from(
+                    stmt.excluded.digest
+                ),
+            )
+        )
+
+        return result.rowcount > 0
@@ -1,11 +1,31 @@
+import threading
+import time
 import uuid
 
-from datetime import datetime
-from incidentbot.configuration.settings import settings
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date, datetime
+from incidentbot.configuration.settings import Database, settings
+from incidentbot.logging import logger
 from incidentbot.util.security import get_password_hash
 from pydantic import BaseModel, EmailStr
-from sqlalchemy import DateTime, func, text
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    Engine,
+    event,
+    exc,
+    func,
+    Index,
+    Sequence,
+    text,
+    UniqueConstraint,
+)
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.ext.mutable import MutableDict, MutableList
+from sqlalchemy.orm import ORMExecuteState, Session as OrmSession
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from sqlmodel import (
     create_engine,
     Column,
@@ -18,15 +38,363 @@ from sqlmodel import (
     Session,
     SQLModel,
 )
-from typing import Annotated, Optional
+from typing import Annotated, Any, Callable, Iterator, Optional
+
+"""
+Engine
+"""
+
+database_settings = settings.database or Database()
+
+
+class PoolCheckoutStats:
+    """
+    Counters for how long checkouts wait on a connection pool
+
+    Parameters:
+        name (str): Name of the pool used in log messages
+    """
+
+    def __init__(self, name: str):
+        self.checkouts = 0
+        self.name = name
+        self.max_wait_seconds = 0.0
+        self.slow = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.checkouts += 1
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+            self.total_wait_seconds += seconds
+            if timed_out:
+                self.timeouts += 1
+            elif seconds > database_settings.slow_checkout_warning_seconds:
+                self.slow += 1
+
+        if seconds > database_settings.slow_checkout_warning_seconds:
+            outcome = " and timed out" if timed_out else ""
+            logger.warning(
+                f"waited {seconds:.2f}s for a {self.name} database "
+                f"connection{outcome}"
+            )
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "max_wait_seconds": round(self.max_wait_seconds, 3),
+                "mean_wait_seconds": round(
+                    self.total_wait_seconds / max(self.checkouts, 1), 3
+                ),
+                "slow_checkouts": self.slow,
+                "timeouts": self.timeouts,
+            }
+
+
+class CheckoutTimingMixin:
+    """
+    Records how long each checkout from a QueuePool waits for a connection
+    """
+
+    checkout_stats: PoolCheckoutStats
+
+    def _do_get(self):
+        started = time.perf_counter()
+
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.checkout_stats.record(
+                time.perf_counter() - started, timed_out=True
+            )
+            raise
+
+        self.checkout_stats.record(time.perf_counter() - started)
+
+        return connection
+
+
+class InstrumentedQueuePool(CheckoutTimingMixin, QueuePool):
+    checkout_stats = PoolCheckoutStats("sync")
+
+
+class InstrumentedAsyncQueuePool(CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    checkout_stats = PoolCheckoutStats("async")
+
 
 engine = create_engine(
     settings.DATABASE_URI,
-    echo_pool=True,
-    pool_pre_ping=True,
+    max_overflow=database_settings.max_overflow,
+    pool_pre_ping=database_settings.pool_pre_ping,
+    pool_recycle=database_settings.pool_recycle_seconds,
+    pool_size=database_settings.pool_size,
+    pool_timeout=database_settings.pool_timeout_seconds,
+    poolclass=InstrumentedQueuePool,
+)
+
+# Used by asynchronous API routes through AsyncSessionDep
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URI,
+    max_overflow=database_settings.max_overflow,
+    pool_pre_ping=database_settings.pool_pre_ping,
+    pool_recycle=database_settings.pool_recycle_seconds,
+    pool_size=database_settings.pool_size,
+    pool_timeout=database_settings.pool_timeout_seconds,
+    poolclass=InstrumentedAsyncQueuePool,
+)
+
+
+def pool_stats() -> dict[str, Any]:
+    """
+    Return the state of each connection pool and its checkout wait counters
+    """
+
+    return {
+        pool.checkout_stats.name: {
+            "checked_out": pool.checkedout(),
+            "max_overflow": database_settings.max_overflow,
+            "overflow": pool.overflow(),
+            "size": pool.size(),
+        }
+        | pool.checkout_stats.snapshot()
+        for pool in [engine.pool, async_engine.sync_engine.pool]
+    }
+
+
+"""
+Sessions
+
+A unit of work spans one Slack action, API request, queued work item or job.
+Within it every db_session block on a thread uses the same Session. The
+session is bound to the engine rather than a connection, so a connection is
+only checked out while a transaction is open and goes back to the pool on
+commit or rollback - slow calls made between queries never hold one. Each
+block still ends like Session(engine) would: uncommitted work is rolled back
+and loaded objects are detached
+"""
+
+
+class UnitOfWork:
+    """
+    Sessions used for the duration of a unit of work, one per thread
+
+    Parameters:
+        bind (Engine): The engine the sessions check connections out from
+    """
+
+    def __init__(self, bind: Engine):
+        self.bind = bind
+        self.closed = False
+        self._busy: set[int] = set()
+        self._lock = threading.Lock()
+        self._sessions: dict[int, Session] = {}
+
+    def acquire(self, thread: int) -> Session | None:
+        """
+        Return a thread's session, None if the unit of work is closed or the
+        session is already in use by an enclosing block
+
+        Parameters:
+            thread (int): Identifier of the thread the session is for
+        """
+
+        with self._lock:
+            if self.closed or thread in self._busy:
+                return None
+            self._busy.add(thread)
+            session = self._sessions.get(thread)
+            if session is None:
+                session = self._sessions[thread] = Session(self.bind)
+
+        return session
+
+    def release(self, thread: int):
+        """
+        End the block using a thread's session, returning its connection to
+        the pool - this may run on a different thread than acquire did,
+        FastAPI tears dependencies down elsewhere
+
+        Parameters:
+            thread (int): Identifier of the thread the session is for
+        """
+
+        with self._lock:
+            self._busy.discard(thread)
+            if self.closed:
+                session = self._sessions.pop(thread, None)
+            else:
+                session = self._sessions.get(thread)
+
+        if session is not None:
+            session.close()
+
+    def close(self):
+        """
+        Close idle sessions, sessions still in use are closed when released
+        """
+
+        with self._lock:
+            self.closed = True
+            idle = [
+                self._sessions.pop(thread)
+                for thread in list(self._sessions)
+                if thread not in self._busy
+            ]
+
+        for session in idle:
+            session.close()
+
+
+current_unit_of_work: ContextVar[UnitOfWork | None] = ContextVar(
+    "current_unit_of_work", default=None
 )
 
 
+@contextmanager
+def unit_of_work(bind: Engine | None = None) -> Iterator[UnitOfWork]:
+    """
+    Run the enclosed work as one unit of work, joining the current one when
+    there is one
+
+    Parameters:
+        bind (Engine): The engine to use, defaults to the application engine
+    """
+
+    current = current_unit_of_work.get()
+    if current is not None and not current.closed:
+        yield current
+        return
+
+    uow = UnitOfWork(bind or engine)
+    token = current_unit_of_work.set(uow)
+
+    try:
+        yield uow
+    finally:
+        current_unit_of_work.reset(token)
+        uow.close()
+
+
+@contextmanager
+def db_session(bind: Engine | None = None) -> Iterator[Session]:
+    """
+    Drop-in replacement for Session(engine) that uses the current unit of
+    work's session when there is one
+
+    Parameters:
+        bind (Engine): The engine to use, defaults to the application engine
+    """
+
+    bind = bind or engine
+    thread = threading.get_ident()
+    uow = current_unit_of_work.get()
+    session = (
+        uow.acquire(thread) if uow is not None and uow.bind is bind else None
+    )
+
+    if session is None:
+        with Session(bind) as session:
+            yield session
+        return
+
+    try:
+        yield session
+    finally:
+        uow.release(thread)
+
+
+def in_unit_of_work(fn: Callable, /, *args, **kwargs) -> Any:
+    """
+    Call fn inside a unit of work
+    """
+
+    with unit_of_work():
+        return fn(*args, **kwargs)
+
+
+class UnitOfWorkExecutor(ThreadPoolExecutor):
+    """
+    Thread pool that runs every submitted callable in its own unit of work
+    """
+
+    def submit(self, fn: Callable, /, *args, **kwargs):
+        return super().submit(in_unit_of_work, fn, *args, **kwargs)
+
+
+"""
+Commit Hooks
+
+Caches built from database rows subscribe with on_commit to learn which
+tables each committed session wrote to. Writes are collected from ORM flushes
+and from statements run through a session - a statement that isn't a select
+and has no single table, like text(), is recorded as None
+"""
+
+commit_hooks: list[Callable[[set[str | None]], None]] = []
+
+
+def on_commit(
+    hook: Callable[[set[str | None]], None],
+) -> Callable[[set[str | None]], None]:
+    """
+    Register a function to call with the names of the tables written by each
+    committed session, usable as a decorator
+
+    Parameters:
+        hook (Callable): Called with the set of table names
+    """
+
+    commit_hooks.append(hook)
+
+    return hook
+
+
+def _record_writes(session: OrmSession, tables: set[str | None]):
+    session.info.setdefault("written_tables", set()).update(tables)
+
+
+@event.listens_for(OrmSession, "do_orm_execute")
+def _on_execute(state: ORMExecuteState):
+    if not state.is_select:
+        table = getattr(state.statement, "table", None)
+        _record_writes(
+            state.session, {table.name if table is not None else None}
+        )
+
+
+@event.listens_for(OrmSession, "after_flush")
+def _on_flush(session: OrmSession, flush_context):
+    _record_writes(
+        session,
+        {
+            obj.__table__.name
+            for obj in (*session.new, *session.dirty, *session.deleted)
+            if getattr(obj, "__table__", None) is not None
+        },
+    )
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _on_commit(session: OrmSession):
+    tables = session.info.pop("written_tables", None)
+    if not tables:
+        return
+
+    for hook in commit_hooks:
+        try:
+            hook(tables)
+        except Exception as error:
+            logger.error(f"commit hook {hook.__name__} failed: {error}")
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _on_rollback(session: OrmSession):
+    session.info.pop("written_tables", None)
+
+
 def db_verify():
     """
     Verify database is reachable
@@ -124,11 +492,13 @@ class ApplicationData(SQLModel, table=True):
     data: str | None = None
     deletable: bool | None = None
     description: str | None = None
+    # SHA-256 of json_data, lets writers skip unchanged payloads
+    digest: str | None = Field(default=None, max_length=64)
     id: uuid.UUID = Field(primary_key=True, default_factory=uuid.uuid4)
-    json_data: dict | None = Field(
+    json_data: dict | list | None = Field(
         sa_column=Column(JSON), default_factory=dict
     )
-    name: str
+    name: str = Field(unique=True, index=True)
     updated_at: Optional[datetime] = Field(
         sa_column=Column(
             DateTime(),
@@ -139,13 +509,18 @@ class ApplicationData(SQLModel, table=True):
 
 class IncidentRecord(SQLModel, table=True):
     __tablename__ = "incidentrecord"
+    __table_args__ = (
+        Index("ix_incidentrecord_created_at_id", "created_at", "id"),
+        Index("ix_incidentrecord_status_created_at", "status", "created_at"),
+    )
 
     additional_comms_channel: bool | None = None
     additional_comms_channel_id: str | None = None
     additional_comms_channel_link: str | None = None
     boilerplate_message_ts: str | None = None
-    channel_id: str | None = None
-    channel_name: str | None = None
+    channel_id: str | None = Field(default=None, unique=True, index=True)
+    channel_name: str | None = Field(default=None, index=True)
+    comms_reminder_minutes: int | None = None
     components: str | None = None
     created_at: datetime = Field(
         sa_column_kwargs={
@@ -174,6 +549,18 @@ class IncidentRecord(SQLModel, table=True):
     )
     link: str | None = None
     meeting_link: str | None = None
+    next_comms_reminder_at: Optional[datetime] = Field(
+        sa_column=Column(
+            DateTime(),
+            index=True,
+        )
+    )
+    next_role_check_at: Optional[datetime] = Field(
+        sa_column=Column(
+            DateTime(),
+            index=True,
+        )
+    )
     roles: dict | None = Field(
         sa_column=Column(MutableDict.as_mutable(JSON)), default_factory=dict
     )
@@ -184,7 +571,7 @@ class IncidentRecord(SQLModel, table=True):
     severities: list | None = Field(
         sa_column=Column(MutableList.as_mutable(JSON)), default_factory=list
     )
-    slug: str | None = None
+    slug: str | None = Field(default=None, unique=True, index=True)
     status: str | None = None
     statuses: list | None = Field(
         sa_column=Column(MutableList.as_mutable(JSON)), default_factory=list
@@ -205,8 +592,10 @@ class IncidentEventBase(BaseModel):
     IncidentEvent base class, excludes image
     """
 
+    change_seq: Annotated[int | None, Field(exclude=True)] = None
     created_at: datetime
     id: uuid.UUID
+    image_size: int | None = None
     incident_slug: str
     message_ts: str | None = None
     mimetype: str | None = None
@@ -226,16 +615,54 @@ class IncidentEventBase(BaseModel):
     user: str | None = None
 
 
+class EventBlob(SQLModel, table=True):
+    """
+    Postgres large objects holding event images, keyed by the SHA-256 digest
+    of their content
+    """
+
+    __tablename__ = "event_blob"
+
+    created_at: datetime = Field(
+        sa_column_kwargs={
+            "server_default": text("CURRENT_TIMESTAMP"),
+        }
+    )
+    digest: str = Field(primary_key=True, max_length=64)
+    oid: int = Field(sa_column=Column(BigInteger, nullable=False))
+    size: int
+
+
+# Numbers events each time they are added or edited, so clients can fetch the
+# changes after a position that doesn't depend on clocks or commit timing
+incidentevent_change_seq = Sequence("incidentevent_change_seq")
+
+
 class IncidentEvent(SQLModel, table=True):
     __tablename__ = "incidentevent"
+    __table_args__ = (
+        Index("ix_incidentevent_parent_change_seq", "parent", "change_seq"),
+        Index("ix_incidentevent_parent_message_ts", "parent", "message_ts"),
+    )
 
+    change_seq: int | None = Field(
+        sa_column=Column(
+            BigInteger,
+            incidentevent_change_seq,
+            onupdate=incidentevent_change_seq.next_value(),
+        )
+    )
     created_at: datetime = Field(
         sa_column_kwargs={
             "server_default": text("CURRENT_TIMESTAMP"),
         }
     )
     id: uuid.UUID = Field(primary_key=True, default_factory=uuid.uuid4)
+    # Legacy inline image content, new images are kept in the blob store and
+    # referenced by image_ref
     image: bytes | None = Field(sa_column=Column(LargeBinary))
+    image_ref: str | None = Field(default=None, index=True)
+    image_size: int | None = None
     incident: IncidentRecord | None = Relationship(
         back_populates="events",
         sa_relationship_kwargs={
@@ -271,6 +698,139 @@ class IncidentEvent(SQLModel, table=True):
     user: str | None = None
 
 
+class IncidentArchiveRecord(SQLModel, table=True):
+    """
+    Tombstone left behind for an incident moved to the archive store
+    """
+
+    __tablename__ = "incident_archive"
+
+    archive: str = Field(max_length=64)
+    archived_at: datetime = Field(
+        sa_column_kwargs={
+            "server_default": text("CURRENT_TIMESTAMP"),
+        }
+    )
+    channel_id: str | None = None
+    created_at: datetime
+    description: str | None = None
+    id: int = Field(
+        primary_key=True, sa_column_kwargs={"autoincrement": False}
+    )
+    images: str | None = Field(default=None, max_length=64)
+    severity: str | None = None
+    size: int
+    slug: str = Field(unique=True, index=True)
+    status: str | None = None
+
+
+class IncidentCreationStep(SQLModel, table=True):
+    """
+    State of a single incident creation step, used to resume creation of
+    incidents that were interrupted
+    """
+
+    __tablename__ = "incident_creation_step"
+    __table_args__ = (UniqueConstraint("parent", "name"),)
+
+    attempts: int = 0
+    created_at: datetime = Field(
+        sa_column_kwargs={
+            "server_default": text("CURRENT_TIMESTAMP"),
+        }
+    )
+    error: str | None = None
+    id: int = Field(primary_key=True)
+    name: str
+    output: dict | None = Field(sa_column=Column(JSON), default_factory=dict)
+    parent: int = Field(
+        sa_column=Column(
+            "parent",
+            ForeignKey("incidentrecord.id", ondelete="CASCADE"),
+            nullable=False,
+            index=True,
+        )
+    )
+    pipeline: str
+    status: str
+    updated_at: Optional[datetime] = Field(
+        sa_column=Column(
+            DateTime(),
+            onupdate=func.now(),
+        )
+    )
+
+
+class IncidentMetrics(SQLModel, table=True):
+    """
+    Analytics rollup for a single incident, kept up to date as the incident
+    changes so that analytics never have to replay incident history
+    """
+
+    __tablename__ = "incident_metrics"
+
+    components: str | None = None
+    created_at: datetime = Field(index=True)
+    incident_type: str | None = None
+    # Not a foreign key, metrics outlive incidents moved to the archive
+    parent: int = Field(
+        primary_key=True, sa_column_kwargs={"autoincrement": False}
+    )
+    participants: int = 0
+    resolved_at: Optional[datetime] = Field(
+        sa_column=Column(
+            DateTime(),
+            index=True,
+        )
+    )
+    severity: str | None = None
+    status: str | None = None
+    status_entered_at: datetime
+    # Seconds from creation to the first final status
+    time_to_resolve: int | None = None
+
+
+class IncidentStatusTime(SQLModel, table=True):
+    """
+    Total seconds an incident has spent in each status it has left
+    """
+
+    __tablename__ = "incident_status_time"
+
+    # Not a foreign key, see IncidentMetrics
+    parent: int = Field(primary_key=True)
+    seconds: int = 0
+    status: str = Field(primary_key=True)
+
+
+class IncidentRollup(SQLModel, table=True):
+    """
+    Incident counts and totals per day or week, per severity, status, type
+    or component
+    """
+
+    __tablename__ = "incident_rollup"
+    __table_args__ = (
+        Index(
+            "ix_incident_rollup_period_dimension_bucket",
+            "period",
+            "dimension",
+            "bucket",
+        ),
+    )
+
+    bucket: date = Field(primary_key=True)
+    dimension: str = Field(primary_key=True)
+    opened: int = 0
+    participants: int = 0
+    period: str = Field(primary_key=True)
+    resolve_seconds: int = Field(
+        default=0, sa_column=Column(BigInteger, nullable=False, default=0)
+    )
+    resolved: int = 0
+    value: str = Field(primary_key=True)
+
+
 class IncidentParticipant(SQLModel, table=True):
     created_at: datetime = Field(
         sa_column_kwargs={
@@ -283,6 +843,7 @@ class IncidentParticipant(SQLModel, table=True):
         int,
         Field(
             foreign_key="incidentrecord.id",
+            index=True,
             ondelete="CASCADE",
             exclude=True,
         ),
@@ -304,6 +865,7 @@ class JiraIssueRecord(SQLModel, table=True):
         int,
         Field(
             foreign_key="incidentrecord.id",
+            index=True,
             ondelete="CASCADE",
             exclude=True,
         ),
@@ -321,6 +883,7 @@ class GitlabIssueRecord(SQLModel, table=True):
         int,
         Field(
             foreign_key="incidentrecord.id",
+            index=True,
             ondelete="CASCADE",
             exclude=True,
         ),
@@ -376,6 +939,7 @@ class PagerDutyIncidentRecord(SQLModel, table=True):
         int,
         Field(
             foreign_key="incidentrecord.id",
+            index=True,
             ondelete="CASCADE",
             exclude=True,
         ),
@@ -395,6 +959,7 @@ class PostmortemRecord(SQLModel, table=True):
         int,
         Field(
             foreign_key="incidentrecord.id",
+            index=True,
             ondelete="CASCADE",
             exclude=True,
         ),
@@ -402,6 +967,32 @@ class PostmortemRecord(SQLModel, table=True):
     url: str | None = None
 
 
+class SlackUser(SQLModel, table=True):
+    __tablename__ = "slack_user"
+
+    content_hash: str | None = None
+    created_at: datetime = Field(
+        sa_column_kwargs={
+            "server_default": text("CURRENT_TIMESTAMP"),
+        }
+    )
+    deleted_at: Optional[datetime] = Field(
+        sa_column=Column(
+            DateTime(),
+        )
+    )
+    email: str | None = Field(default=None, index=True)
+    id: str = Field(primary_key=True)
+    name: str | None = Field(default=None, index=True)
+    real_name: str | None = Field(default=None, index=True)
+    updated_at: Optional[datetime] = Field(
+        sa_column=Column(
+            DateTime(),
+            onupdate=func.now(),
+        )
+    )
+
+
 class StatuspageIncidentRecord(SQLModel, table=True):
     channel_id: str | None = None
     id: uuid.UUID = Field(primary_key=True, default_factory=uuid.uuid4)
@@ -411,6 +1002,7 @@ class StatuspageIncidentRecord(SQLModel, table=True):
         int,
         Field(
             foreign_key="incidentrecord.id",
+            index=True,
             ondelete="CASCADE",
             exclude=True,
         ),
@@ -429,6 +1021,54 @@ class StatuspageIncidentRecord(SQLModel, table=True):
     upstream_id: str
 
 
+class WorkItem(SQLModel, table=True):
+    """
+    A task for the background work queue
+    """
+
+    __tablename__ = "work_item"
+    __table_args__ = (
+        Index("ix_work_item_status_run_after", "status", "run_after"),
+        # Only one unfinished item may exist per key
+        Index(
+            "ix_work_item_key_unfinished",
+            "key",
+            unique=True,
+            postgresql_where=text("status IN ('queued', 'running')"),
+        ),
+    )
+
+    attempts: int = 0
+    created_at: datetime = Field(
+        sa_column_kwargs={
+            "server_default": text("CURRENT_TIMESTAMP"),
+        }
+    )
+    id: int = Field(primary_key=True)
+    key: str | None = None
+    kind: str
+    last_error: str | None = None
+    locked_at: Optional[datetime] = Field(
+        sa_column=Column(
+            DateTime(),
+        )
+    )
+    max_attempts: int = 5
+    payload: dict | None = Field(sa_column=Column(JSON), default_factory=dict)
+    run_after: datetime = Field(
+        sa_column_kwargs={
+            "server_default": text("CURRENT_TIMESTAMP"),
+        }
+    )
+    status: str = "queued"
+    updated_at: Optional[datetime] = Field(
+        sa_column=Column(
+            DateTime(),
+            onupdate=func.now(),
+        )
+    )
+
+
 class User(UserBase, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     hashed_password: str
@@ -447,24 +1087,23 @@ def create_default_admin_user():
     Create default admin user
     """
 
-    user = session.exec(
-        select(User).where(User.email == settings.FIRST_SUPERUSER)
-    ).first()
-
-    if not user:
-        user_in = UserCreate(
-            email=settings.FIRST_SUPERUSER,
-            password=settings.FIRST_SUPERUSER_PASSWORD,
-            is_superuser=True,
-        )
-
-        db_obj = User.model_validate(
-            user_in,
-            update={"hashed_password": get_password_hash(user_in.password)},
-        )
-        session.add(db_obj)
-        session.commit()
-        session.refresh(db_obj)
-
-
-session = Session(engine)
+    with db_session() as session:
+        user = session.exec(
+            select(User).where(User.email == settings.FIRST_SUPERUSER)
+        ).first()
+
+        if not user:
+            user_in = UserCreate(
+                email=settings.FIRST_SUPERUSER,
+                password=settings.FIRST_SUPERUSER_PASSWORD,
+                is_superuser=True,
+            )
+
+            db_obj = User.model_validate(
+                user_in,
+                update={
+                    "hashed_password": get_password_hash(user_in.password)
+                },
+            )
+            session.add(db_obj)
+            session.commit()
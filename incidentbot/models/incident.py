@@ -1,23 +1,124 @@
+from datetime import datetime, timedelta
 from incidentbot.configuration.settings import settings
 from incidentbot.logging import logger
+from incidentbot.models.analytics import AnalyticsDatabaseInterface
 from incidentbot.models.database import (
+    db_session,
     engine,
+    IncidentCreationStep,
+    IncidentEvent,
+    IncidentEventBase,
     IncidentParticipant,
     IncidentRecord,
+    JiraIssueRecord,
     PagerDutyIncidentRecord,
     PostmortemRecord,
     StatuspageIncidentRecord,
     GitlabIssueRecord,
 )
 from incidentbot.models.slack import User
+import json
+from pydantic import BaseModel
+from sqlalchemy import (
+    func,
+    JSON,
+    literal,
+    literal_column,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import (
+    aggregate_order_by,
+    insert,
+    TSVECTOR,
+)
+from sqlalchemy.engine import Row
 from sqlalchemy.exc import NoResultFound
-from sqlmodel import or_, Session, select
+from sqlalchemy.sql import Select
+from sqlmodel import or_, select, SQLModel
+from typing import Any
 
 """
 API Models
 """
 
 
+class IncidentSearchResult(BaseModel):
+    incident: IncidentRecord
+    matched_timeline: bool
+    rank: float
+
+
+class IncidentDetail(BaseModel):
+    incident: IncidentRecord
+    events: list[IncidentEventBase] | None = None
+    gitlab: list[GitlabIssueRecord] | None = None
+    jira: list[JiraIssueRecord] | None = None
+    pagerduty: list[PagerDutyIncidentRecord] | None = None
+    participants: list[IncidentParticipant] | None = None
+    postmortem: list[PostmortemRecord] | None = None
+    statuspage: list[StatuspageIncidentRecord] | None = None
+
+
+"""
+Search
+
+incidentrecord and incidentevent each have a generated, GIN indexed
+search_vector column - they are created by migration only and not mapped on
+the models, so they are referenced as literal columns here
+"""
+
+search_config = "english"
+incident_search_vector = literal_column(
+    "incidentrecord.search_vector", TSVECTOR
+)
+event_search_vector = literal_column("incidentevent.search_vector", TSVECTOR)
+
+# Matches in the timeline count for less than matches in the incident itself
+timeline_rank_weight = 0.5
+
+
+"""
+Detail
+
+Collections an IncidentDetail can include, each with its table, the model
+its rows are returned as and the order they're listed in
+"""
+
+incident_collections: dict[
+    str, tuple[type[SQLModel], type[BaseModel], list]
+] = {
+    "events": (
+        IncidentEvent,
+        IncidentEventBase,
+        [IncidentEvent.message_ts, IncidentEvent.id],
+    ),
+    "gitlab": (
+        GitlabIssueRecord,
+        GitlabIssueRecord,
+        [GitlabIssueRecord.id],
+    ),
+    "jira": (JiraIssueRecord, JiraIssueRecord, [JiraIssueRecord.key]),
+    "pagerduty": (
+        PagerDutyIncidentRecord,
+        PagerDutyIncidentRecord,
+        [PagerDutyIncidentRecord.created_at, PagerDutyIncidentRecord.id],
+    ),
+    "participants": (
+        IncidentParticipant,
+        IncidentParticipant,
+        [IncidentParticipant.created_at, IncidentParticipant.id],
+    ),
+    "postmortem": (PostmortemRecord, PostmortemRecord, [PostmortemRecord.id]),
+    "statuspage": (
+        StatuspageIncidentRecord,
+        StatuspageIncidentRecord,
+        [StatuspageIncidentRecord.id],
+    ),
+}
+
+
 """
 Database Interface
 """
@@ -51,24 +152,57 @@ class IncidentDatabaseInterface:
         """
 
         try:
-            with Session(engine) as session:
+            with db_session(engine) as session:
                 incident = session.exec(
                     select(IncidentRecord).filter(
-                        or_(
-                            IncidentRecord.channel_id == channel_id,
-                            IncidentRecord.channel_name == channel_name,
-                            IncidentRecord.id == id,
-                            IncidentRecord.slug == slug,
+                        self.lookup_filter(
+                            channel_id=channel_id,
+                            channel_name=channel_name,
+                            id=id,
+                            slug=slug,
                         )
                     )
                 ).one()
 
                 return incident
         except NoResultFound:
-            logger.error(f"incident {channel_id} not found in database")
+            logger.error(
+                f"incident {id or channel_id or slug or channel_name} not found in database"
+            )
         except Exception as error:
             logger.error(f"incident lookup (single) query failed: {error}")
 
+    @staticmethod
+    def lookup_filter(
+        channel_id: str | None = None,
+        channel_name: str | None = None,
+        id: int | None = None,
+        slug: str | None = None,
+    ):
+        """
+        Return a filter on the first key provided so that each lookup is a
+        single probe of that column's index
+
+        Parameters:
+            channel_id (str): Filter by channel_id
+            channel_name (str): Filter by channel_name
+            id (int): Filter by incident id
+            slug (str): Filter by slug
+        """
+
+        if id is not None:
+            return IncidentRecord.id == id
+        if channel_id:
+            return IncidentRecord.channel_id == channel_id
+        if slug:
+            return IncidentRecord.slug == slug
+        if channel_name:
+            return IncidentRecord.channel_name == channel_name
+
+        raise ValueError(
+            "one of channel_id, channel_name, id or slug is required"
+        )
+
     @classmethod
     def get_statuspage_incident_record(
         self,
@@ -82,7 +216,7 @@ class IncidentDatabaseInterface:
         """
 
         try:
-            with Session(engine) as session:
+            with db_session(engine) as session:
                 return session.exec(
                     select(StatuspageIncidentRecord).filter(
                         or_(
@@ -108,7 +242,7 @@ class IncidentDatabaseInterface:
         """
 
         try:
-            with Session(engine) as session:
+            with db_session(engine) as session:
                 return session.exec(
                     select(GitlabIssueRecord).filter(
                         or_(
@@ -132,7 +266,7 @@ class IncidentDatabaseInterface:
         """
 
         try:
-            with Session(engine) as session:
+            with db_session(engine) as session:
                 incidents = session.exec(select(IncidentRecord)).all()
 
                 return incidents
@@ -140,32 +274,106 @@ class IncidentDatabaseInterface:
             logger.error(f"incident lookup (all) query failed: {error}")
 
     @classmethod
-    def list_open(self) -> list[IncidentRecord]:
+    def list_aging(
+        self,
+        max_age_days: int,
+        ignore_statuses: list[str] = [],
+    ) -> list[IncidentRecord]:
         """
-        Return all open (non-resolved) incidents
+        Return open incidents created more than max_age_days ago, oldest
+        first - incidents in a final or ignored status are excluded
+
+        Parameters:
+            max_age_days (int): Minimum age of an incident in days
+            ignore_statuses (list[str]): Additional statuses to exclude
         """
 
+        excluded = [
+            status
+            for status, config in settings.statuses.items()
+            if config.final
+        ] + list(ignore_statuses)
+
         try:
-            with Session(engine) as session:
-                final_statuses = [
-                    status
-                    for status, config in settings.statuses.items()
-                    if config.final
-                ]
+            with db_session(engine) as session:
+                query = select(IncidentRecord).filter(
+                    IncidentRecord.created_at
+                    < func.now() - timedelta(days=max_age_days)
+                )
+
+                if excluded:
+                    query = query.filter(
+                        IncidentRecord.status.not_in(excluded)
+                    )
+
+                return session.exec(
+                    query.order_by(IncidentRecord.created_at)
+                ).all()
+        except Exception as error:
+            logger.error(f"incident lookup (aging) query failed: {error}")
+
+    @classmethod
+    def list_open(
+        self,
+        limit: int | None = None,
+        before: tuple[datetime, int] | None = None,
+    ) -> list[IncidentRecord]:
+        """
+        Return open (non-final) incidents, newest first
+
+        Parameters:
+            limit (int): How many incidents to return, all when omitted
+            before (tuple[datetime, int]): created_at and id of the last
+                incident of the previous page
+        """
+
+        final_statuses = [
+            status
+            for status, config in settings.statuses.items()
+            if config.final
+        ]
+
+        try:
+            with db_session(engine) as session:
+                query = select(IncidentRecord)
 
                 if final_statuses:
-                    incidents = session.exec(
-                        select(IncidentRecord).filter(
-                            IncidentRecord.status != final_statuses[0]
-                        )
-                    ).all()
-                else:
-                    incidents = session.exec(select(IncidentRecord)).all()
+                    query = query.filter(
+                        IncidentRecord.status.not_in(final_statuses)
+                    )
+
+                query = self.keyset_page(query=query, before=before)
 
-            return incidents
+                if limit is not None:
+                    query = query.limit(limit)
+
+                return session.exec(query).all()
         except Exception as error:
             logger.error(f"incident lookup query failed: {error}")
 
+    @staticmethod
+    def keyset_page(query, before: tuple[datetime, int] | None = None):
+        """
+        Order a query on incidentrecord newest first and, if before is given,
+        continue from the incident it identifies - keyset pagination on
+        (created_at, id) reads only the rows returned, unlike OFFSET
+
+        Parameters:
+            query (Select): Query selecting from incidentrecord
+            before (tuple[datetime, int]): created_at and id of the last
+                incident of the previous page
+        """
+
+        if before:
+            query = query.filter(
+                tuple_(IncidentRecord.created_at, IncidentRecord.id)
+                < tuple_(*before)
+            )
+
+        return query.order_by(
+            IncidentRecord.created_at.desc(), IncidentRecord.id.desc()
+        )
+
     @classmethod
     def list_pagerduty_incident_records(
         self,
@@ -179,7 +387,7 @@ class IncidentDatabaseInterface:
         """
 
         try:
-            with Session(engine) as session:
+            with db_session(engine) as session:
                 return session.exec(
                     select(PagerDutyIncidentRecord).filter(
                         or_(
@@ -193,32 +401,171 @@ class IncidentDatabaseInterface:
             logger.error(f"Lookup failed: {error}")
 
     @classmethod
-    def list_recent(self, limit: int = 5) -> list[IncidentRecord]:
+    def list_recent(
+        self,
+        limit: int = 5,
+        before: tuple[datetime, int] | None = None,
+    ) -> list[IncidentRecord]:
         """
-        Return most recent incidents, limit defaults to 5
+        Return most recent open incidents, newest first, limit defaults to 5
 
         Parameters:
             limit (int): How many incidents to return
+            before (tuple[datetime, int]): created_at and id of the last
+                incident of the previous page
         """
 
-        final_statuses = [
-            status
-            for status, config in settings.statuses.items()
-            if config.final
-        ]
-        final_status = final_statuses[0] if final_statuses else None
+        return self.list_open(limit=limit, before=before)
+
+    """
+    Detail
+    """
+
+    @staticmethod
+    def detail_query(slug: str, include: list[str]) -> Select:
+        """
+        Return a query selecting an incident along with one JSON array per
+        included collection, so the whole detail is read in one statement
+
+        Parameters:
+            slug (str): The incident slug
+            include (list[str]): Names from incident_collections
+        """
+
+        collections = []
+        for name in include:
+            table, _, order_by = incident_collections[name]
+            row = func.json_build_object(
+                *[
+                    value
+                    for column in table.__table__.c
+                    # Inline event images are served by their own endpoint
+                    if column.name != "image"
+                    for value in (literal(column.name), column)
+                ]
+            )
+            collections.append(
+                select(
+                    func.coalesce(
+                        func.json_agg(aggregate_order_by(row, *order_by)),
+                        literal_column("'[]'::json"),
+                        type_=JSON,
+                    )
+                )
+                .where(table.parent == IncidentRecord.id)
+                .scalar_subquery()
+                .label(name)
+            )
+
+        return select(IncidentRecord, *collections).where(
+            IncidentRecord.slug == slug
+        )
+
+    @staticmethod
+    def detail_from_row(row: Row, include: list[str]) -> IncidentDetail:
+        """
+        Build an IncidentDetail from a row returned by detail_query
+
+        Parameters:
+            row (Row): The row
+            include (list[str]): The names passed to detail_query
+        """
+
+        # Table models aren't validated on construction, validating each row
+        # explicitly parses the timestamps and ids serialized in the JSON
+        return IncidentDetail(
+            incident=row[0],
+            **{
+                name: [
+                    incident_collections[name][1].model_validate(item)
+                    for item in row._mapping[name]
+                ]
+                for name in include
+            },
+        )
+
+    """
+    Search
+    """
+
+    @staticmethod
+    def search_filter(terms: str):
+        """
+        Return a filter matching incidents whose slug, description, impact or
+        components match the search terms
+
+        Parameters:
+            terms (str): Search terms, web search syntax is supported
+        """
+
+        return incident_search_vector.op("@@")(
+            func.websearch_to_tsquery(search_config, terms)
+        )
+
+    @classmethod
+    def search(
+        self,
+        terms: str,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> list[IncidentSearchResult]:
+        """
+        Return incidents matching the search terms in their own fields or in
+        their timeline, best match first
+
+        Parameters:
+            terms (str): Search terms, web search syntax is supported
+            limit (int): How many results to return
+            offset (int): How many results to skip
+        """
+
+        query = func.websearch_to_tsquery(search_config, terms)
+        matches = union_all(
+            select(
+                IncidentRecord.id.label("id"),
+                func.ts_rank_cd(incident_search_vector, query).label("rank"),
+                literal(False).label("timeline"),
+            ).where(incident_search_vector.op("@@")(query)),
+            select(
+                IncidentEvent.parent.label("id"),
+                (
+                    func.ts_rank_cd(event_search_vector, query)
+                    * timeline_rank_weight
+                ).label("rank"),
+                literal(True).label("timeline"),
+            ).where(event_search_vector.op("@@")(query)),
+        ).subquery()
+        rank = func.max(matches.c.rank).label("rank")
 
         try:
-            with Session(engine) as session:
-                incidents = session.exec(
-                    select(IncidentRecord)
-                    .filter(IncidentRecord.status != final_status)
-                    .order_by(IncidentRecord.created_at)
+            with db_session(engine) as session:
+                rows = session.exec(
+                    select(
+                        IncidentRecord,
+                        rank,
+                        func.bool_or(matches.c.timeline).label("timeline"),
+                    )
+                    .join(matches, matches.c.id == IncidentRecord.id)
+                    .group_by(IncidentRecord.id)
+                    .order_by(
+                        rank.desc(),
+                        IncidentRecord.created_at.desc(),
+                        IncidentRecord.id.desc(),
+                    )
+                    .limit(limit)
+                    .offset(offset)
                 ).all()
 
-            return incidents[-limit:]
+                return [
+                    IncidentSearchResult(
+                        incident=incident,
+                        matched_timeline=timeline,
+                        rank=rank,
+                    )
+                    for incident, rank, timeline in rows
+                ]
         except Exception as error:
-            logger.error(f"incident lookup (recent) query failed: {error}")
+            logger.error(f"incident search failed: {error}")
 
     """
     Update
@@ -243,35 +590,160 @@ class IncidentDatabaseInterface:
             id (str): Filter by incident id
         """
 
-        try:
-            with Session(engine) as session:
-                incident = session.exec(
-                    select(IncidentRecord).filter(
-                        or_(
-                            IncidentRecord.channel_id == channel_id,
-                            IncidentRecord.id == id,
-                        )
-                    )
-                ).one()
+        match col_name:
+            case (
+                "channel_name"
+                | "description"
+                | "last_update_sent"
+                | "severity"
+                | "status"
+            ):
+                pass
+            case _:
+                logger.error(f"incident col {col_name} can't be updated")
+
+                return
 
-                match col_name:
-                    case "channel_name":
-                        incident.channel_name = value
-                    case "description":
-                        incident.description = value
-                    case "last_update_sent":
-                        incident.last_update_sent = value
-                    case "severity":
-                        incident.severity = value
-                    case "status":
-                        incident.status = value
-                session.add(incident)
+        try:
+            with db_session(engine) as session:
+                updated = session.exec(
+                    update(IncidentRecord)
+                    .where(self.lookup_filter(channel_id=channel_id, id=id))
+                    .values({col_name: value})
+                    .returning(IncidentRecord.id)
+                ).all()
                 session.commit()
+
+                if not updated:
+                    logger.error(
+                        f"incident col update for col {col_name} found no row for {id or channel_id}"
+                    )
+                    return
         except Exception as error:
             logger.error(
-                f"incident col update failed for col {col_name} in row {id}: {error}"
+                f"incident col update failed for col {col_name} in row {id or channel_id}: {error}"
+            )
+            return
+
+        AnalyticsDatabaseInterface.record_change(
+            id=updated[0].id, col_name=col_name, value=value
+        )
+
+    """
+    Reminders
+    """
+
+    @classmethod
+    def claim_due_reminders(self, kind: str, limit: int = 100) -> list[str]:
+        """
+        Return the channel ids of open incidents whose comms reminder or role
+        check is due and move the next occurrence forward by one interval
+
+        Rows are locked with SKIP LOCKED so concurrent sweepers don't send the
+        same reminder twice
+
+        Parameters:
+            kind (str): comms_reminder or role_watcher
+            limit (int): Maximum number of incidents to return
+        """
+
+        match kind:
+            case "comms_reminder":
+                column = IncidentRecord.next_comms_reminder_at
+                minutes = func.coalesce(
+                    IncidentRecord.comms_reminder_minutes,
+                    settings.initial_comms_reminder_minutes,
+                )
+            case "role_watcher":
+                column = IncidentRecord.next_role_check_at
+                minutes = settings.initial_role_watcher_minutes
+            case _:
+                raise ValueError(f"unknown reminder {kind}")
+
+        if isinstance(minutes, int):
+            next_at = func.now() + timedelta(minutes=minutes)
+        else:
+            next_at = (
+                func.now() + literal_column("interval '1 minute'") * minutes
             )
 
+        final_statuses = [
+            status
+            for status, config in settings.statuses.items()
+            if config.final
+        ]
+
+        with db_session(engine) as session:
+            incidents = session.exec(
+                select(IncidentRecord.id, IncidentRecord.channel_id)
+                .where(
+                    column <= func.now(),
+                    IncidentRecord.status.not_in(final_statuses),
+                )
+                .order_by(column)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            ).all()
+
+            if incidents:
+                session.exec(
+                    update(IncidentRecord).where(
+                        IncidentRecord.id.in_([i.id for i in incidents])
+                    )
+                    # Reminder bookkeeping isn't a change to the incident
+                    .values(
+                        {
+                            column: next_at,
+                            IncidentRecord.updated_at: IncidentRecord.updated_at,
+                        }
+                    )
+                )
+            session.commit()
+
+            return [i.channel_id for i in incidents]
+
+    @classmethod
+    def set_reminder(
+        self,
+        kind: str,
+        id: int,
+        minutes: int | None,
+    ):
+        """
+        Schedule the next comms reminder or role check for an incident, None
+        stops it
+
+        Parameters:
+            kind (str): comms_reminder or role_watcher
+            id (int): ID of the incident
+            minutes (int | None): Minutes until the next occurrence, the comms
+                reminder keeps repeating at this interval
+        """
+
+        next_at = func.now() + timedelta(minutes=minutes) if minutes else None
+
+        match kind:
+            case "comms_reminder":
+                values = {
+                    "comms_reminder_minutes": minutes,
+                    "next_comms_reminder_at": next_at,
+                }
+            case "role_watcher":
+                values = {"next_role_check_at": next_at}
+            case _:
+                raise ValueError(f"unknown reminder {kind}")
+
+        try:
+            with db_session(engine) as session:
+                session.exec(
+                    update(IncidentRecord)
+                    .where(IncidentRecord.id == id)
+                    .values(**values)
+                )
+                session.commit()
+        except Exception as error:
+            logger.error(f"setting {kind} for incident {id} failed: {error}")
+
     """
     Role management
     """
@@ -295,7 +767,7 @@ class IncidentDatabaseInterface:
         """
 
         try:
-            with Session(engine) as session:
+            with db_session(engine) as session:
                 participant = IncidentParticipant(
                     is_lead=is_lead,
                     parent=incident.id,
@@ -310,6 +782,9 @@ class IncidentDatabaseInterface:
             logger.error(
                 f"adding user {user.name} to incident {incident.slug} failed: {error}"
             )
+            return
+
+        AnalyticsDatabaseInterface.record_participants(id=incident.id)
 
     @classmethod
     def check_role_assigned_to_user(
@@ -328,7 +803,7 @@ class IncidentDatabaseInterface:
         """
 
         try:
-            with Session(engine) as session:
+            with db_session(engine) as session:
                 participant = session.exec(
                     select(IncidentParticipant).filter(
                         IncidentParticipant.parent == incident.id,
@@ -355,7 +830,7 @@ class IncidentDatabaseInterface:
         """
 
         try:
-            with Session(engine) as session:
+            with db_session(engine) as session:
                 participants = session.exec(
                     select(IncidentParticipant).filter(
                         IncidentParticipant.parent == incident.id,
@@ -386,7 +861,7 @@ class IncidentDatabaseInterface:
         """
 
         try:
-            with Session(engine) as session:
+            with db_session(engine) as session:
                 participant = session.exec(
                     select(IncidentParticipant).filter(
                         IncidentParticipant.parent == incident.id,
@@ -421,7 +896,7 @@ class IncidentDatabaseInterface:
         """
 
         try:
-            with Session(engine) as session:
+            with db_session(engine) as session:
                 postmortem = PostmortemRecord(
                     parent=parent,
                     url=url,
@@ -444,9 +919,159 @@ class IncidentDatabaseInterface:
             parent (int): ID of associated incident
         """
 
-        with Session(engine) as session:
+        with db_session(engine) as session:
             return session.exec(
                 select(PostmortemRecord).filter(
                     PostmortemRecord.parent == parent,
                 )
             ).first()
+
+    """
+    Creation steps
+    """
+
+    @classmethod
+    def claim_creation(self, parent: int, attempts: int) -> bool:
+        """
+        Claim an unfinished incident creation for resuming - only one caller
+        can claim a given attempt
+
+        Parameters:
+            parent (int): ID of the incident
+            attempts (int): Attempts recorded on the request step when read
+        """
+
+        try:
+            with db_session(engine) as session:
+                result = session.exec(
+                    update(IncidentCreationStep)
+                    .where(
+                        IncidentCreationStep.parent == parent,
+                        IncidentCreationStep.name == "request",
+                        IncidentCreationStep.attempts == attempts,
+                    )
+                    .values(attempts=attempts + 1, updated_at=func.now())
+                )
+                session.commit()
+
+                return result.rowcount == 1
+        except Exception as error:
+            logger.error(
+                f"claiming creation of incident {parent} failed: {error}"
+            )
+
+            return False
+
+    @classmethod
+    def list_creation_steps(self, parent: int) -> list[IncidentCreationStep]:
+        """
+        Return the recorded creation steps of an incident
+
+        Parameters:
+            parent (int): ID of the incident
+        """
+
+        with db_session(engine) as session:
+            return session.exec(
+                select(IncidentCreationStep).filter(
+                    IncidentCreationStep.parent == parent
+                )
+            ).all()
+
+    @classmethod
+    def list_unfinished_creations(
+        self, max_attempts: int, stale_minutes: int
+    ) -> list[IncidentCreationStep]:
+        """
+        Return the request step of every incident whose creation has not
+        completed and has made no progress for stale_minutes
+
+        Parameters:
+            max_attempts (int): Ignore creations attempted this many times
+            stale_minutes (int): Minutes without progress before a creation
+                is considered interrupted
+        """
+
+        complete = select(IncidentCreationStep.parent).where(
+            IncidentCreationStep.name == "complete"
+        )
+        recent = select(IncidentCreationStep.parent).where(
+            func.coalesce(
+                IncidentCreationStep.updated_at,
+                IncidentCreationStep.created_at,
+            )
+            >= func.now() - timedelta(minutes=stale_minutes)
+        )
+
+        try:
+            with db_session(engine) as session:
+                return session.exec(
+                    select(IncidentCreationStep)
+                    .where(
+                        IncidentCreationStep.name == "request",
+                        IncidentCreationStep.attempts < max_attempts,
+                        IncidentCreationStep.parent.not_in(complete),
+                        IncidentCreationStep.parent.not_in(recent),
+                    )
+                    .order_by(IncidentCreationStep.parent)
+                ).all()
+        except Exception as error:
+            logger.error(f"unfinished creation lookup failed: {error}")
+
+            return []
+
+    @classmethod
+    def save_creation_step(
+        self,
+        parent: int,
+        pipeline: str,
+        name: str,
+        status: str,
+        error: str | None = None,
+        output: Any = None,
+    ):
+        """
+        Record the state of an incident creation step
+
+        Parameters:
+            parent (int): ID of the incident
+            pipeline (str): Pipeline the step belongs to
+            name (str): Name of the step
+            status (str): running, succeeded, failed or skipped
+            error (str): Error raised by the step, if any
+            output (Any): JSON serializable value returned by the step, other
+                values are logged and stored as None
+        """
+
+        try:
+            json.dumps(output, allow_nan=False)
+        except (TypeError, ValueError) as serialization_error:
+            logger.error(
+                f"output of incident {parent} creation step {name} can't be stored, storing None: {serialization_error}"
+            )
+            output = None
+
+        stmt = insert(IncidentCreationStep).values(
+            attempts=1 if status == "running" else 0,
+            error=error,
+            name=name,
+            output={"value": output},
+            parent=parent,
+            pipeline=pipeline,
+            status=status,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["parent", "name"],
+            set_={
+                "attempts": IncidentCreationStep.attempts
+                + (1 if status == "running" else 0),
+                "error": stmt.excluded.error,
+                "output": stmt.excluded.output,
+                "status": stmt.excluded.status,
+                "updated_at": func.now(),
+            },
+        )
+
+        with db_session(engine) as session:
+            session.exec(stmt)
+            session.commit()
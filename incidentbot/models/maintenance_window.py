@@ -1,9 +1,13 @@
 import uuid
 
 from incidentbot.logging import logger
-from incidentbot.models.database import engine, MaintenanceWindowRecord
+from incidentbot.models.database import (
+    db_session,
+    engine,
+    MaintenanceWindowRecord,
+)
 from sqlalchemy.exc import NoResultFound
-from sqlmodel import or_, Session, select
+from sqlmodel import or_, select
 
 """
 API Models
@@ -38,7 +42,7 @@ class MaintenanceWindowDatabaseInterface:
         """
 
         try:
-            with Session(engine) as session:
+            with db_session(engine) as session:
                 maintenance_window = session.exec(
                     select(MaintenanceWindowRecord).filter(
                         or_(
@@ -66,7 +70,7 @@ class MaintenanceWindowDatabaseInterface:
         """
 
         try:
-            with Session(engine) as session:
+            with db_session(engine) as session:
                 return session.exec(select(MaintenanceWindowRecord)).all()
         except Exception as error:
             logger.error(
@@ -90,7 +94,7 @@ class MaintenanceWindowDatabaseInterface:
         """
 
         try:
-            with Session(engine) as session:
+            with db_session(engine) as session:
                 session.delete(maintenance_window)
                 session.commit()
         except Exception as error:
@@ -117,7 +121,7 @@ class MaintenanceWindowDatabaseInterface:
         """
 
         try:
-            with Session(engine) as session:
+            with db_session(engine) as session:
                 maintenance_window = session.exec(
                     select(MaintenanceWindowRecord).filter(
                         or_(
@@ -1,9 +1,29 @@
-import sqlalchemy
-
 from incidentbot.logging import logger
-from incidentbot.models.database import engine, ApplicationData
+from incidentbot.models.application_data import (
+    ApplicationDataInterface,
+    auto_page_teams,
+    pagerduty_auto_mapping,
+)
 from pydantic import BaseModel
-from sqlmodel import Session, select
+
+
+class OnCallAggregate(BaseModel):
+    """
+    Result of a single pass over PagerDuty on-call data
+
+    Parameters:
+        api_calls (int): Number of requests made against /oncalls
+        auto_mapping (dict): Payload stored as pagerduty_auto_mapping
+        elapsed (float): Time spent building the aggregate, in seconds
+        entries (int): Number of on-call entries returned by PagerDuty
+        on_call (dict): Payload stored as pagerduty_oc_data
+    """
+
+    api_calls: int = 0
+    auto_mapping: dict = {}
+    elapsed: float = 0.0
+    entries: int = 0
+    on_call: dict = {}
 
 
 class PagerAutoMappingRequest(BaseModel):
@@ -11,27 +31,12 @@ class PagerAutoMappingRequest(BaseModel):
 
 
 def read_pager_auto_page_targets():
-    name = "auto_page_teams"
-
     try:
-        with Session(engine) as session:
-            res = session.exec(
-                select(ApplicationData).filter(ApplicationData.name == name)
-            ).first()
-
-            targets = res.json_data["teams"]
-            mappings = (
-                session.exec(
-                    select(ApplicationData).filter(
-                        ApplicationData.name == "pagerduty_auto_mapping"
-                    )
-                )
-                .one()
-                .json_data
-            )
-
-            return [{t: mappings[t]} for t in targets]
-    except sqlalchemy.exc.NoResultFound as error:
-        logger.error(f"Setting lookup failed for {name}: {error}")
+        targets = ApplicationDataInterface.get(auto_page_teams)["teams"]
+        mappings = ApplicationDataInterface.get(pagerduty_auto_mapping)
+
+        return [{t: mappings[t]} for t in targets]
     except Exception as error:
-        logger.error(f"Setting lookup failed for {name}: {error}")
+        logger.error(
+            f"Setting lookup failed for {auto_page_teams.name}: {error}"
+        )
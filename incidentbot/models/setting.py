@@ -1,13 +1,13 @@
 import sqlalchemy
 
 from incidentbot.logging import logger
-from incidentbot.models.database import engine, Setting
-from sqlmodel import Session, select
+from incidentbot.models.database import db_session, engine, Setting
+from sqlmodel import select
 from typing import Dict
 
 
 def read_single_setting_value(name: str) -> Dict:
-    with Session(engine) as session:
+    with db_session(engine) as session:
         try:
             setting = session.exec(
                 select(Setting).filter(Setting.name == name)
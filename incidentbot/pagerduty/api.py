@@ -1,18 +1,84 @@
 import json
+import time
 
+from collections.abc import Callable, Iterable
 from incidentbot.configuration.settings import settings
 from incidentbot.logging import logger
+from incidentbot.models.application_data import (
+    ApplicationDataInterface,
+    pagerduty_auto_mapping,
+    pagerduty_oc_data,
+)
 from incidentbot.models.database import (
+    db_session,
     engine,
-    ApplicationData,
     IncidentRecord,
     PagerDutyIncidentRecord,
 )
-from incidentbot.slack.client import slack_workspace_id
+from incidentbot.models.pager import OnCallAggregate
+from incidentbot.slack.client import (
+    get_slack_user_ids_by_real_name,
+    slack_workspace_id,
+)
 from incidentbot.util.gen import fetch_timestamp
 from pagerduty import RestApiV2Client, Error as PDClientError
-from sqlalchemy import update
-from sqlmodel import Session, select
+from sqlmodel import select
+
+# Largest page size accepted by the PagerDuty API for classic pagination
+oncalls_page_size = 100
+
+
+def group_on_calls(
+    oncalls: Iterable[dict],
+    resolve_slack_user_ids: Callable[[str], list[str]],
+) -> OnCallAggregate:
+    """
+    Group PagerDuty on-call entries by escalation policy in a single pass
+
+    Slack user matching is resolved once per PagerDuty user rather than once
+    per entry
+
+    Parameters:
+        oncalls (Iterable[dict]): On-call entries as returned by /oncalls
+        resolve_slack_user_ids (Callable[[str], list[str]]): Returns the Slack
+            user IDs for a PagerDuty user name
+    """
+
+    aggregate = OnCallAggregate()
+    slack_user_ids = {}
+
+    for item in oncalls:
+        aggregate.entries += 1
+
+        policy = item.get("escalation_policy")
+        summary = policy.get("summary")
+
+        aggregate.auto_mapping[summary] = summary
+        entries = aggregate.on_call.setdefault(summary, [])
+
+        if item.get("start") is None or item.get("end") is None:
+            continue
+
+        user = item.get("user").get("summary")
+        if user not in slack_user_ids:
+            slack_user_ids[user] = resolve_slack_user_ids(user)
+
+        entries.append(
+            {
+                "escalation_level": item.get("escalation_level"),
+                "escalation_policy": summary,
+                "escalation_policy_id": policy.get("id"),
+                "user": user,
+                "start": item.get("start"),
+                "end": item.get("end"),
+                "slack_user_id": slack_user_ids[user],
+            }
+        )
+
+    for entries in aggregate.on_call.values():
+        entries.sort(key=lambda x: x.get("escalation_level"))
+
+    return aggregate
 
 
 class PagerDutyInterface:
@@ -49,80 +115,59 @@ class PagerDutyInterface:
                 return policy.get("services")[0].get("id")
 
     @classmethod
-    def get_on_calls(self, short: bool = False) -> dict:
+    def aggregate_on_calls(self) -> OnCallAggregate:
         """
-        Given a PagerDuty instance, loop through oncall schedules and return info
-        on each one identifying who to contact when run
+        Page through /oncalls exactly once and build both the on-call data and
+        the auto page mapping from the same result
 
-        This is stored in the database and will only refresh when this function is
-        called to avoid API abuse
+        The returned aggregate also carries the number of PagerDuty API requests
+        made and the elapsed time so that callers can report on each run
         """
 
-        on_call = {}
-        auto_mapping = {}
+        started = time.perf_counter()
 
-        try:
-            with Session(engine) as session:
-                slack_users_from_dict = session.exec(
-                    select(ApplicationData).filter(
-                        ApplicationData.name == "slack_users"
-                    )
-                ).first()
-        except Exception as error:
-            logger.error(
-                f"Error retrieving list of Slack users from db: {error}"
-            )
+        # Every request sent is counted, including retries
+        requests = []
+        session = self.session()
+        session.event_hooks["request"].append(requests.append)
 
-        slack_users = {
-            user.get("real_name"): user.get("id")
-            for user in slack_users_from_dict
-            if user.__contains__("real_name")
-        }
+        aggregate = group_on_calls(
+            oncalls=session.iter_all("oncalls", page_size=oncalls_page_size),
+            resolve_slack_user_ids=get_slack_user_ids_by_real_name,
+        )
+        aggregate.api_calls = len(requests)
+        aggregate.elapsed = round(time.perf_counter() - started, 3)
 
-        oncalls = self.session().iter_all("oncalls")
+        if aggregate.entries == 0:
+            logger.warning("PagerDuty schedule information returned as empty")
 
-        if oncalls is None:
-            logger.warn("PagerDuty schedule information returned as empty")
+        logger.info(
+            f"PagerDuty returned {len(aggregate.on_call)} schedules from "
+            + f"{aggregate.entries} on-call entries "
+            + f"({aggregate.api_calls} API calls, {aggregate.elapsed}s)"
+        )
 
-            return {}
-        else:
-            for item in oncalls:
-                on_call[item.get("escalation_policy").get("summary")] = sorted(
-                    [
-                        {
-                            "escalation_level": item.get("escalation_level"),
-                            "escalation_policy": item.get(
-                                "escalation_policy"
-                            ).get("summary"),
-                            "escalation_policy_id": item.get(
-                                "escalation_policy"
-                            ).get("id"),
-                            "user": item.get("user").get("summary"),
-                            "start": item.get("start"),
-                            "end": item.get("end"),
-                            "slack_user_id": [
-                                val
-                                for key, val in slack_users.items()
-                                if item.get("user").get("summary") in key
-                            ],
-                        }
-                        for item in self.session().iter_all("oncalls")
-                        if item.get("start") is not None
-                        and item.get("end") is not None
-                    ],
-                    key=lambda x: x.get("escalation_level"),
-                )
+        return aggregate
 
-                auto_mapping[item.get("escalation_policy").get("summary")] = (
-                    item.get("escalation_policy").get("summary")
-                )
+    @classmethod
+    def get_on_calls(self, short: bool = False) -> dict:
+        """
+        Given a PagerDuty instance, loop through oncall schedules and return info
+        on each one identifying who to contact when run
 
-        logger.info(f"PagerDuty returned {len(on_call)} schedules")
+        This is stored in the database and will only refresh when this function is
+        called to avoid API abuse
+
+        Parameters:
+            short (bool): Return the auto page mapping instead of the full data
+        """
+
+        aggregate = self.aggregate_on_calls()
 
         if short:
-            return auto_mapping
+            return aggregate.auto_mapping
         else:
-            return on_call
+            return aggregate.on_call
 
     def page(
         self,
@@ -130,6 +175,7 @@ class PagerDutyInterface:
         channel_name: str,
         paging_user: str,
         priority: str,
+        incident_key: str | None = None,
     ) -> str:
         """
         Page via an escalation policy when triggered from Slack
@@ -139,6 +185,8 @@ class PagerDutyInterface:
             channel_name (str): The name of the incident channel
             paging_user (str): The user issuing the page
             priority (str): The priority of the page
+            incident_key (str): Deduplication key, PagerDuty rejects a page
+                while an open incident with the same key exists
         """
 
         if self.escalation_policy_id is not None:
@@ -151,7 +199,8 @@ class PagerDutyInterface:
                         "type": "service_reference",
                     },
                     "urgency": priority,
-                    "incident_key": f"{channel_name}-{fetch_timestamp()}",
+                    "incident_key": incident_key
+                    or f"{channel_name}-{fetch_timestamp()}",
                     "body": {
                         "type": "incident_body",
                         "details": "An incident has been started in Slack and this team has been paged as a result. "
@@ -177,7 +226,7 @@ class PagerDutyInterface:
                     )
                 else:
                     try:
-                        with Session(engine) as session:
+                        with db_session(engine) as session:
                             created_incident = json.loads(response.text).get(
                                 "incident"
                             )
@@ -247,70 +296,21 @@ class PagerDutyInterface:
         in the database
 
         This stores both a comprehensive list of schedule information and a mapping made
-        available to the auto page functions
+        available to the auto page functions - both are built from a single pass over
+        the PagerDuty API
         """
 
-        with Session(engine) as session:
-            try:
-                record_name = "pagerduty_oc_data"
-
-                # Create the row if it doesn't exist
-                if not session.exec(
-                    select(ApplicationData).filter(
-                        ApplicationData.name == record_name
-                    )
-                ).first():
-                    try:
-                        row = ApplicationData(name=record_name)
-                        session.add(row)
-                        session.commit()
-                    except Exception as error:
-                        logger.error(
-                            f"ApplicationData row create failed for {record_name}: {error}"
-                        )
-
-                session.exec(
-                    update(ApplicationData)
-                    .where(ApplicationData.name == record_name)
-                    .values(
-                        json_data=self.get_on_calls(),
-                    )
-                )
-                session.commit()
-            except Exception as error:
-                logger.error(
-                    f"ApplicationData row edit failed for {record_name}: {error}"
-                )
+        aggregate = self.aggregate_on_calls()
 
+        for key, json_data in (
+            (pagerduty_oc_data, aggregate.on_call),
+            (pagerduty_auto_mapping, aggregate.auto_mapping),
+        ):
             try:
-                record_name = "pagerduty_auto_mapping"
-
-                # Create the row if it doesn't exist
-                if not session.exec(
-                    select(ApplicationData).filter(
-                        ApplicationData.name == record_name
-                    )
-                ).first():
-                    try:
-                        row = ApplicationData(name=record_name)
-                        session.add(row)
-                        session.commit()
-                    except Exception as error:
-                        logger.error(
-                            f"ApplicationData row create failed for {record_name}: {error}"
-                        )
-
-                session.exec(
-                    update(ApplicationData)
-                    .where(ApplicationData.name == record_name)
-                    .values(
-                        json_data=self.get_on_calls(short=True),
-                    )
-                )
-                session.commit()
+                ApplicationDataInterface.put(key, json_data)
             except Exception as error:
                 logger.error(
-                    f"ApplicationData row edit failed for {record_name}: {error}"
+                    f"ApplicationData row edit failed for {key.name}: {error}"
                 )
 
     @classmethod
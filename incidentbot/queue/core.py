@@ -0,0 +1,384 @@
+import datetime
+import threading
+
+from incidentbot.configuration.settings import settings
+from incidentbot.exceptions import WorkQueueFullError
+from incidentbot.logging import logger
+from incidentbot.models.database import (
+    db_session,
+    engine,
+    UnitOfWorkExecutor,
+    WorkItem,
+)
+from sqlalchemy import case, delete, func, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import select
+from typing import Any
+
+"""
+Work Queue
+
+Durable queue for work that shouldn't hold up the request that created it.
+Items are stored in the work_item table and claimed with
+SELECT ... FOR UPDATE SKIP LOCKED so any number of instances can share it
+"""
+
+
+class WorkQueueInterface:
+    """
+    An interface for managing work queue items
+    """
+
+    @classmethod
+    def enqueue(
+        self,
+        kind: str,
+        payload: dict[str, Any],
+        key: str | None = None,
+    ) -> bool:
+        """
+        Add an item to the queue - returns False if an unfinished item with the
+        same key already exists
+
+        Parameters:
+            kind (str): Determines the handler that runs the item
+            payload (dict[str, Any]): JSON serializable arguments for the
+                handler
+            key (str): Optional deduplication key
+        """
+
+        with db_session(engine) as session:
+            depth = session.exec(
+                select(func.count())
+                .select_from(WorkItem)
+                .where(WorkItem.status.in_(["queued", "running"]))
+            ).one()
+
+            if depth >= settings.work_queue.max_depth:
+                raise WorkQueueFullError(
+                    f"work queue is full ({depth} unfinished items)"
+                )
+
+            result = session.exec(
+                insert(WorkItem)
+                .values(
+                    attempts=0,
+                    key=key,
+                    kind=kind,
+                    max_attempts=settings.work_queue.max_attempts,
+                    payload=payload,
+                    status="queued",
+                )
+                .on_conflict_do_nothing(
+                    index_elements=["key"],
+                    index_where=text("status IN ('queued', 'running')"),
+                )
+            )
+            session.commit()
+
+            return result.rowcount == 1
+
+    @classmethod
+    def claim(self, limit: int) -> list[dict[str, Any]]:
+        """
+        Claim up to limit items that are due and mark them running
+
+        Parameters:
+            limit (int): Maximum number of items to claim
+        """
+
+        with db_session(engine) as session:
+            items = session.exec(
+                select(WorkItem)
+                .where(
+                    WorkItem.status == "queued",
+                    WorkItem.run_after <= func.now(),
+                )
+                .order_by(WorkItem.run_after, WorkItem.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            ).all()
+
+            claimed = [
+                item.model_dump() | {"attempts": item.attempts + 1}
+                for item in items
+            ]
+
+            if claimed:
+                session.exec(
+                    update(WorkItem)
+                    .where(WorkItem.id.in_([item["id"] for item in claimed]))
+                    .values(
+                        attempts=WorkItem.attempts + 1,
+                        locked_at=func.now(),
+                        status="running",
+                    )
+                )
+            session.commit()
+
+            return claimed
+
+    @classmethod
+    def complete(self, id: int):
+        """
+        Remove an item that was processed successfully
+
+        Parameters:
+            id (int): ID of the item
+        """
+
+        with db_session(engine) as session:
+            session.exec(delete(WorkItem).where(WorkItem.id == id))
+            session.commit()
+
+    @classmethod
+    def fail(self, item: dict[str, Any], error: str):
+        """
+        Schedule a retry for an item with exponential backoff or mark it
+        failed once it has used up its attempts
+
+        Parameters:
+            item (dict[str, Any]): The claimed item
+            error (str): The error raised by the handler
+        """
+
+        exhausted = item["attempts"] >= item["max_attempts"]
+        delay = min(600, 10 * 2 ** (item["attempts"] - 1))
+
+        with db_session(engine) as session:
+            session.exec(
+                update(WorkItem)
+                .where(WorkItem.id == item["id"])
+                .values(
+                    last_error=error,
+                    locked_at=None,
+                    run_after=func.now() + datetime.timedelta(seconds=delay),
+                    status="failed" if exhausted else "queued",
+                )
+            )
+            session.commit()
+
+        if exhausted:
+            logger.error(
+                f"work item {item['id']} ({item['kind']}) failed after {item['attempts']} attempts: {error}"
+            )
+        else:
+            logger.warning(
+                f"work item {item['id']} ({item['kind']}) failed, retrying in {delay}s: {error}"
+            )
+
+    @classmethod
+    def requeue_stale(self, timeout_seconds: int) -> int:
+        """
+        Return items to the queue whose worker stopped without finishing them,
+        items that have used up their attempts are marked failed instead
+
+        Returns the number of items returned to the queue
+
+        Parameters:
+            timeout_seconds (int): Seconds an item may stay running
+        """
+
+        exhausted = WorkItem.attempts >= WorkItem.max_attempts
+        error = f"worker stopped without finishing within {timeout_seconds}s"
+
+        with db_session(engine) as session:
+            items = session.exec(
+                update(WorkItem)
+                .where(
+                    WorkItem.status == "running",
+                    WorkItem.locked_at
+                    < func.now() - datetime.timedelta(seconds=timeout_seconds),
+                )
+                .values(
+                    last_error=error,
+                    locked_at=None,
+                    status=case((exhausted, "failed"), else_="queued"),
+                )
+                .returning(
+                    WorkItem.attempts,
+                    WorkItem.id,
+                    WorkItem.kind,
+                    WorkItem.status,
+                )
+            ).all()
+            session.commit()
+
+        requeued = 0
+        for attempts, id, kind, status in items:
+            if status == "failed":
+                logger.error(
+                    f"work item {id} ({kind}) failed after {attempts} attempts: {error}"
+                )
+            else:
+                requeued += 1
+
+        if requeued:
+            logger.warning(
+                f"returned {requeued} stale work items to the queue"
+            )
+
+        return requeued
+
+    @classmethod
+    def stats(self) -> dict[str, Any]:
+        """
+        Return the number of items per status and the age of the oldest
+        queued item in seconds
+        """
+
+        with db_session(engine) as session:
+            counts = dict(
+                session.exec(
+                    select(WorkItem.status, func.count()).group_by(
+                        WorkItem.status
+                    )
+                ).all()
+            )
+            oldest = session.exec(
+                select(
+                    func.extract(
+                        "epoch", func.now() - func.min(WorkItem.created_at)
+                    )
+                ).where(WorkItem.status == "queued")
+            ).one()
+
+        return {
+            "failed": counts.get("failed", 0),
+            "oldest_queued_seconds": float(oldest) if oldest else 0.0,
+            "queued": counts.get("queued", 0),
+            "running": counts.get("running", 0),
+        }
+
+
+def run_work_item(kind: str, payload: dict[str, Any]):
+    """
+    Run the handler for a work item
+
+    Parameters:
+        kind (str): Kind of the item
+        payload (dict[str, Any]): Arguments for the handler
+    """
+
+    match kind:
+        case "incident_optional_features":
+            from incidentbot.incident.core import Incident
+
+            Incident.run_optional_features(id=payload["id"])
+        case _:
+            raise ValueError(f"no handler for work item kind {kind}")
+
+
+class WorkerPool:
+    """
+    Polls the work queue and runs claimed items on a thread pool
+    """
+
+    def __init__(self):
+        self.concurrency = 0
+        self.failed = 0
+        self.succeeded = 0
+        self._active = 0
+        self._executor: UnitOfWorkExecutor | None = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+
+    def notify(self):
+        """
+        Wake the poller, used after enqueueing from this process
+        """
+
+        self._wake.set()
+
+    def start(self):
+        self.concurrency = max(1, settings.work_queue.concurrency)
+
+        logger.info(f"Starting work queue with {self.concurrency} workers...")
+
+        self._executor = UnitOfWorkExecutor(
+            max_workers=self.concurrency,
+            thread_name_prefix="work-queue",
+        )
+        threading.Thread(
+            target=self._poll,
+            daemon=True,
+            name="work-queue-poller",
+        ).start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._executor:
+            self._executor.shutdown(wait=True)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Return queue depth from the database and counters for this process
+        """
+
+        with self._lock:
+            local = {
+                "active": self._active,
+                "concurrency": self.concurrency,
+                "failed_attempts": self.failed,
+                "succeeded": self.succeeded,
+            }
+
+        return WorkQueueInterface.stats() | local
+
+    def _poll(self):
+        last_sweep = 0.0
+
+        while not self._stop.is_set():
+            claimed = []
+
+            try:
+                now = datetime.datetime.now().timestamp()
+                if now - last_sweep > 60:
+                    WorkQueueInterface.requeue_stale(
+                        timeout_seconds=settings.work_queue.visibility_timeout_seconds
+                    )
+                    last_sweep = now
+
+                with self._lock:
+                    free = self.concurrency - self._active
+
+                if free > 0:
+                    claimed = WorkQueueInterface.claim(limit=free)
+
+                for item in claimed:
+                    with self._lock:
+                        self._active += 1
+                    self._executor.submit(self._run, item)
+            except Exception as error:
+                logger.error(f"Error polling work queue: {error}")
+
+            if not claimed:
+                self._wake.wait(settings.work_queue.poll_interval_seconds)
+                self._wake.clear()
+
+    def _run(self, item: dict[str, Any]):
+        try:
+            run_work_item(kind=item["kind"], payload=item["payload"])
+            WorkQueueInterface.complete(id=item["id"])
+
+            with self._lock:
+                self.succeeded += 1
+        except Exception as error:
+            with self._lock:
+                self.failed += 1
+
+            try:
+                WorkQueueInterface.fail(item=item, error=str(error))
+            except Exception as fail_error:
+                logger.error(
+                    f"Error recording failure of work item {item['id']}: {fail_error}"
+                )
+        finally:
+            with self._lock:
+                self._active -= 1
+            self._wake.set()
+
+
+process = WorkerPool()
@@ -1,9 +1,14 @@
 import datetime
 
-from incidentbot.configuration.settings import settings
+from incidentbot.configuration.settings import (
+    ScrapeForAgingIncidentsJob,
+    settings,
+)
+from apscheduler.executors.pool import BasePoolExecutor
 from apscheduler.job import Job
 from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from incidentbot.logging import logger
+from incidentbot.models.database import UnitOfWorkExecutor
 from incidentbot.models.incident import IncidentDatabaseInterface
 from apscheduler.schedulers.background import BackgroundScheduler
 from incidentbot.slack.client import (
@@ -19,9 +24,22 @@ configured_timezone = settings.options.timezone
 jobstores = {"default": SQLAlchemyJobStore(url=settings.DATABASE_URI)}
 
 
+class UnitOfWorkJobExecutor(BasePoolExecutor):
+    """
+    Runs each job in its own database unit of work
+    """
+
+    def __init__(self, max_workers: int = 10):
+        super().__init__(UnitOfWorkExecutor(max_workers=max_workers))
+
+
+executors = {"default": UnitOfWorkJobExecutor()}
+
+
 class TaskScheduler:
     def __init__(self):
         self.scheduler = BackgroundScheduler(
+            executors=executors,
             jobstores=jobstores,
             timezone=ZoneInfo(configured_timezone),
         )
@@ -66,62 +84,49 @@ Job Definitions
 """
 
 
-def scrape_for_aging_incidents():
+def build_aging_incident_messages(
+    incidents: list,
+    max_age: int,
+    now: datetime.datetime,
+    max_blocks: int = 50,
+) -> list[list[dict]]:
     """
-    Checks for incidents older than x days old and sends a reminder message to the
-    incidents channel to check on them
+    Build the blocks for the aging incident reminder, split into as many
+    messages as needed to stay within Slack's limit of blocks per message
+
+    Parameters:
+        incidents (list[IncidentRecord]): Incidents to list
+        max_age (int): Age in days used to select the incidents
+        now (datetime.datetime): Used to calculate how long each incident has
+            been open
+        max_blocks (int): Maximum number of blocks in a single message
     """
 
-    logger.info("[running task scrape_for_aging_incidents]")
-
-    # Max age, in days, of a channel before it's considered stale
-    max_age = 7
-
-    # Base block to build message on
-    base_block = [
+    header = [
         {
             "type": "section",
             "text": {
                 "type": "mrkdwn",
                 "text": ":wave: Hi there! The following incidents have been "
-                + f"open for {max_age} days. Lets double check them and make "
-                "sure their statuses are up to date. :hourglass_flowing_sand:",
+                + f"open for more than {max_age} days. Lets double check them "
+                + "and make sure their statuses are up to date. "
+                + ":hourglass_flowing_sand:",
             },
         },
         {"type": "divider"},
     ]
 
-    # Find open incidents and append them to a list to add to the message if they're older
-    # than the max age
-    open_incidents = IncidentDatabaseInterface.list_all()
+    messages = [header]
+    for inc in incidents:
+        time_open = now - inc.created_at
+        time_open -= datetime.timedelta(microseconds=time_open.microseconds)
 
-    # Exclude statuses if provided
-    if (
-        settings.jobs
-        and settings.jobs.scrape_for_aging_incidents.ignore_statuses
-    ):
-        open_incidents = [
-            i
-            for i in open_incidents
-            if i.status
-            not in settings.jobs.scrape_for_aging_incidents.ignore_statuses
-        ]
-
-    formatted_incidents = []
-    for inc in open_incidents:
-        created_at = datetime.datetime.strptime(
-            inc.created_at, gen.timestamp_fmt
-        )
-        now = datetime.datetime.now()
-        time_open = now - created_at
-        old = datetime.timedelta(days=max_age) < time_open
-        if old:
-            logger.info(
-                f"{inc.channel_id} is older than {max_age} days and will be "
-                + "added to the weekly reminder"
-            )
+        # An incident and its divider are never split across messages
+        if len(messages[-1]) + 2 > max_blocks:
+            messages.append([])
 
-            formatted_incidents.append(
+        messages[-1].extend(
+            [
                 {
                     "type": "section",
                     "fields": [
@@ -135,7 +140,7 @@ def scrape_for_aging_incidents():
                         },
                         {
                             "type": "mrkdwn",
-                            "text": f"*Creation Time:* {inc.created_at}",
+                            "text": f"*Creation Time:* {inc.created_at.strftime(gen.timestamp_fmt)}",
                         },
                         {
                             "type": "mrkdwn",
@@ -146,32 +151,217 @@ def scrape_for_aging_incidents():
                             "text": f"*Time Open:* {time_open}",
                         },
                     ],
-                }
-            )
-            formatted_incidents.append({"type": "divider"})
-    if len(formatted_incidents) > 0:
-        for inc in formatted_incidents:
-            base_block.append(inc)
+                },
+                {"type": "divider"},
+            ]
+        )
+
+    return messages
+
+
+def scrape_for_aging_incidents():
+    """
+    Checks for incidents older than x days old and sends a reminder message to the
+    incidents channel to check on them
+    """
+
+    logger.info("[running task scrape_for_aging_incidents]")
+
+    job_settings = (
+        settings.jobs.scrape_for_aging_incidents
+        if settings.jobs
+        else ScrapeForAgingIncidentsJob()
+    )
+
+    # Max age, in days, of a channel before it's considered stale
+    max_age = job_settings.max_age_days
+
+    # Age and status filters are applied by the database
+    incidents = (
+        IncidentDatabaseInterface.list_aging(
+            max_age_days=max_age,
+            ignore_statuses=job_settings.ignore_statuses,
+        )
+        or []
+    )
+
+    if not incidents:
+        logger.info(
+            f"Checked for incidents older than {max_age} days and did not find"
+            + " any. No alert will be sent."
+        )
+
+        return
+
+    logger.info(
+        f"{len(incidents)} incidents are older than {max_age} days and will "
+        + "be added to the reminder"
+    )
+
+    for blocks in build_aging_incident_messages(
+        incidents=incidents,
+        max_age=max_age,
+        now=datetime.datetime.now(),
+    ):
         try:
             slack_web_client.chat_postMessage(
-                channel=get_digest_channel_id(), blocks=base_block
+                channel=get_digest_channel_id(), blocks=blocks
             )
         except Exception as error:
             logger.error(error)
-    else:
-        logger.info(
-            f"Checked for incidents older than {max_age} days and did not find"
-            + " any. No alert will be sent."
-        )
 
 
-if settings.jobs and not settings.jobs.scrape_for_aging_incidents.enabled:
+if settings.jobs and settings.jobs.scrape_for_aging_incidents.enabled:
     process.scheduler.add_job(
         id="scrape_for_aging_incidents",
         func=scrape_for_aging_incidents,
         trigger="interval",
         name="Look for stale incidents and inform the digest channel",
-        days=2,
+        hours=settings.jobs.scrape_for_aging_incidents.interval_hours,
+        replace_existing=True,
+    )
+
+
+def process_incident_reminders():
+    """
+    Sends comms reminders and unassigned role notices for every incident
+    where one is due, in batches
+    """
+
+    from incidentbot.incident.util import comms_reminder, role_watcher
+
+    batch_size = 100
+
+    for kind, func in (
+        ("comms_reminder", comms_reminder),
+        ("role_watcher", role_watcher),
+    ):
+        while True:
+            channel_ids = IncidentDatabaseInterface.claim_due_reminders(
+                kind=kind, limit=batch_size
+            )
+
+            for channel_id in channel_ids:
+                try:
+                    func(channel_id)
+                except Exception as error:
+                    logger.error(
+                        f"Error running {kind} for {channel_id}: {error}"
+                    )
+
+            if len(channel_ids) < batch_size:
+                break
+
+
+process.scheduler.add_job(
+    id="process_incident_reminders",
+    func=process_incident_reminders,
+    trigger="interval",
+    name="Send due incident comms reminders and role checks",
+    minutes=1,
+    replace_existing=True,
+)
+
+
+def resume_incident_creations():
+    """
+    Resumes incident creations that were interrupted, e.g. by a restart,
+    from their last completed step
+    """
+
+    from incidentbot.incident.core import Incident
+
+    for request in IncidentDatabaseInterface.list_unfinished_creations(
+        max_attempts=settings.options.incident_creation_max_attempts,
+        stale_minutes=settings.options.incident_creation_recovery_minutes,
+    ):
+        # Another instance may have picked it up already
+        if not IncidentDatabaseInterface.claim_creation(
+            parent=request.parent, attempts=request.attempts
+        ):
+            continue
+
+        logger.warning(
+            f"Resuming interrupted creation of incident {request.parent} "
+            + f"(attempt {request.attempts + 1})"
+        )
+
+        try:
+            Incident.resume(id=request.parent)
+        except Exception as error:
+            logger.error(
+                f"Error resuming creation of incident {request.parent}: {error}"
+            )
+
+
+# Runs at startup and then periodically
+process.scheduler.add_job(
+    id="resume_incident_creations",
+    func=resume_incident_creations,
+    trigger="interval",
+    name="Resume interrupted incident creations",
+    minutes=settings.options.incident_creation_recovery_minutes,
+    next_run_time=datetime.datetime.now(ZoneInfo(configured_timezone)),
+    replace_existing=True,
+)
+
+
+def migrate_event_images():
+    """
+    Moves event images stored inline in incidentevent to the blob store in
+    batches and deletes blobs no longer referenced by any event
+    """
+
+    from incidentbot.incident.event import EventLogHandler
+
+    for _ in range(settings.blob_store.migration_max_batches):
+        if (
+            EventLogHandler.migrate_images(
+                batch_size=settings.blob_store.migration_batch_size
+            )
+            < settings.blob_store.migration_batch_size
+        ):
+            break
+
+    EventLogHandler.delete_unreferenced_images()
+
+
+process.scheduler.add_job(
+    id="migrate_event_images",
+    func=migrate_event_images,
+    trigger="interval",
+    name="Move event images to the blob store",
+    minutes=15,
+    replace_existing=True,
+)
+
+
+def archive_incidents():
+    """
+    Moves old resolved incidents to the archive store
+    """
+
+    from incidentbot.archive.core import archive_old_incidents
+
+    logger.info("[running task archive_incidents]")
+
+    archived = archive_old_incidents()
+
+    if archived:
+        logger.info(f"Archived {archived} incidents")
+
+
+if (
+    settings.jobs
+    and settings.jobs.archive_incidents
+    and settings.jobs.archive_incidents.enabled
+):
+    process.scheduler.add_job(
+        id="archive_incidents",
+        func=archive_incidents,
+        trigger="interval",
+        name="Move old resolved incidents to the archive store",
+        hours=settings.jobs.archive_incidents.interval_hours,
         replace_existing=True,
     )
 
@@ -189,12 +379,14 @@ def update_slack_channel_list():
         )
 
 
+# Channel and user directories are kept current by Slack events, these jobs
+# only reconcile anything that may have been missed
 process.scheduler.add_job(
     id="update_slack_channel_list",
     func=update_slack_channel_list,
     trigger="interval",
-    name="Update local copy of Slack channels",
-    minutes=15,
+    name="Reconcile local copy of Slack channels",
+    minutes=settings.slack_directory_reconcile_minutes,
     replace_existing=True,
 )
 
@@ -216,8 +408,8 @@ process.scheduler.add_job(
     id="update_slack_user_list",
     func=update_slack_user_list,
     trigger="interval",
-    name="Update local copy of Slack users",
-    minutes=15,
+    name="Reconcile local copy of Slack users",
+    minutes=settings.slack_directory_reconcile_minutes,
     replace_existing=True,
 )
 
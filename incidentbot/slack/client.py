@@ -1,22 +1,26 @@
 import datetime
+import hashlib
 import json
-import time
 
-from functools import lru_cache
 from incidentbot.configuration.settings import settings
 from incidentbot.exceptions import IndexNotFoundError
 from incidentbot.logging import logger
-from incidentbot.models.database import engine, ApplicationData
+from incidentbot.models.application_data import (
+    ApplicationDataInterface,
+    slack_channels,
+)
+from incidentbot.models.database import db_session, engine, SlackUser
+from incidentbot.slack.gateway import SlackApiGateway
 from incidentbot.util import gen
 from slack_sdk import WebClient
-from slack_sdk.errors import SlackApiError
-from sqlalchemy import update
+from sqlalchemy import case, func, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlmodel import Session, select
 
-from typing import Any
+from typing import Any, Iterator
 
 # Initialize Slack clients
-slack_web_client = WebClient(token=settings.SLACK_BOT_TOKEN)
+slack_web_client = SlackApiGateway(WebClient(token=settings.SLACK_BOT_TOKEN))
 slack_web_client_auth_test = slack_web_client.auth_test()
 
 """
@@ -50,6 +54,9 @@ slack_workspace_id = (
 # Users to skip invites for
 skip_invite_for_users = ["api", "web"]
 
+# Fields returned for users stored in the local user directory
+slack_user_fields = {"email", "id", "name", "real_name"}
+
 
 """
 Conversations
@@ -66,46 +73,10 @@ def get_channel_history(channel_id: str) -> str:
 
     history_dict_list = []
 
-    try:
-        res = slack_web_client.conversations_history(
-            channel=channel_id, limit=200
-        )
-
-        while res:
-            history_dict_list += res.get("messages")
-
-            if res.get("has_more"):
-                res = slack_web_client.conversations_history(
-                    channel=channel_id,
-                    limit=200,
-                    cursor=res.get("response_metadata").get("next_cursor"),
-                )
-            else:
-                res = None
-    except SlackApiError as error:
-        if error.response.status_code == 429:
-            delay = int(error.response.headers["Retry-After"])
-            logger.warning(
-                f"Rate limited by Slack API. Retrying in {delay} seconds..."
-            )
-            time.sleep(delay)
-            res = slack_web_client.conversations_history(
-                channel=channel_id, limit=200
-            )
-
-            while res:
-                history_dict_list += res.get("messages")
-
-                if res.get("has_more"):
-                    res = slack_web_client.conversations_history(
-                        channel=channel_id,
-                        limit=200,
-                        cursor=res.get("response_metadata").get("next_cursor"),
-                    )
-                else:
-                    res = None
-        else:
-            raise error
+    for res in slack_web_client.paginate(
+        "conversations_history", channel=channel_id, limit=200
+    ):
+        history_dict_list += res.get("messages")
 
     history_dict_reversed = []
 
@@ -122,48 +93,10 @@ def get_channel_list() -> dict[str, str]:
 
     channels = []
 
-    try:
-        res = slack_web_client.conversations_list(
-            exclude_archived=True,
-            limit=1000,
-        )
-
-        while res:
-            channels += res.get("channels")
-
-            if res.get("response_metadata").get("next_cursor") != "":
-                res = slack_web_client.conversations_list(
-                    exclude_archived=True,
-                    limit=1000,
-                    cursor=res.get("response_metadata").get("next_cursor"),
-                )
-            else:
-                res = None
-    except SlackApiError as error:
-        if error.response.status_code == 429:
-            delay = int(error.response.headers["Retry-After"])
-            logger.warning(
-                f"Rate limited by Slack API. Retrying in {delay} seconds..."
-            )
-            time.sleep(delay)
-            res = slack_web_client.conversations_list(
-                exclude_archived=True,
-                limit=1000,
-            )
-
-            while res:
-                channels += res.get("channels")
-
-                if res.get("response_metadata").get("next_cursor") != "":
-                    res = slack_web_client.conversations_list(
-                        exclude_archived=True,
-                        limit=1000,
-                        cursor=res.get("response_metadata").get("next_cursor"),
-                    )
-                else:
-                    res = None
-        else:
-            raise error
+    for res in slack_web_client.paginate(
+        "conversations_list", exclude_archived=True, limit=1000
+    ):
+        channels += res.get("channels")
 
     logger.info(f"Found {len(channels)} Slack channels")
 
@@ -187,12 +120,6 @@ def get_channel_name(channel_id: str) -> str:
     return channels[index].get("name")
 
 
-@lru_cache(maxsize=1)
-def _get_slack_channel_list_cached(bucket: int):
-    # bucket changes every TTL seconds -> cache invalidates automatically
-    return get_slack_channel_list_db()
-
-
 def get_digest_channel_id() -> str:
     """
     Resolve the channel ID for the digest channel configured in settings.digest_channel
@@ -202,7 +129,7 @@ def get_digest_channel_id() -> str:
     if not value:
         raise ValueError("settings.digest_channel is empty")
 
-    channels = _get_slack_channel_list_cached(int(time.time() // 300))
+    channels = get_slack_channel_list_db()
 
     # ID first
     for ch in channels:
@@ -229,70 +156,37 @@ def get_formatted_channel_history(channel_id: str, channel_name: str) -> str:
         channel_name (str): The name of the Slack channel to retrieve history from
     """
 
-    try:
-        users = slack_web_client.users_list()["members"]
-        replaced_messages_string = replace_user_ids(
-            get_channel_history(channel_id), users
-        )
-
-        formatted_channel_history = str()
-        formatted_channel_history += (
-            f"Slack channel history for incident {channel_name}\n"
-        )
+    users = [
+        user
+        for res in slack_web_client.paginate("users_list", limit=200)
+        for user in res.get("members")
+    ]
+    replaced_messages_string = replace_user_ids(
+        get_channel_history(channel_id), users
+    )
 
-        for message in replaced_messages_string:
-            user = message["user"]
-            text = message["text"]
-            timestamp = datetime.datetime.fromtimestamp(
-                int(message["ts"].split(".")[0])
-            )
-            prefix = f"* {timestamp}"
-            if "has joined the channel" in text:
-                formatted_channel_history += (
-                    f"{prefix} {user} joined the channel\n"
-                )
-            elif "set the channel topic" in text:
-                formatted_channel_history += f"{prefix} {user} {text}\n"
-            elif "This content can't be displayed." in text:
-                pass
-            else:
-                formatted_channel_history += f"{prefix} {user}: {text}\n"
-    except SlackApiError as error:
-        if error.response.status_code == 429:
-            delay = int(error.response.headers["Retry-After"])
-            logger.warning(
-                f"Rate limited by Slack API. Retrying in {delay} seconds..."
-            )
-            time.sleep(delay)
-            users = slack_web_client.users_list()["members"]
-            replaced_messages_string = replace_user_ids(
-                get_channel_history(channel_id), users
-            )
+    formatted_channel_history = str()
+    formatted_channel_history += (
+        f"Slack channel history for incident {channel_name}\n"
+    )
 
-            formatted_channel_history = str()
+    for message in replaced_messages_string:
+        user = message["user"]
+        text = message["text"]
+        timestamp = datetime.datetime.fromtimestamp(
+            int(message["ts"].split(".")[0])
+        )
+        prefix = f"* {timestamp}"
+        if "has joined the channel" in text:
             formatted_channel_history += (
-                f"Slack channel history for incident {channel_name}\n"
+                f"{prefix} {user} joined the channel\n"
             )
-
-            for message in replaced_messages_string:
-                user = message["user"]
-                text = message["text"]
-                timestamp = datetime.datetime.fromtimestamp(
-                    int(message["ts"].split(".")[0])
-                )
-                prefix = f"* {timestamp}"
-                if "has joined the channel" in text:
-                    formatted_channel_history += (
-                        f"{prefix} {user} joined the channel\n"
-                    )
-                elif "set the channel topic" in text:
-                    formatted_channel_history += f"{prefix} {user} {text}\n"
-                elif "This content can't be displayed." in text:
-                    pass
-                else:
-                    formatted_channel_history += f"{prefix} {user}: {text}\n"
+        elif "set the channel topic" in text:
+            formatted_channel_history += f"{prefix} {user} {text}\n"
+        elif "This content can't be displayed." in text:
+            pass
         else:
-            raise error
+            formatted_channel_history += f"{prefix} {user}: {text}\n"
 
     return formatted_channel_history
 
@@ -307,46 +201,10 @@ def get_conversation_members(channel_id: str) -> list[str]:
 
     members = []
 
-    try:
-        res = slack_web_client.conversations_members(
-            channel=channel_id, limit=200
-        )
-
-        while res:
-            members += res.get("members")
-
-            if res.get("response_metadata").get("next_cursor") != "":
-                res = slack_web_client.conversations_members(
-                    channel=channel_id,
-                    cursor=res.get("response_metadata").get("next_cursor"),
-                    limit=200,
-                )
-            else:
-                res = None
-    except SlackApiError as error:
-        if error.response.status_code == 429:
-            delay = int(error.response.headers["Retry-After"])
-            logger.warning(
-                f"Rate limited by Slack API. Retrying in {delay} seconds..."
-            )
-            time.sleep(delay)
-            res = slack_web_client.conversations_members(
-                channel=channel_id, limit=200
-            )
-
-            while res:
-                members += res.get("members")
-
-                if res.get("response_metadata").get("next_cursor") != "":
-                    res = slack_web_client.conversations_members(
-                        channel=channel_id,
-                        cursor=res.get("response_metadata").get("next_cursor"),
-                        limit=200,
-                    )
-                else:
-                    res = None
-        else:
-            raise error
+    for res in slack_web_client.paginate(
+        "conversations_members", channel=channel_id, limit=200
+    ):
+        members += res.get("members")
 
     return members
 
@@ -361,22 +219,9 @@ def get_message_content(conversation_id: str, ts: str):
         ts (str): Timestamp field
     """
 
-    try:
-        result = slack_web_client.conversations_history(
-            channel=conversation_id, inclusive=True, oldest=ts, limit=1
-        )
-    except SlackApiError as error:
-        if error.response.status_code == 429:
-            delay = int(error.response.headers["Retry-After"])
-            logger.warning(
-                f"Rate limited by Slack API. Retrying in {delay} seconds..."
-            )
-            time.sleep(delay)
-            result = slack_web_client.conversations_history(
-                channel=conversation_id, inclusive=True, oldest=ts, limit=1
-            )
-        else:
-            raise error
+    result = slack_web_client.conversations_history(
+        channel=conversation_id, inclusive=True, oldest=ts, limit=1
+    )
 
     return result["messages"][0]
 
@@ -386,19 +231,7 @@ def get_slack_channel_list_db() -> list[dict]:
     Get Slack channel list from database
     """
 
-    try:
-        with Session(engine) as session:
-            record = session.exec(
-                select(ApplicationData).filter(
-                    ApplicationData.name == "slack_channels"
-                )
-            ).first()
-
-            return record.json_data
-    except Exception as error:
-        logger.error(
-            f"Error retrieving list of Slack channels from db: {error}"
-        )
+    return ApplicationDataInterface.get(slack_channels)
 
 
 def invite_user_to_channel(channel_id: str, user: str):
@@ -414,24 +247,65 @@ def invite_user_to_channel(channel_id: str, user: str):
         user not in get_conversation_members(channel_id)
         and user not in skip_invite_for_users
     ):
-        try:
-            slack_web_client.conversations_invite(
-                channel=channel_id,
-                users=user,
-            )
-        except SlackApiError as error:
-            if error.response.status_code == 429:
-                delay = int(error.response.headers["Retry-After"])
-                logger.warning(
-                    f"Rate limited by Slack API. Retrying in {delay} seconds..."
-                )
-                time.sleep(delay)
-                slack_web_client.conversations_invite(
-                    channel=channel_id,
-                    users=user,
-                )
+        slack_web_client.conversations_invite(
+            channel=channel_id,
+            users=user,
+        )
+
+
+def _edit_slack_channel_list_db(channel_id: str, channel: dict | None):
+    """
+    Add, update or remove a single channel in the stored channel list
+
+    Parameters:
+        channel_id (str): Channel ID
+        channel (dict | None): Channel fields to store, None removes the channel
+    """
+
+    def change(stored: list[dict]) -> list[dict]:
+        channels = []
+        existing = {}
+        for item in stored:
+            if item.get("id") == channel_id:
+                existing = item
             else:
-                raise error
+                channels.append(item)
+
+        if channel is not None:
+            channels.append(existing | channel)
+
+        return channels
+
+    # The reconciliation job creates the list on its first run, until then
+    # there's nothing to update
+    try:
+        ApplicationDataInterface.update(slack_channels, change)
+    except Exception as error:
+        logger.error(
+            f"Slack channel list update failed for {channel_id}: {error}"
+        )
+
+
+def remove_slack_channel_db(channel_id: str):
+    """
+    Remove a single channel from the stored channel list
+
+    Parameters:
+        channel_id (str): Channel ID
+    """
+
+    _edit_slack_channel_list_db(channel_id=channel_id, channel=None)
+
+
+def store_slack_channel_db(channel: dict):
+    """
+    Add or update a single channel in the stored channel list
+
+    Parameters:
+        channel (dict): Channel object as provided by the Slack API
+    """
+
+    _edit_slack_channel_list_db(channel_id=channel.get("id"), channel=channel)
 
 
 def store_slack_channel_list_db():
@@ -443,36 +317,13 @@ def store_slack_channel_list_db():
     logger.info("[running task update_slack_channel_list]")
 
     try:
-        with Session(engine) as session:
-            record_name = "slack_channels"
-
-            # Create the row if it doesn't exist
-            if not session.exec(
-                select(ApplicationData).filter(
-                    ApplicationData.name == record_name
-                )
-            ).all():
-                try:
-                    row = ApplicationData(name=record_name)
-                    session.add(row)
-                    session.commit()
-                except Exception as error:
-                    logger.error(
-                        f"ApplicationData row create failed for {record_name}: {error}"
-                    )
-
-            session.exec(
-                update(ApplicationData)
-                .where(ApplicationData.name == record_name)
-                .values(
-                    json_data=get_channel_list(),
-                )
-            )
-            session.commit()
+        if ApplicationDataInterface.put(slack_channels, get_channel_list()):
             logger.info("Stored current Slack channels in database...")
+        else:
+            logger.info("Slack channels unchanged, nothing to store")
     except Exception as error:
         logger.error(
-            f"ApplicationData row edit failed for {record_name}: {error}"
+            f"ApplicationData row edit failed for {slack_channels.name}: {error}"
         )
 
 
@@ -488,37 +339,11 @@ def check_bot_user_in_digest_channel():
 
     digest_channel_id = get_digest_channel_id()
 
-    try:
-        if (
-            bot_user_id
-            not in slack_web_client.conversations_members(
-                channel=digest_channel_id
-            )["members"]
-        ):
-            slack_web_client.conversations_join(channel=digest_channel_id)
-            logger.info(
-                f"Added bot user to digest channel #{get_channel_name(channel_id=digest_channel_id)}"
-            )
-    except SlackApiError as error:
-        if error.response.status_code == 429:
-            delay = int(error.response.headers["Retry-After"])
-            logger.warning(
-                f"Rate limited by Slack API. Retrying in {delay} seconds..."
-            )
-            time.sleep(delay)
-
-            if (
-                bot_user_id
-                not in slack_web_client.conversations_members(
-                    channel=digest_channel_id
-                )["members"]
-            ):
-                slack_web_client.conversations_join(channel=digest_channel_id)
-                logger.info(
-                    f"Added bot user to digest channel #{get_channel_name(channel_id=digest_channel_id)}"
-                )
-        else:
-            raise error
+    if bot_user_id not in get_conversation_members(digest_channel_id):
+        slack_web_client.conversations_join(channel=digest_channel_id)
+        logger.info(
+            f"Added bot user to digest channel #{get_channel_name(channel_id=digest_channel_id)}"
+        )
     else:
         logger.info(
             f"Bot user is already present in digest channel #{get_channel_name(channel_id=digest_channel_id)}"
@@ -537,34 +362,15 @@ def check_user_in_group(user_id: str, group_name: str) -> bool:
 
     all_groups = all_workspace_groups.get("usergroups")
 
-    try:
-        target_group = [g for g in all_groups if g["handle"] == group_name]
-
-        if len(target_group) == 0:
-            logger.error(f"Couldn't find group {group_name}")
-            return False
-
-        target_group_members = slack_web_client.usergroups_users_list(
-            usergroup=target_group[0].get("id"),
-        ).get("users")
-    except SlackApiError as error:
-        if error.response.status_code == 429:
-            delay = int(error.response.headers["Retry-After"])
-            logger.warning(
-                f"Rate limited by Slack API. Retrying in {delay} seconds..."
-            )
-            time.sleep(delay)
-            target_group = [g for g in all_groups if g["handle"] == group_name]
+    target_group = [g for g in all_groups if g["handle"] == group_name]
 
-            if len(target_group) == 0:
-                logger.error(f"Couldn't find group {group_name}")
-                return False
+    if len(target_group) == 0:
+        logger.error(f"Couldn't find group {group_name}")
+        return False
 
-            target_group_members = slack_web_client.usergroups_users_list(
-                usergroup=target_group[0].get("id"),
-            ).get("users")
-        else:
-            raise error
+    target_group_members = slack_web_client.usergroups_users_list(
+        usergroup=target_group[0].get("id"),
+    ).get("users")
 
     if user_id in target_group_members:
         return True
@@ -577,26 +383,111 @@ def get_slack_user(user_id: str) -> dict | None:
     Get a single user object by id
 
     This is done against the local database so it won't work unless the job to store
-    slack user data has been run
+    slack user data has been run - if no user matches the id, the name, real name and
+    email columns of current users are checked in that order. Deactivated users are
+    still found by id so that their past messages keep a name
 
     Parameters:
         user_id (str): User ID
     """
 
-    with Session(engine) as session:
-        ulist = session.exec(
-            select(ApplicationData).filter(
-                ApplicationData.name == "slack_users"
-            )
-        ).first()
+    if not user_id:
+        return None
+
+    with db_session(engine) as session:
+        user = session.get(SlackUser, user_id)
+
+        if not user:
+            for column in (
+                SlackUser.name,
+                SlackUser.real_name,
+                SlackUser.email,
+            ):
+                user = session.exec(
+                    select(SlackUser).filter(
+                        column == user_id, SlackUser.deleted_at.is_(None)
+                    )
+                ).first()
+                if user:
+                    break
 
-    for obj in ulist.json_data:
-        if user_id in obj.values():
-            return obj
+    if user:
+        return user.model_dump(include=slack_user_fields)
 
     return None
 
 
+def get_slack_user_ids_by_real_name(real_name: str) -> list[str]:
+    """
+    Return the IDs of all users with a matching real name
+
+    Parameters:
+        real_name (str): The user's real name
+    """
+
+    try:
+        with db_session(engine) as session:
+            return list(
+                session.exec(
+                    select(SlackUser.id).filter(
+                        SlackUser.real_name == real_name,
+                        SlackUser.deleted_at.is_(None),
+                    )
+                ).all()
+            )
+    except Exception as error:
+        logger.error(
+            f"Error retrieving Slack user {real_name} from db: {error}"
+        )
+        return []
+
+
+def format_slack_user(user: dict[str, Any]) -> dict[str, Any]:
+    """
+    Return the minimal fields stored in the local user directory for a Slack
+    user object
+
+    Parameters:
+        user (dict[str, Any]): User object as returned by the Slack API
+    """
+
+    return {
+        "name": user.get("name"),
+        "real_name": user.get("profile", {}).get("real_name"),
+        "email": user.get("profile", {}).get("email"),
+        "id": user.get("id"),
+        "deleted": bool(user.get("deleted")),
+    }
+
+
+def slack_user_hash(user: dict[str, Any]) -> str:
+    """
+    Return a stable hash of the stored fields for a user so that unchanged
+    users can be skipped during sync
+
+    Parameters:
+        user (dict[str, Any]): User in the format returned by format_slack_user
+    """
+
+    return hashlib.sha256(
+        json.dumps(
+            {field: user.get(field) for field in sorted(slack_user_fields)}
+            | {"deleted": bool(user.get("deleted"))},
+            sort_keys=True,
+        ).encode("utf-8")
+    ).hexdigest()
+
+
+def iter_slack_users() -> Iterator[list[dict[str, Any]]]:
+    """
+    Retrieves Slack users from a workspace using pagination, yielding one page
+    of formatted users at a time to keep memory bounded
+    """
+
+    for res in slack_web_client.paginate("users_list", limit=200):
+        yield [format_slack_user(user) for user in res.get("members", [])]
+
+
 def get_slack_users() -> list[dict[str, Any]]:
     """
     Retrieves Slack users from a workspace using pagination.
@@ -606,39 +497,9 @@ def get_slack_users() -> list[dict[str, Any]]:
     """
 
     users_array = []
-    cursor = None
-
-    while True:
-        try:
-            res = (
-                slack_web_client.users_list(limit=200)
-                if cursor is None
-                else slack_web_client.users_list(limit=200, cursor=cursor)
-            )
-        except SlackApiError as error:
-            if error.response.status_code == 429:
-                delay = int(error.response.headers["Retry-After"])
-                logger.warning(
-                    f"Rate limited by Slack API. Retrying in {delay} seconds..."
-                )
-                time.sleep(delay)
-                continue
-            raise error
-
-        members = res.get("members", [])
-        users_array.extend(
-            {
-                "name": user.get("name"),
-                "real_name": user.get("profile", {}).get("real_name"),
-                "email": user.get("profile", {}).get("email"),
-                "id": user.get("id"),
-            }
-            for user in members
-        )
 
-        cursor = res.get("response_metadata", {}).get("next_cursor") or None
-        if cursor is None:
-            break
+    for page in iter_slack_users():
+        users_array.extend(page)
 
     jdata = sorted(
         users_array,
@@ -667,41 +528,167 @@ def replace_user_ids(json_string: str, user_list: dict[str, str]) -> str:
     return json.loads(json_string)
 
 
+def list_slack_users() -> list[dict]:
+    """
+    Return all current users from the local user directory ordered by name
+    """
+
+    with db_session(engine) as session:
+        return [
+            user.model_dump(include=slack_user_fields)
+            for user in session.exec(
+                select(SlackUser)
+                .filter(SlackUser.deleted_at.is_(None))
+                .order_by(SlackUser.name)
+            ).all()
+        ]
+
+
+def diff_slack_users(
+    known: dict[str, str | None],
+    users: list[dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """
+    Return the users that are new or have changed compared to the directory
+
+    Parameters:
+        known (dict[str, str | None]): Stored hash per user ID, None for
+            users tombstoned because they were missing from the listing
+        users (list[dict[str, Any]]): Formatted users from the Slack API
+    """
+
+    changed = []
+
+    for user in users:
+        if not user.get("id"):
+            continue
+
+        content_hash = slack_user_hash(user)
+        if known.get(user.get("id")) != content_hash:
+            changed.append(user | {"content_hash": content_hash})
+
+    return changed
+
+
+def upsert_slack_users(session: Session, users: list[dict[str, Any]]):
+    """
+    Insert or update users in the local user directory - deactivated users
+    are tombstoned, keeping the time of an existing tombstone, and the
+    tombstone of any other user is cleared
+
+    Parameters:
+        session (Session): The database session to write with
+        users (list[dict[str, Any]]): Formatted users including content_hash
+    """
+
+    if not users:
+        return
+
+    statement = insert(SlackUser).values(
+        [
+            {key: value for key, value in user.items() if key != "deleted"}
+            | {"deleted_at": func.now() if user.get("deleted") else None}
+            for user in users
+        ]
+    )
+    session.exec(
+        statement.on_conflict_do_update(
+            index_elements=[SlackUser.id],
+            set_={
+                "content_hash": statement.excluded.content_hash,
+                "deleted_at": case(
+                    (
+                        statement.excluded.deleted_at.is_not(None),
+                        func.coalesce(
+                            SlackUser.deleted_at,
+                            statement.excluded.deleted_at,
+                        ),
+                    ),
+                ),
+                "email": statement.excluded.email,
+                "name": statement.excluded.name,
+                "real_name": statement.excluded.real_name,
+                "updated_at": func.now(),
+            },
+        )
+    )
+
+
+def store_slack_user_db(user: dict[str, Any]):
+    """
+    Add or update a single user in the local user directory, as sent with
+    team_join and user_change events - a deactivated user is tombstoned and
+    a reactivated one restored
+
+    Parameters:
+        user (dict[str, Any]): User object as provided by the Slack API
+    """
+
+    try:
+        with db_session(engine) as session:
+            upsert_slack_users(
+                session, diff_slack_users({}, [format_slack_user(user)])
+            )
+            session.commit()
+    except Exception as error:
+        logger.error(
+            f"Slack user directory update failed for {user.get('id')}: {error}"
+        )
+
+
 def store_slack_user_list_db():
     """
-    Retrieves list of users from Slack organization and stores them using a clean format
-    to be retrieved locally to avoid querying the Slack API every time this data
-    is desired
+    Retrieves list of users from Slack organization and syncs them into the
+    slack_user table to be retrieved locally to avoid querying the Slack API
+    every time this data is desired
+
+    Only new or changed users are written and users that are deactivated or
+    no longer listed are tombstoned rather than deleted, so readers never see
+    an empty directory
     """
 
     logger.info("[running task update_slack_user_list]")
 
     try:
-        with Session(engine) as session:
-            # Delete if exists
-            if session.exec(
-                select(ApplicationData).filter(
-                    ApplicationData.name == "slack_users"
+        with db_session(engine) as session:
+            known = {}
+            tombstoned = set()
+            for user_id, content_hash, deleted_at in session.exec(
+                select(
+                    SlackUser.id,
+                    SlackUser.content_hash,
+                    SlackUser.deleted_at,
+                )
+            ).all():
+                known[user_id] = content_hash
+                if deleted_at is not None:
+                    tombstoned.add(user_id)
+            seen = set()
+            upserted = 0
+
+            for page in iter_slack_users():
+                seen.update(user.get("id") for user in page)
+                changed = diff_slack_users(known, page)
+                upsert_slack_users(session, changed)
+                upserted += len(changed)
+
+            removed = [
+                user_id
+                for user_id in known
+                if user_id not in seen and user_id not in tombstoned
+            ]
+            if removed:
+                # The hash is cleared so the user is restored if listed again
+                session.exec(
+                    update(SlackUser)
+                    .where(SlackUser.id.in_(removed))
+                    .values(content_hash=None, deleted_at=func.now())
                 )
-            ).first():
-                existing = session.exec(
-                    select(ApplicationData).filter(
-                        ApplicationData.name == "slack_users"
-                    )
-                ).first()
-                session.delete(existing)
-                session.commit()
-
-            # Store
-            row = ApplicationData(
-                name="slack_users",
-                json_data=get_slack_users(),
-            )
 
-            session.add(row)
             session.commit()
-            logger.info("Stored current Slack users in database...")
+            logger.info(
+                f"Synced {len(seen)} Slack users: {upserted} new or changed, "
+                + f"{len(removed)} removed"
+            )
     except Exception as error:
-        logger.error(
-            f"ApplicationData row create failed for slack_users: {error}"
-        )
+        logger.error(f"Slack user directory update failed: {error}")
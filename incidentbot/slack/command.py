@@ -19,7 +19,6 @@ from incidentbot.models.slack import (
     SlackViewSubmissionResponse,
     User,
 )
-from incidentbot.scheduler.core import process as TaskScheduler
 from incidentbot.slack.client import slack_web_client
 from incidentbot.slack.handler import app
 from incidentbot.slack.messages import BlockBuilder
@@ -89,7 +88,33 @@ def handle_root_command(ack, body):
                 slack_web_client.chat_postEphemeral(
                     channel=command.channel_id,
                     user=command.user_id,
-                    text="To start an incident, simply type `/incidentbot`. To manage an existing incident, type `/incidentbot this` in the incident channel.",
+                    text="To start an incident, simply type `/incidentbot`. To manage an existing incident, type `/incidentbot this` in the incident channel. To find past incidents, type `/incidentbot search <terms>`.",
+                )
+            except SlackApiError as error:
+                logger.error(
+                    f"error sending message back to user via slash command invocation: {error}"
+                )
+        case query if query.split(" ", 1)[0] == "search":
+            terms = query.partition(" ")[2].strip()
+            if not terms:
+                text, blocks = "Usage: `search <terms>`", None
+            else:
+                results = IncidentDatabaseInterface.search(
+                    terms=terms,
+                    limit=settings.options.search_results_limit,
+                )
+                text, blocks = (
+                    f"Incidents matching {terms}.",
+                    BlockBuilder.search_results(
+                        terms=terms, results=results or []
+                    ),
+                )
+            try:
+                slack_web_client.chat_postEphemeral(
+                    channel=command.channel_id,
+                    user=command.user_id,
+                    text=text,
+                    blocks=blocks,
                 )
             except SlackApiError as error:
                 logger.error(
@@ -502,9 +527,26 @@ def show_tasks(ack, body):
     user = User(**body.get("user"))
 
     jobs = []
-    for job in TaskScheduler.list_jobs():
-        if record.slug in job.id:
-            jobs.append(job)
+    if record.next_comms_reminder_at:
+        jobs.append(
+            {
+                "id": f"{record.slug}_comms_reminder",
+                "name": "Comms reminder every {} minutes, next at {:%Y-%m-%d %H:%M}".format(
+                    record.comms_reminder_minutes
+                    or settings.initial_comms_reminder_minutes,
+                    record.next_comms_reminder_at,
+                ),
+            }
+        )
+    if record.next_role_check_at:
+        jobs.append(
+            {
+                "id": f"{record.slug}_role_watcher",
+                "name": "Unassigned role check, next at {:%Y-%m-%d %H:%M}".format(
+                    record.next_role_check_at
+                ),
+            }
+        )
 
     if jobs:
         try:
@@ -0,0 +1,309 @@
+import random
+import threading
+import time
+
+from incidentbot.logging import logger
+from pydantic import BaseModel
+from slack_sdk import WebClient
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web import SlackResponse
+from typing import Any, Iterator
+
+"""
+Rate limits
+
+Requests per minute for each of Slack's rate limit tiers and the tier of each
+method used by the application - methods that aren't listed default to tier 3
+
+https://api.slack.com/apis/rate-limits
+"""
+
+tier_rates = {
+    1: 1,
+    2: 20,
+    3: 50,
+    4: 100,
+    # chat.postMessage and friends allow roughly one message per second
+    "special": 60,
+}
+
+# Limited for each channel rather than the whole workspace, with short bursts
+# allowed - a bucket is kept per channel
+per_channel_burst = 5
+per_channel_methods = {"chat.postMessage"}
+
+method_tiers = {
+    "auth.test": "special",
+    "bookmarks.add": 2,
+    "chat.delete": 3,
+    "chat.postEphemeral": "special",
+    "chat.postMessage": "special",
+    "chat.update": 3,
+    "conversations.archive": 2,
+    "conversations.create": 2,
+    "conversations.history": 3,
+    "conversations.info": 3,
+    "conversations.invite": 3,
+    "conversations.join": 3,
+    "conversations.list": 2,
+    "conversations.members": 4,
+    "conversations.rename": 2,
+    "conversations.setTopic": 2,
+    "files.revokePublicURL": 3,
+    "files.sharedPublicURL": 3,
+    "pins.add": 2,
+    "reactions.add": 3,
+    "usergroups.list": 2,
+    "usergroups.users.list": 2,
+    "users.info": 4,
+    "users.list": 2,
+    "views.open": 4,
+    "views.publish": 4,
+    "views.update": 4,
+}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at a per minute rate
+
+    Parameters:
+        rate (int): Requests allowed per minute
+        capacity (int): Burst capacity, defaults to rate
+    """
+
+    def __init__(self, rate: int, capacity: int | None = None):
+        self.capacity = float(capacity or rate)
+        self.refill_per_second = rate / 60
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (now - self.updated) * self.refill_per_second,
+        )
+        self.updated = now
+
+    def acquire(self) -> float:
+        """
+        Take a token, blocking until one is available, and return the number
+        of seconds spent waiting
+        """
+
+        waited = 0.0
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+
+                if now >= self.paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+
+                delay = max(
+                    self.paused_until - now,
+                    (1 - self.tokens) / self.refill_per_second,
+                )
+
+            time.sleep(delay)
+            waited += delay
+
+    def idle(self) -> bool:
+        """
+        Whether the bucket is full and not paused, i.e. no different from a
+        new one
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+
+            return now >= self.paused_until and self.tokens >= self.capacity
+
+    def pause(self, seconds: float):
+        """
+        Hold all callers of this bucket for a number of seconds, used when Slack
+        reports that the method has been rate limited
+        """
+
+        with self._lock:
+            self.paused_until = max(
+                self.paused_until, time.monotonic() + seconds
+            )
+            self.tokens = 0
+
+
+class SlackMethodCounters(BaseModel):
+    """
+    Counters kept per Slack API method
+    """
+
+    calls: int = 0
+    errors: int = 0
+    rate_limited: int = 0
+    throttled_seconds: float = 0.0
+
+
+class SlackApiGateway:
+    """
+    Wraps a WebClient so that every API method is subject to client-side rate
+    limiting and retried when Slack responds with HTTP 429
+
+    Methods of the wrapped client can be called on the gateway directly, for
+    example gateway.chat_postMessage(...)
+
+    Parameters:
+        client (WebClient): The Slack client to wrap
+        max_backoff (float): Upper bound, in seconds, for a single retry delay
+        max_retries (int): How many times a rate limited call is retried
+    """
+
+    def __init__(
+        self,
+        client: WebClient,
+        max_backoff: float = 60,
+        max_retries: int = 5,
+    ):
+        self.client = client
+        self.max_backoff = max_backoff
+        self.max_retries = max_retries
+        self._buckets: dict[tuple[str, str | None], TokenBucket] = {}
+        self._counters: dict[str, SlackMethodCounters] = {}
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.client, name)
+
+        if name.startswith("_") or name == "api_call" or not callable(attr):
+            return attr
+
+        def method(*args, **kwargs):
+            return self.call(name, *args, **kwargs)
+
+        method.__name__ = name
+
+        return method
+
+    def _bucket(self, api_method: str, channel: str | None) -> TokenBucket:
+        key = (
+            (api_method, channel)
+            if api_method in per_channel_methods
+            else (api_method, None)
+        )
+
+        with self._lock:
+            if key not in self._buckets:
+                if key[1] is not None:
+                    # Drop buckets of channels that have gone quiet, a full
+                    # bucket is recreated as it was
+                    for stale in [
+                        k
+                        for k, bucket in self._buckets.items()
+                        if k[1] is not None and bucket.idle()
+                    ]:
+                        del self._buckets[stale]
+
+                self._buckets[key] = TokenBucket(
+                    rate=tier_rates[method_tiers.get(api_method, 3)],
+                    capacity=per_channel_burst if key[1] is not None else None,
+                )
+                self._counters.setdefault(api_method, SlackMethodCounters())
+
+            return self._buckets[key]
+
+    def _count(self, api_method: str, counter: str, amount: float = 1):
+        with self._lock:
+            counters = self._counters[api_method]
+            setattr(counters, counter, getattr(counters, counter) + amount)
+
+    def backoff(self, attempt: int, retry_after: str | None) -> float:
+        """
+        Return the delay before a retry: Slack's Retry-After header when
+        provided, otherwise exponential, bounded by max_backoff with jitter
+
+        Parameters:
+            attempt (int): Zero based retry attempt
+            retry_after (str | None): Value of the Retry-After header
+        """
+
+        base = float(retry_after) if retry_after else 2**attempt
+
+        return min(self.max_backoff, base) + random.uniform(0, 1)
+
+    def call(self, method: str, *args, **kwargs) -> SlackResponse:
+        """
+        Call a WebClient method by name, e.g. chat_postMessage
+
+        Parameters:
+            method (str): Name of the WebClient method
+        """
+
+        api_method = method.replace("_", ".")
+        bucket = self._bucket(api_method, kwargs.get("channel"))
+        attempt = 0
+
+        while True:
+            self._count(api_method, "throttled_seconds", bucket.acquire())
+            self._count(api_method, "calls")
+
+            try:
+                return getattr(self.client, method)(*args, **kwargs)
+            except SlackApiError as error:
+                if (
+                    error.response.status_code != 429
+                    or attempt >= self.max_retries
+                ):
+                    self._count(api_method, "errors")
+                    raise error
+
+                self._count(api_method, "rate_limited")
+                delay = self.backoff(
+                    attempt, error.response.headers.get("Retry-After")
+                )
+                bucket.pause(delay)
+                attempt += 1
+
+                logger.warning(
+                    f"Rate limited by Slack API on {api_method}. "
+                    + f"Retrying in {delay:.1f} seconds "
+                    + f"(attempt {attempt}/{self.max_retries})..."
+                )
+
+    def paginate(self, method: str, **kwargs) -> Iterator[SlackResponse]:
+        """
+        Yield each page of a cursor paginated method - a rate limited page is
+        retried from the same cursor rather than starting over
+
+        Parameters:
+            method (str): Name of the WebClient method
+        """
+
+        cursor = None
+
+        while True:
+            res = (
+                self.call(method, **kwargs)
+                if cursor is None
+                else self.call(method, cursor=cursor, **kwargs)
+            )
+
+            yield res
+
+            cursor = (res.get("response_metadata") or {}).get("next_cursor")
+            if not cursor:
+                break
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """
+        Return counters for each Slack API method called so far
+        """
+
+        with self._lock:
+            return {
+                api_method: counters.model_dump()
+                for api_method, counters in sorted(self._counters.items())
+            }
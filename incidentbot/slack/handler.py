@@ -14,7 +14,11 @@ from incidentbot.incident.actions import (
 )
 from incidentbot.incident.event import EventLogHandler
 from incidentbot.logging import logger
-from incidentbot.models.database import ApplicationData, engine
+from incidentbot.models.application_data import (
+    ApplicationDataInterface,
+    slack_channels,
+)
+from incidentbot.models.database import UnitOfWorkExecutor
 from incidentbot.models.incident import IncidentDatabaseInterface
 from incidentbot.models.maintenance_window import (
     MaintenanceWindowDatabaseInterface,
@@ -22,7 +26,10 @@ from incidentbot.models.maintenance_window import (
 from incidentbot.models.slack import SlackBlockActionsResponse
 from incidentbot.slack.client import (
     get_slack_user,
+    remove_slack_channel_db,
     slack_web_client,
+    store_slack_channel_db,
+    store_slack_user_db,
 )
 from incidentbot.slack.messages import (
     BlockBuilder,
@@ -31,10 +38,13 @@ from incidentbot.slack.util import handle_comms_reminder
 from incidentbot.util import gen
 from slack_bolt import App
 from slack_sdk.errors import SlackApiError
-from sqlmodel import Session, select
 
 ## The xoxb oauth token for the bot is called here to provide bot privileges.
-app = App(token=settings.SLACK_BOT_TOKEN)
+## Each listener runs in its own database unit of work.
+app = App(
+    listener_executor=UnitOfWorkExecutor(max_workers=10),
+    token=settings.SLACK_BOT_TOKEN,
+)
 
 
 @app.error
@@ -53,6 +63,41 @@ def handle_message_events(body, logger):
     pass
 
 
+"""
+Directory
+"""
+
+
+@app.event("channel_archive")
+def handle_channel_archive(event, logger):
+    logger.debug(event)
+    remove_slack_channel_db(channel_id=event.get("channel"))
+
+
+@app.event("channel_created")
+def handle_channel_created(event, logger):
+    logger.debug(event)
+    store_slack_channel_db(channel=event.get("channel"))
+
+
+@app.event("channel_rename")
+def handle_channel_rename(event, logger):
+    logger.debug(event)
+    store_slack_channel_db(channel=event.get("channel"))
+
+
+@app.event("team_join")
+def handle_team_join(event, logger):
+    logger.debug(event)
+    store_slack_user_db(user=event.get("user"))
+
+
+@app.event("user_change")
+def handle_user_change(event, logger):
+    logger.debug(event)
+    store_slack_user_db(user=event.get("user"))
+
+
 """
 Handle Mentions
 """
@@ -653,8 +698,9 @@ def reaction_added(event, say):
                                         mimetype=file["mimetype"],
                                         title=file["name"],
                                         source="pin",
-                                        user=get_slack_user(
-                                            message.get("user")
+                                        user=(
+                                            get_slack_user(message.get("user"))
+                                            or {}
                                         ).get("real_name", "NotAvailable"),
                                     )
 
@@ -696,9 +742,9 @@ def reaction_added(event, say):
                             incident_slug=incident.slug,
                             message_ts=message["ts"],
                             source="pin",
-                            user=get_slack_user(message.get("user")).get(
-                                "real_name", "NotAvailable"
-                            ),
+                            user=(
+                                get_slack_user(message.get("user")) or {}
+                            ).get("real_name", "NotAvailable"),
                         )
 
                         slack_web_client.reactions_add(
@@ -738,59 +784,41 @@ def parse_pinned_message_content(message: str) -> str:
     username_pattern = r"<@([A-Z0-9]+)>"
 
     if re.search(channel_pattern, message):
-        with Session(engine) as session:
-            match = re.search(channel_pattern, message)
-            channel_list = session.exec(
-                select(ApplicationData).filter(
-                    ApplicationData.name == "slack_channels"
-                )
-            ).one()
-            matched_channels = [
-                channel
-                for channel in channel_list.json_data
-                if channel.get("id") == match.group(1)
-            ]
-            if matched_channels:
-                matched_channel = matched_channels[0]
-                message = message.replace(
-                    match.group(0),
-                    f"#{matched_channel.get("name")}",
-                )
-            else:
-                # Keep original format if channel not found
-                pass
+        match = re.search(channel_pattern, message)
+        matched_channels = [
+            channel
+            for channel in ApplicationDataInterface.get(slack_channels)
+            if channel.get("id") == match.group(1)
+        ]
+        if matched_channels:
+            matched_channel = matched_channels[0]
+            message = message.replace(
+                match.group(0),
+                f"#{matched_channel.get("name")}",
+            )
+        else:
+            # Keep original format if channel not found
+            pass
 
     for pattern in url_patterns:
         if re.search(pattern, message):
-            with Session(engine) as session:
-                match = re.search(pattern, message)
-                message = message.replace(
-                    match.group(0),
-                    match.group(1),
-                )
+            match = re.search(pattern, message)
+            message = message.replace(
+                match.group(0),
+                match.group(1),
+            )
 
     if re.search(username_pattern, message):
-        with Session(engine) as session:
-            match = re.search(username_pattern, message)
-            user_list = session.exec(
-                select(ApplicationData).filter(
-                    ApplicationData.name == "slack_users"
-                )
-            ).one()
-            matched_users = [
-                user
-                for user in user_list.json_data
-                if user.get("id") == match.group(1)
-            ]
-            if matched_users:
-                matched_user = matched_users[0]
-                message = message.replace(
-                    match.group(0),
-                    f"@{matched_user.get("real_name")}",
-                )
-            else:
-                # Keep original format if user not found
-                pass
+        match = re.search(username_pattern, message)
+        matched_user = get_slack_user(match.group(1))
+        if matched_user:
+            message = message.replace(
+                match.group(0),
+                f"@{matched_user.get("real_name")}",
+            )
+        else:
+            # Keep original format if user not found
+            pass
 
     return message
 
@@ -0,0 +1,140 @@
+import hashlib
+import json
+import threading
+import time
+
+from incidentbot.configuration.settings import settings
+from incidentbot.logging import logger
+from incidentbot.models.database import on_commit
+from typing import Any, Callable
+
+"""
+App Home
+
+The home view is the same for every user, so it is rendered once per change
+to incidents or maintenance windows instead of once per app_home_opened event
+"""
+
+# Writes to these tables change what the home view shows
+watched_tables = {"incidentrecord", "maintenancewindowrecord"}
+
+
+class HomeViewCache:
+    """
+    Holds the most recently rendered home view along with a version counter
+    that is bumped whenever the data behind it changes
+
+    Other instances of the application can't bump this process's counter, so
+    a rendered view is also discarded once it is older than ttl_seconds
+
+    Parameters:
+        ttl_seconds (float): Maximum age of a rendered view
+    """
+
+    def __init__(self, ttl_seconds: float = 60):
+        self.ttl_seconds = ttl_seconds
+        self.version = 0
+        self._digest: str | None = None
+        self._lock = threading.Lock()
+        self._published: dict[str, str] = {}
+        self._render_lock = threading.Lock()
+        self._rendered_at = 0.0
+        self._view: dict[str, Any] | None = None
+        self._view_version = -1
+
+    def invalidate(self):
+        """
+        Mark the rendered view as out of date
+        """
+
+        with self._lock:
+            self.version += 1
+
+    def _cached(self) -> tuple[dict[str, Any], str] | None:
+        with self._lock:
+            if (
+                self._view is not None
+                and self._view_version == self.version
+                and time.monotonic() - self._rendered_at < self.ttl_seconds
+            ):
+                return self._view, self._digest
+
+    def get(
+        self, render: Callable[[], dict[str, Any]]
+    ) -> tuple[dict[str, Any], str]:
+        """
+        Return the current view and a digest of its content, calling render
+        only if the cached view is out of date - concurrent callers wait for
+        a single render rather than each querying the database
+
+        Parameters:
+            render (Callable): Builds the view
+        """
+
+        cached = self._cached()
+        if cached:
+            return cached
+
+        with self._render_lock:
+            cached = self._cached()
+            if cached:
+                return cached
+
+            # Read the version before rendering so a change that lands while
+            # rendering invalidates the result
+            with self._lock:
+                version = self.version
+
+            view = render()
+            digest = hashlib.sha256(
+                json.dumps(view, sort_keys=True).encode()
+            ).hexdigest()
+
+            with self._lock:
+                self._digest = digest
+                self._rendered_at = time.monotonic()
+                self._view = view
+                self._view_version = version
+
+            return view, digest
+
+    def should_publish(self, user_id: str, digest: str) -> bool:
+        """
+        Return whether a user was last sent a different view
+
+        Parameters:
+            user_id (str): The Slack user
+            digest (str): Digest of the view about to be published
+        """
+
+        with self._lock:
+            return self._published.get(user_id) != digest
+
+    def published(self, user_id: str, digest: str):
+        """
+        Record the view a user was sent
+
+        Parameters:
+            user_id (str): The Slack user
+            digest (str): Digest of the published view
+        """
+
+        with self._lock:
+            self._published[user_id] = digest
+
+
+home_view = HomeViewCache(ttl_seconds=settings.options.app_home_cache_seconds)
+
+"""
+Invalidation
+
+Any session that writes to a watched table bumps the version once it commits,
+covering both ORM flushes and bulk insert/update/delete statements
+"""
+
+
+@on_commit
+def invalidate_home_view(tables: set[str | None]):
+    if tables & watched_tables:
+        logger.debug("home view invalidated")
+        home_view.invalidate()
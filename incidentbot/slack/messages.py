@@ -1,11 +1,13 @@
-from apscheduler.job import Job
 from incidentbot.configuration.settings import settings
 from incidentbot.models.database import (
     IncidentParticipant,
     IncidentRecord,
     MaintenanceWindowRecord,
 )
-from incidentbot.models.incident import IncidentDatabaseInterface
+from incidentbot.models.incident import (
+    IncidentDatabaseInterface,
+    IncidentSearchResult,
+)
 from incidentbot.models.pager import read_pager_auto_page_targets
 from incidentbot.models.slack import User
 from typing import Any
@@ -753,6 +755,69 @@ class BlockBuilder:
 
         return blocks
 
+    @staticmethod
+    def search_results(
+        terms: str,
+        results: list[IncidentSearchResult],
+    ) -> list[dict[str, Any]]:
+        """
+        Return a message listing incidents matching a search
+
+        Parameters:
+            terms (str): The search terms
+            results (list[IncidentSearchResult]): Matches, best first
+        """
+
+        blocks = [
+            {
+                "type": "header",
+                "text": {
+                    "type": "plain_text",
+                    "text": ":mag: Search Results",
+                },
+            },
+            {"type": "divider"},
+        ]
+
+        for result in results:
+            incident = result.incident
+            blocks.append(
+                {
+                    "type": "section",
+                    "text": {
+                        "type": "mrkdwn",
+                        "text": "> {} <#{}> *|* ".format(
+                            settings.icons.get(settings.platform).get(
+                                "channel"
+                            ),
+                            incident.channel_id,
+                        )
+                        + f"*{incident.slug.upper()}* *|* "
+                        + f":fire_extinguisher: *{incident.status.title()}*"
+                        + f" *|* _Opened_ *{incident.created_at:%Y-%m-%d}*"
+                        + f"\n> {incident.description}"
+                        + (
+                            "\n> _Matched in the timeline_"
+                            if result.matched_timeline
+                            else ""
+                        ),
+                    },
+                }
+            )
+
+        if len(results) == 0:
+            blocks.append(
+                {
+                    "type": "section",
+                    "text": {
+                        "type": "mrkdwn",
+                        "text": f"No incidents match `{terms}`.",
+                    },
+                },
+            )
+
+        return blocks
+
     @staticmethod
     def jira_issue_message(
         key: str, summary: str, type: str, link: str
@@ -1673,13 +1738,14 @@ class BlockBuilder:
 
     @staticmethod
     def task_list(
-        tasks: list[Job],
+        tasks: list[dict[str, str]],
     ) -> list[dict[str, Any]]:
         """
         Return a message containing details on tasks associated with incidents
 
         Parameters:
-            incidents (list[Job]): Tasks to include in message
+            tasks (list[dict[str, str]]): Tasks to include in message, each
+                with an id and a name
         """
 
         blocks = [
@@ -1700,8 +1766,8 @@ class BlockBuilder:
                     "type": "mrkdwn",
                     "text": "> {} *|* {} *|* {} ".format(
                         settings.icons.get(settings.platform).get("task"),
-                        task.id,
-                        task.name,
+                        task.get("id"),
+                        task.get("name"),
                     ),
                 },
             }
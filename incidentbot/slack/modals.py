@@ -14,9 +14,13 @@ from incidentbot.maintenance_window.core import (
     MaintenanceWindow,
     MaintenanceWindowRequestParameters,
 )
+from incidentbot.models.application_data import (
+    ApplicationDataInterface,
+    pagerduty_oc_data,
+)
 from incidentbot.models.database import (
+    db_session,
     engine,
-    ApplicationData,
     JiraIssueRecord,
     GitlabIssueRecord,
 )
@@ -26,6 +30,7 @@ from incidentbot.models.maintenance_window import (
 )
 from incidentbot.slack.client import check_user_in_group, get_digest_channel_id
 from incidentbot.slack.handler import app
+from incidentbot.slack.home import home_view
 from incidentbot.slack.messages import BlockBuilder, IncidentUpdate
 from incidentbot.statuspage.handler import (
     StatuspageComponents,
@@ -34,7 +39,7 @@ from incidentbot.statuspage.handler import (
 )
 from incidentbot.slack.util import parse_modal_values
 from incidentbot.util import gen
-from sqlmodel import Session, select
+from typing import Any
 
 
 @app.event("app_home_opened")
@@ -43,6 +48,26 @@ def update_home_tab(client, event, logger):
     Provide information via the app's home screen
     """
 
+    view, digest = home_view.get(render=render_home_view)
+
+    if (
+        settings.options.app_home_skip_unchanged_publish
+        and not home_view.should_publish(user_id=event["user"], digest=digest)
+    ):
+        return
+
+    try:
+        client.views_publish(user_id=event["user"], view=view)
+        home_view.published(user_id=event["user"], digest=digest)
+    except Exception as e:
+        logger.error(f"Error publishing home tab: {e}")
+
+
+def render_home_view() -> dict[str, Any]:
+    """
+    Build the app's home view - the result is cached by home_view
+    """
+
     button_el = [
         {
             "type": "button",
@@ -142,16 +167,10 @@ def update_home_tab(client, event, logger):
         ]
     )
 
-    try:
-        client.views_publish(
-            user_id=event["user"],
-            view={
-                "type": "home",
-                "blocks": base_blocks,
-            },
-        )
-    except Exception as e:
-        logger.error(f"Error publishing home tab: {e}")
+    return {
+        "type": "home",
+        "blocks": base_blocks,
+    }
 
 
 @app.action("declare_incident_modal")
@@ -661,16 +680,7 @@ def show_modal(ack, body, client):  # noqa: F811
 
         platform = "PagerDuty"
 
-        with Session(engine) as session:
-            result = (
-                session.exec(
-                    select(ApplicationData).filter(
-                        ApplicationData.name == "pagerduty_oc_data"
-                    )
-                )
-            ).first()
-
-            oncalls = result.json_data
+        oncalls = ApplicationDataInterface.get(pagerduty_oc_data)
 
         priorities = ["low", "high"]
         image_url = pagerduty_logo_url
@@ -680,6 +690,8 @@ def show_modal(ack, body, client):  # noqa: F811
         oncalls = []
         priorities = []
 
+    open_incidents = IncidentDatabaseInterface.list_open() or []
+
     blocks = [
         {
             "type": "context",
@@ -758,32 +770,25 @@ def show_modal(ack, body, client):  # noqa: F811
                     "text": "Incident...",
                 },
                 "options": [
-                    (
-                        {
-                            "text": {
-                                "type": "plain_text",
-                                "text": "None",
-                                "emoji": True,
-                            },
-                            "value": "none",
-                        }
-                        if len(IncidentDatabaseInterface.list_open()) == 0
-                        else {
-                            "text": {
-                                "type": "plain_text",
-                                "text": inc.channel_name,
-                                "emoji": True,
-                            },
-                            "value": f"{inc.channel_name}/{inc.channel_id}",
-                        }
-                    )
-                    for inc in IncidentDatabaseInterface.list_open()
-                    if inc.status
-                    not in [
-                        status
-                        for status, config in settings.statuses.items()
-                        if config.final
-                    ]
+                    {
+                        "text": {
+                            "type": "plain_text",
+                            "text": inc.channel_name,
+                            "emoji": True,
+                        },
+                        "value": f"{inc.channel_name}/{inc.channel_id}",
+                    }
+                    for inc in open_incidents
+                ]
+                or [
+                    {
+                        "text": {
+                            "type": "plain_text",
+                            "text": "None",
+                            "emoji": True,
+                        },
+                        "value": "none",
+                    }
                 ],
             },
         },
@@ -1854,7 +1859,7 @@ def handle_submission(ack, body, client):  # noqa: F811
                 url=issue_link,
             )
 
-            with Session(engine) as session:
+            with db_session(engine) as session:
                 session.add(jira_issue_record)
                 session.commit()
 
@@ -2010,7 +2015,7 @@ def handle_submission(ack, body, client):  # noqa: F811
                 url=issue_link,
             )
 
-            with Session(engine) as session:
+            with db_session(engine) as session:
                 session.add(gitlab_incident_record)
                 session.commit()
 
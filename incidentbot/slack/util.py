@@ -1,6 +1,6 @@
 from incidentbot.logging import logger
 from incidentbot.models.database import IncidentRecord
-from incidentbot.scheduler.core import process as TaskScheduler
+from incidentbot.models.incident import IncidentDatabaseInterface
 from incidentbot.slack.client import (
     slack_web_client,
 )
@@ -24,16 +24,16 @@ def handle_comms_reminder(
     """
 
     try:
-        job = TaskScheduler.get_job(job_id=f"{record.slug}_comms_reminder")
+        IncidentDatabaseInterface.set_reminder(
+            kind="comms_reminder", id=record.id, minutes=interval
+        )
 
         if interval is None:
-            TaskScheduler.delete_job(job_to_delete=job.id)
             slack_web_client.chat_postMessage(
                 channel=channel_id,
                 text=":white_check_mark: Got it. I won't send any more reminders about communications for this incident.",
             )
         else:
-            TaskScheduler.reschedule_job(job_id=job.id, new_minutes=interval)
             slack_web_client.chat_postMessage(
                 channel=channel_id,
                 text=f":white_check_mark: Got it. I'll remind the channel about communications again in *{interval} minutes*.",
@@ -42,7 +42,7 @@ def handle_comms_reminder(
         slack_web_client.chat_delete(channel=channel_id, ts=ts)
     except Exception as error:
         logger.error(
-            f"error rescheduling job {record.slug}_comms_reminder: {error}"
+            f"error rescheduling comms reminder for {record.slug}: {error}"
         )
 
 
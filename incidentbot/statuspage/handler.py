@@ -3,10 +3,14 @@ import requests
 
 from incidentbot.configuration.settings import settings, statuspage_logo_url
 from incidentbot.logging import logger
-from incidentbot.models.database import engine, StatuspageIncidentRecord
+from incidentbot.models.database import (
+    db_session,
+    engine,
+    StatuspageIncidentRecord,
+)
 from incidentbot.models.incident import IncidentDatabaseInterface
 from incidentbot.slack.client import slack_web_client
-from sqlmodel import Session, select
+from sqlmodel import select
 from typing import Any
 
 api = "https://api.statuspage.io/v1"
@@ -89,7 +93,7 @@ class StatuspageIncident:
                 upstream_id=self.info.get("id"),
             )
 
-            with Session(engine) as session:
+            with db_session(engine) as session:
                 session.add(record)
                 session.commit()
 
@@ -121,7 +125,7 @@ class StatuspageIncidentUpdate:
             channel_id=channel_id
         )
 
-        with Session(engine) as session:
+        with db_session(engine) as session:
             record = session.exec(
                 select(StatuspageIncidentRecord).filter(
                     StatuspageIncidentRecord.parent == incident_data.id
@@ -197,7 +201,7 @@ class StatuspageIncidentUpdate:
             channel_id=channel_id
         )
 
-        with Session(engine) as session:
+        with db_session(engine) as session:
             record = session.exec(
                 select(StatuspageIncidentRecord).filter(
                     StatuspageIncidentRecord.parent == incident_data.id
@@ -1,16 +1,17 @@
 import sys
 
 from incidentbot.configuration.settings import settings, __version__
+from incidentbot.models.application_data import (
+    ApplicationDataInterface,
+    auto_page_teams,
+)
 from incidentbot.models.database import (
     create_default_admin_user,
     db_verify,
-    engine,
-    ApplicationData,
 )
 from incidentbot.scheduler.core import process as TaskScheduler
 
 from incidentbot.logging import logger
-from sqlmodel import Session, select
 from uvicorn import run
 
 
@@ -181,18 +182,9 @@ def startup_tasks():
         update_pagerduty_oc_data()
 
         try:
-            with Session(engine) as session:
-                if not session.exec(
-                    select(ApplicationData).filter(
-                        ApplicationData.name == "auto_page_teams"
-                    )
-                ).first():
-                    auto_page_teams = ApplicationData(
-                        name="auto_page_teams",
-                        json_data={"teams": []},
-                    )
-                    session.add(auto_page_teams)
-                    session.commit()
+            ApplicationDataInterface.create(
+                auto_page_teams, auto_page_teams.default()
+            )
         except Exception as error:
             logger.error(f"Error storing auto_page_teams: {error}")
 
@@ -259,6 +251,13 @@ if __name__ == "__main__":
 
             handler = SocketModeHandler(slack_app, settings.SLACK_APP_TOKEN)
 
+    # Work Queue
+    # --------------------
+
+    from incidentbot.queue.core import process as WorkQueue
+
+    WorkQueue.start()
+
     # API and handler Integration
     # --------------------
 
@@ -0,0 +1,100 @@
+"""
+API load benchmark
+
+Sends requests to one or more API paths from a number of concurrent clients
+and reports throughput and latency percentiles. Run it against a server
+before and after a change with the same arguments to compare, e.g.
+
+    python scripts/api_benchmark.py --token $TOKEN --concurrency 50 \\
+        --path /api/v1/incident --path /api/v1/incident/inc-1/participants
+
+A request for a slow path shouldn't hold up requests for other paths, so
+mixing a slow path with fast ones shows whether the event loop is blocked
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def client(
+    http: httpx.AsyncClient,
+    paths: list[str],
+    count: int,
+    latencies: dict[str, list[float]],
+    errors: list[str],
+):
+    for i in range(count):
+        path = paths[i % len(paths)]
+        started = time.perf_counter()
+
+        try:
+            response = await http.get(path)
+            if response.status_code >= 400:
+                errors.append(f"{path}: {response.status_code}")
+        except httpx.HTTPError as error:
+            errors.append(f"{path}: {error}")
+
+        latencies[path].append(time.perf_counter() - started)
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def main(args: argparse.Namespace):
+    latencies = {path: [] for path in args.path}
+    errors = []
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else None
+
+    async with httpx.AsyncClient(
+        base_url=args.url,
+        headers=headers,
+        limits=httpx.Limits(max_connections=args.concurrency),
+        timeout=args.timeout,
+    ) as http:
+        started = time.perf_counter()
+        await asyncio.gather(
+            *[
+                client(http, args.path, args.requests, latencies, errors)
+                for _ in range(args.concurrency)
+            ]
+        )
+        elapsed = time.perf_counter() - started
+
+    total = sum(len(values) for values in latencies.values())
+
+    print(f"{total} requests in {elapsed:.2f}s, {total / elapsed:.1f} req/s")
+    for path, values in latencies.items():
+        if values:
+            print(
+                f"{path}: n={len(values)}"
+                f" mean={statistics.mean(values) * 1000:.1f}ms"
+                f" p50={percentile(values, 0.5) * 1000:.1f}ms"
+                f" p95={percentile(values, 0.95) * 1000:.1f}ms"
+                f" p99={percentile(values, 0.99) * 1000:.1f}ms"
+            )
+    if errors:
+        print(f"{len(errors)} errors, first: {errors[0]}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", default=20, type=int)
+    parser.add_argument("--path", action="append", required=True)
+    parser.add_argument(
+        "--requests",
+        default=200,
+        help="Requests per client",
+        type=int,
+    )
+    parser.add_argument("--timeout", default=30.0, type=float)
+    parser.add_argument("--token", default=None)
+    parser.add_argument("--url", default="http://localhost:3000")
+
+    asyncio.run(main(parser.parse_args()))
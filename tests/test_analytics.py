@@ -0,0 +1,116 @@
+import datetime
+import unittest
+from unittest.mock import patch, MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+# Mock the slack client before importing modules that depend on it
+mock_client = MagicMock()
+mock_client.auth_test.return_value = {
+    "ok": True,
+    "url": "https://testworkspace.slack.com",
+    "user": "test user",
+    "user_id": "test user id",
+}
+
+with patch("slack_sdk.WebClient", return_value=mock_client):
+    from incidentbot.models.analytics import (
+        AnalyticsDatabaseInterface,
+        bucket_start,
+        incident_dimensions,
+    )
+    from incidentbot.models.database import IncidentMetrics
+
+
+opened = datetime.datetime(2026, 1, 7, 9, 0, 0)
+
+
+def metrics(**kwargs) -> IncidentMetrics:
+    return IncidentMetrics(
+        components="api, db,api",
+        created_at=opened,
+        incident_type="outage",
+        parent=1,
+        severity="sev2",
+        status="investigating",
+        status_entered_at=opened,
+        **kwargs,
+    )
+
+
+def executed(session: MagicMock) -> list[str]:
+    return [
+        str(call.args[0].compile(dialect=postgresql.dialect()))
+        for call in session.exec.call_args_list
+    ]
+
+
+class TestRollupBuckets(unittest.TestCase):
+    def test_bucket_start(self):
+        self.assertEqual(
+            bucket_start(opened, "day"), datetime.date(2026, 1, 7)
+        )
+        self.assertEqual(
+            bucket_start(opened, "week"), datetime.date(2026, 1, 5)
+        )
+
+        with self.assertRaises(ValueError):
+            bucket_start(opened, "month")
+
+    def test_dimensions_dedupe_components(self):
+        self.assertEqual(
+            incident_dimensions(metrics()),
+            [
+                ("all", "all"),
+                ("severity", "sev2"),
+                ("type", "outage"),
+                ("component", "api"),
+                ("component", "db"),
+            ],
+        )
+
+
+class TestStatusChanges(unittest.TestCase):
+    def test_resolve_then_reopen(self):
+        session = MagicMock()
+        record = metrics()
+        resolved = opened + datetime.timedelta(hours=2)
+
+        AnalyticsDatabaseInterface._change_status(
+            session, record, "resolved", resolved
+        )
+
+        self.assertEqual(record.resolved_at, resolved)
+        self.assertEqual(record.time_to_resolve, 7200)
+        self.assertEqual(record.status_entered_at, resolved)
+        statements = executed(session)
+        self.assertIn("INSERT INTO incident_status_time", statements[0])
+        self.assertIn("INSERT INTO incident_rollup", statements[1])
+        self.assertIn(
+            "resolved = (incident_rollup.resolved + excluded.resolved)",
+            statements[1],
+        )
+
+        session.reset_mock()
+        AnalyticsDatabaseInterface._change_status(
+            session, record, "investigating", resolved
+        )
+
+        self.assertIsNone(record.resolved_at)
+        self.assertIsNone(record.time_to_resolve)
+        self.assertEqual(len(executed(session)), 2)
+
+    def test_severity_change_moves_counts(self):
+        session = MagicMock()
+        record = metrics(participants=3)
+
+        AnalyticsDatabaseInterface._change_severity(session, record, "sev1")
+
+        self.assertEqual(record.severity, "sev1")
+        self.assertEqual(
+            [
+                call.args[0].compile().params["opened_m0"]
+                for call in session.exec.call_args_list
+            ],
+            [-1, 1],
+        )
@@ -0,0 +1,145 @@
+import unittest
+from datetime import timedelta
+from unittest.mock import patch, MagicMock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, literal, select, text
+from sqlmodel import Session
+
+# Mock the slack client before importing modules that depend on it
+mock_client = MagicMock()
+mock_client.auth_test.return_value = {
+    "ok": True,
+    "url": "https://testworkspace.slack.com",
+    "user": "test user",
+    "user_id": "test user id",
+}
+
+with patch("slack_sdk.WebClient", return_value=mock_client):
+    from incidentbot.api import cache as cache_module
+    from incidentbot.api.cache import ResponseCache
+    from incidentbot.api.main import app as main_app
+    from incidentbot.configuration.settings import settings
+    from incidentbot.models.database import IncidentRecord
+    from incidentbot.slack.home import home_view
+    from incidentbot.util.security import create_access_token
+
+
+prefix = settings.api.v1_str
+
+
+class TestConditionalGet(unittest.TestCase):
+    def setUp(self):
+        self.cache = ResponseCache(ttl_seconds=60)
+        patcher = patch.object(cache_module, "response_cache", self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.calls = 0
+        # The application's own middleware, in the order it registers them
+        app = FastAPI()
+        app.user_middleware = list(main_app.user_middleware)
+
+        @app.get(f"{prefix}/incident")
+        def list_incidents():
+            self.calls += 1
+            return [{"slug": "inc-1"}]
+
+        @app.get(f"{prefix}/incident/{{slug}}")
+        def get_incident(slug: str):
+            self.calls += 1
+            return {"slug": slug}
+
+        @app.post(f"{prefix}/incident")
+        def post_incident():
+            return {}
+
+        self.client = TestClient(app)
+        self.headers = {
+            "Authorization": "Bearer "
+            + create_access_token("user", timedelta(minutes=5))
+        }
+
+    def test_list_is_served_from_cache(self):
+        first = self.client.get(f"{prefix}/incident", headers=self.headers)
+        etag = first.headers["etag"]
+
+        second = self.client.get(
+            f"{prefix}/incident",
+            headers=self.headers | {"If-None-Match": etag},
+        )
+        third = self.client.get(f"{prefix}/incident", headers=self.headers)
+
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.content, b"")
+        self.assertEqual(third.json(), [{"slug": "inc-1"}])
+        self.assertEqual(third.headers["etag"], etag)
+        self.assertEqual(self.calls, 1)
+
+    def test_cached_responses_carry_cors_headers(self):
+        headers = self.headers | {"Origin": "https://dashboard.example.com"}
+        first = self.client.get(f"{prefix}/incident", headers=headers)
+        cached = self.client.get(f"{prefix}/incident", headers=headers)
+        not_modified = self.client.get(
+            f"{prefix}/incident",
+            headers=headers | {"If-None-Match": first.headers["etag"]},
+        )
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(not_modified.status_code, 304)
+        for response in (first, cached, not_modified):
+            self.assertEqual(
+                response.headers["access-control-allow-origin"], "*"
+            )
+
+    def test_writes_invalidate(self):
+        self.client.get(f"{prefix}/incident", headers=self.headers)
+        self.client.post(f"{prefix}/incident", headers=self.headers)
+        self.client.get(f"{prefix}/incident", headers=self.headers)
+
+        self.assertEqual(self.calls, 2)
+
+    def test_invalid_token_is_not_cached(self):
+        headers = {"Authorization": "Bearer nope"}
+        self.client.get(f"{prefix}/incident", headers=headers)
+        self.client.get(f"{prefix}/incident", headers=headers)
+
+        self.assertEqual(self.calls, 2)
+
+    def test_uncached_path_still_revalidates(self):
+        first = self.client.get(f"{prefix}/incident/inc-1")
+        second = self.client.get(
+            f"{prefix}/incident/inc-1",
+            headers={"If-None-Match": first.headers["etag"]},
+        )
+
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(self.calls, 2)
+
+    def test_database_writes_invalidate(self):
+        engine = create_engine("sqlite://")
+        generation = self.cache.generation
+
+        with Session(engine) as session:
+            session.exec(select(literal(1)))
+            session.commit()
+        self.assertEqual(self.cache.generation, generation)
+
+        with Session(engine) as session:
+            session.exec(text("CREATE TABLE item (name TEXT)"))
+            session.commit()
+        self.assertEqual(self.cache.generation, generation + 1)
+
+    def test_one_commit_invalidates_every_cache(self):
+        engine = create_engine("sqlite://")
+        IncidentRecord.__table__.create(engine)
+        generation = self.cache.generation
+        version = home_view.version
+
+        with Session(engine) as session:
+            session.add(IncidentRecord(id=1, slug="inc-1", status="open"))
+            session.commit()
+
+        self.assertEqual(self.cache.generation, generation + 1)
+        self.assertEqual(home_view.version, version + 1)
@@ -0,0 +1,184 @@
+import unittest
+from datetime import datetime
+from unittest.mock import patch, MagicMock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import NoResultFound
+
+# Mock the slack client before importing modules that depend on it
+mock_client = MagicMock()
+mock_client.auth_test.return_value = {
+    "ok": True,
+    "url": "https://testworkspace.slack.com",
+    "user": "test user",
+    "user_id": "test user id",
+}
+
+with patch("slack_sdk.WebClient", return_value=mock_client):
+    from incidentbot.api.deps import (
+        get_async_db,
+        get_current_active_superuser,
+    )
+    from incidentbot.api.routes.incident import parse_byte_range, router
+    from incidentbot.models.database import IncidentRecord
+    from incidentbot.models.incident import IncidentDatabaseInterface
+
+
+class FakeAsyncSession:
+    """
+    Stands in for AsyncSession, returning results in the order given
+    """
+
+    def __init__(self, *results: MagicMock):
+        self.results = list(results)
+        self.statements = []
+
+    async def exec(self, statement):
+        self.statements.append(statement)
+        return self.results.pop(0)
+
+
+class TestParseByteRange(unittest.TestCase):
+    def test_ranges(self):
+        for header, expected in (
+            ("bytes=0-99", (0, 99)),
+            ("bytes=100-", (100, 999)),
+            ("bytes=-100", (900, 999)),
+            ("bytes=900-5000", (900, 999)),
+            ("bytes=-5000", (0, 999)),
+        ):
+            with self.subTest(header=header):
+                self.assertEqual(parse_byte_range(header, 1000), expected)
+
+    def test_ignored_ranges(self):
+        for header in ("items=0-1", "bytes=0-1,5-6", "bytes=a-b"):
+            with self.subTest(header=header):
+                self.assertIsNone(parse_byte_range(header, 1000))
+
+    def test_unsatisfiable_ranges(self):
+        for header in ("bytes=1000-", "bytes=500-100"):
+            with self.subTest(header=header):
+                with self.assertRaises(ValueError):
+                    parse_byte_range(header, 1000)
+
+
+class TestAsyncRoutes(unittest.TestCase):
+    def setUp(self):
+        self.app = FastAPI()
+        self.app.include_router(router)
+        self.app.dependency_overrides[get_current_active_superuser] = (
+            lambda: None
+        )
+        self.client = TestClient(self.app)
+
+    def use_session(self, session: FakeAsyncSession):
+        async def get_session():
+            yield session
+
+        self.app.dependency_overrides[get_async_db] = get_session
+
+    def test_archived_incident_is_gone(self):
+        missing = MagicMock()
+        missing.one.side_effect = NoResultFound()
+        tombstone = MagicMock()
+        tombstone.first.return_value = 1
+        session = FakeAsyncSession(missing, tombstone)
+        self.use_session(session)
+
+        response = self.client.get("/incident/inc-1")
+
+        self.assertEqual(response.status_code, 410)
+        self.assertEqual(len(session.statements), 2)
+
+    def test_missing_incident_artifacts(self):
+        missing = MagicMock()
+        missing.one.side_effect = NoResultFound()
+        self.use_session(FakeAsyncSession(missing))
+
+        response = self.client.get("/incident/inc-1/jira")
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_incident_detail(self):
+        row = MagicMock()
+        row.__getitem__.return_value = IncidentRecord(
+            created_at=datetime(2026, 1, 1), id=1, slug="inc-1"
+        )
+        row._mapping = {
+            "jira": [{"key": "OPS-1", "parent": 1, "url": "https://jira"}],
+            "participants": [
+                {
+                    "created_at": "2026-01-01T10:00:00",
+                    "id": 1,
+                    "is_lead": True,
+                    "parent": 1,
+                    "role": "incident_commander",
+                    "updated_at": None,
+                    "user_id": "U1",
+                    "user_name": "someone",
+                }
+            ],
+        }
+        result = MagicMock()
+        result.first.return_value = row
+        session = FakeAsyncSession(result)
+        self.use_session(session)
+
+        response = self.client.get(
+            "/incident/inc-1/full?include=participants,jira,jira"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["incident"]["slug"], "inc-1")
+        self.assertEqual(
+            body["jira"],
+            [
+                {
+                    "key": "OPS-1",
+                    "status": None,
+                    "team": None,
+                    "url": "https://jira",
+                }
+            ],
+        )
+        self.assertEqual(
+            body["participants"][0]["created_at"], "2026-01-01T10:00:00"
+        )
+        self.assertIsNone(body["events"])
+        self.assertEqual(
+            list(session.statements[0].selected_columns.keys())[-2:],
+            ["participants", "jira"],
+        )
+
+    def test_incident_detail_unknown_include(self):
+        self.use_session(FakeAsyncSession())
+
+        response = self.client.get("/incident/inc-1/full?include=jira,nope")
+
+        self.assertEqual(response.status_code, 400)
+
+
+class TestIncidentDetailQuery(unittest.TestCase):
+    def test_one_statement_without_images(self):
+        statement = str(
+            IncidentDatabaseInterface.detail_query(
+                slug="inc-1", include=["events", "jira"]
+            ).compile(dialect=postgresql.dialect())
+        )
+
+        self.assertEqual(statement.count("json_agg"), 2)
+        self.assertIn(
+            "ORDER BY incidentevent.message_ts, incidentevent.id", statement
+        )
+        self.assertIn("incidentevent.image_ref", statement)
+        self.assertNotIn("incidentevent.image,", statement)
+        self.assertIn(
+            "WHERE jiraissuerecord.parent = incidentrecord.id", statement
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+from unittest.mock import patch, MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+# Mock the slack client before importing modules that depend on it
+mock_client = MagicMock()
+mock_client.auth_test.return_value = {
+    "ok": True,
+    "url": "https://testworkspace.slack.com",
+    "user": "test user",
+    "user_id": "test user id",
+}
+
+with patch("slack_sdk.WebClient", return_value=mock_client):
+    from incidentbot.models import application_data as application_data_module
+    from incidentbot.models.application_data import (
+        ApplicationDataCache,
+        ApplicationDataInterface,
+        content_digest,
+        slack_channels,
+    )
+    from incidentbot.models.database import ApplicationData
+
+
+class TestApplicationData(unittest.TestCase):
+    def setUp(self):
+        self.cache = ApplicationDataCache(ttl_seconds=60)
+        self.session = MagicMock()
+        self.session.__enter__.return_value = self.session
+
+        for name, value in [
+            ("cache", self.cache),
+            ("db_session", MagicMock(return_value=self.session)),
+        ]:
+            patcher = patch.object(application_data_module, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_digest_ignores_key_order(self):
+        self.assertEqual(
+            content_digest({"a": 1, "b": [1, 2]}),
+            content_digest({"b": [1, 2], "a": 1}),
+        )
+        self.assertNotEqual(content_digest({"a": 1}), content_digest({"a": 2}))
+
+    def test_unchanged_payload_skips_write(self):
+        channels = [{"id": "C1", "name": "general"}]
+        self.cache.set(
+            "slack_channels",
+            ApplicationData(
+                digest=content_digest(channels),
+                json_data=channels,
+                name="slack_channels",
+            ),
+        )
+
+        self.assertFalse(
+            ApplicationDataInterface.put(slack_channels, channels)
+        )
+        self.session.exec.assert_not_called()
+        self.assertEqual(
+            ApplicationDataInterface.get(slack_channels), channels
+        )
+
+    def test_write_is_one_upsert_and_invalidates_cache(self):
+        self.cache.set("slack_channels", None)
+        self.session.exec.return_value.rowcount = 1
+
+        self.assertTrue(
+            ApplicationDataInterface.put(slack_channels, [{"id": "C1"}])
+        )
+
+        self.assertEqual(self.cache.get("slack_channels"), (False, None))
+        statement = str(
+            self.session.exec.call_args.args[0].compile(
+                dialect=postgresql.dialect()
+            )
+        )
+        self.assertIn("ON CONFLICT (name) DO UPDATE", statement)
+        self.assertTrue(
+            statement.endswith(
+                "WHERE applicationdata.digest IS DISTINCT FROM excluded.digest"
+            )
+        )
+
+    def test_missing_key_returns_default(self):
+        self.session.exec.return_value.first.return_value = None
+
+        self.assertEqual(ApplicationDataInterface.get(slack_channels), [])
+        self.assertEqual(self.cache.get("slack_channels"), (True, None))
@@ -0,0 +1,156 @@
+import tempfile
+import unittest
+import uuid
+from datetime import datetime
+from unittest.mock import patch, MagicMock
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, select, SQLModel
+
+# Mock the slack client before importing modules that depend on it
+mock_client = MagicMock()
+mock_client.auth_test.return_value = {
+    "ok": True,
+    "url": "https://testworkspace.slack.com",
+    "user": "test user",
+    "user_id": "test user id",
+}
+
+with patch("slack_sdk.WebClient", return_value=mock_client):
+    from incidentbot.archive import core as archive_module
+    from incidentbot.blobstore.core import LocalBlobStore
+    from incidentbot.models.database import (
+        IncidentArchiveRecord,
+        IncidentEvent,
+        IncidentMetrics,
+        IncidentParticipant,
+        IncidentRecord,
+        IncidentStatusTime,
+    )
+
+
+created_at = datetime(2020, 1, 1)
+
+
+class TestArchive(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        SQLModel.metadata.create_all(self.engine)
+
+        with Session(self.engine) as session:
+            session.add(
+                IncidentRecord(
+                    created_at=created_at,
+                    description="database outage",
+                    id=1,
+                    roles={"incident_commander": "U1"},
+                    severity="sev2",
+                    slug="inc-1",
+                    status="resolved",
+                )
+            )
+            session.add(
+                IncidentEvent(
+                    created_at=created_at,
+                    id=uuid.UUID(int=1),
+                    image=b"legacy image",
+                    incident_slug="inc-1",
+                    mimetype="image/png",
+                    parent=1,
+                    source="slack",
+                )
+            )
+            session.add(
+                IncidentParticipant(
+                    is_lead=True,
+                    parent=1,
+                    role="incident_commander",
+                    user_id="U1",
+                    user_name="someone",
+                )
+            )
+            session.commit()
+
+        self.store = LocalBlobStore(root=tempfile.mkdtemp())
+        for name, value in [
+            ("engine", self.engine),
+            ("get_archive_store", lambda: self.store),
+            ("get_blob_store", lambda: self.store),
+        ]:
+            patcher = patch.object(archive_module, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_archive_and_restore(self):
+        record = archive_module.archive_incident(1)
+
+        self.assertEqual(record.slug, "inc-1")
+        self.assertIsNotNone(record.images)
+        with Session(self.engine) as session:
+            self.assertEqual(session.exec(select(IncidentRecord)).all(), [])
+            self.assertEqual(session.exec(select(IncidentEvent)).all(), [])
+
+        incident = archive_module.restore_incident("inc-1")
+
+        self.assertEqual(incident.created_at, created_at)
+        self.assertEqual(incident.roles, {"incident_commander": "U1"})
+        with Session(self.engine) as session:
+            event = session.exec(select(IncidentEvent)).one()
+            self.assertEqual(event.id, uuid.UUID(int=1))
+            self.assertIsNone(event.image)
+            self.assertEqual(self.store.get(event.image_ref), b"legacy image")
+            self.assertEqual(
+                session.exec(select(IncidentParticipant.user_id)).all(),
+                ["U1"],
+            )
+            self.assertEqual(
+                session.exec(select(IncidentArchiveRecord)).all(), []
+            )
+
+    def test_archive_old_incidents_skips_open(self):
+        with Session(self.engine) as session:
+            session.add(
+                IncidentRecord(
+                    created_at=created_at,
+                    id=2,
+                    slug="inc-2",
+                    status="investigating",
+                )
+            )
+            session.commit()
+
+        self.assertEqual(archive_module.archive_old_incidents(), 1)
+        with Session(self.engine) as session:
+            self.assertEqual(
+                session.exec(select(IncidentRecord.slug)).all(), ["inc-2"]
+            )
+
+    def test_analytics_outlive_archived_incidents(self):
+        with Session(self.engine) as session:
+            session.add(
+                IncidentMetrics(
+                    created_at=created_at,
+                    parent=1,
+                    status="resolved",
+                    status_entered_at=created_at,
+                )
+            )
+            session.add(
+                IncidentStatusTime(parent=1, seconds=60, status="triage")
+            )
+            session.commit()
+
+        archive_module.archive_incident(1)
+
+        with Session(self.engine) as session:
+            self.assertEqual(
+                session.exec(select(IncidentMetrics.parent)).all(), [1]
+            )
+            self.assertEqual(
+                session.exec(select(IncidentStatusTime.seconds)).all(), [60]
+            )
@@ -0,0 +1,76 @@
+import hashlib
+import os
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+
+# Mock the slack client before importing modules that depend on it
+mock_client = MagicMock()
+mock_client.auth_test.return_value = {
+    "ok": True,
+    "url": "https://testworkspace.slack.com",
+    "user": "test user",
+    "user_id": "test user id",
+}
+
+with patch("slack_sdk.WebClient", return_value=mock_client):
+    from incidentbot.blobstore.core import LocalBlobStore, PostgresBlobStore
+
+
+class TestLocalBlobStore(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.store = LocalBlobStore(root=self.dir.name)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_round_trip_by_digest(self):
+        digest = self.store.put(b"screenshot")
+
+        self.assertEqual(digest, hashlib.sha256(b"screenshot").hexdigest())
+        self.assertEqual(self.store.get(digest), b"screenshot")
+
+    def test_identical_content_is_stored_once(self):
+        first = self.store.put(b"screenshot")
+        second = self.store.put(b"screenshot")
+
+        self.assertEqual(first, second)
+        self.assertEqual([d for d, _ in self.store.list()], [first])
+        self.assertEqual(
+            os.listdir(os.path.join(self.dir.name, first[:2])), [first]
+        )
+
+    def test_delete(self):
+        digest = self.store.put(b"screenshot")
+        self.store.delete(digest)
+
+        self.assertIsNone(self.store.get(digest))
+        # Deleting twice is harmless
+        self.store.delete(digest)
+
+    def test_rejects_invalid_digest(self):
+        with self.assertRaises(ValueError):
+            self.store.get("../../etc/passwd")
+
+
+class TestPostgresBlobStore(unittest.TestCase):
+    def test_list_reads_in_one_session(self):
+        rows = [("a" * 64, None), ("b" * 64, None)]
+        session = MagicMock()
+        session.__enter__.return_value = session
+        session.exec.return_value.all.return_value = rows
+
+        with patch(
+            "incidentbot.blobstore.core.db_session", return_value=session
+        ):
+            blobs = PostgresBlobStore().list()
+            first = next(blobs)
+
+            # Closed before the caller sees the first blob
+            session.__exit__.assert_called_once()
+            self.assertEqual([first, *blobs], rows)
+
+
+if __name__ == "__main__":
+    unittest.main()
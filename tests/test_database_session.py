@@ -0,0 +1,131 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.pool import QueuePool
+
+# Mock the slack client before importing modules that depend on it
+mock_client = MagicMock()
+mock_client.auth_test.return_value = {
+    "ok": True,
+    "url": "https://testworkspace.slack.com",
+    "user": "test user",
+    "user_id": "test user id",
+}
+
+with patch("slack_sdk.WebClient", return_value=mock_client):
+    from incidentbot.models.database import (
+        current_unit_of_work,
+        db_session,
+        PoolCheckoutStats,
+        unit_of_work,
+        UnitOfWorkExecutor,
+    )
+
+
+class TestUnitOfWork(unittest.TestCase):
+    def setUp(self):
+        fd, path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+
+        self.engine = create_engine(f"sqlite:///{path}", poolclass=QueuePool)
+        self.addCleanup(self.engine.dispose)
+        with self.engine.begin() as conn:
+            conn.execute(text("CREATE TABLE item (name TEXT)"))
+
+        self.checkouts = 0
+
+        def count_checkout(*args):
+            self.checkouts += 1
+
+        event.listen(self.engine, "checkout", count_checkout)
+
+    def names(self) -> list[str]:
+        with self.engine.connect() as conn:
+            return conn.execute(text("SELECT name FROM item")).scalars().all()
+
+    def test_blocks_share_one_session(self):
+        with unit_of_work(self.engine):
+            with db_session(self.engine) as first:
+                first.exec(text("INSERT INTO item VALUES ('committed')"))
+                first.commit()
+                self.assertEqual(self.engine.pool.checkedout(), 0)
+
+            with db_session(self.engine) as session:
+                self.assertIs(session, first)
+                session.exec(text("INSERT INTO item VALUES ('discarded')"))
+
+            self.assertEqual(self.engine.pool.checkedout(), 0)
+
+            with db_session(self.engine) as session:
+                self.assertIs(session, first)
+                self.assertEqual(
+                    session.exec(text("SELECT count(*) FROM item")).scalar(),
+                    1,
+                )
+
+        self.assertEqual(self.engine.pool.checkedout(), 0)
+        self.assertEqual(self.names(), ["committed"])
+
+    def test_no_connection_held_between_blocks(self):
+        with unit_of_work(self.engine):
+            with db_session(self.engine) as session:
+                session.exec(text("SELECT 1"))
+                self.assertEqual(self.engine.pool.checkedout(), 1)
+
+            self.assertEqual(self.engine.pool.checkedout(), 0)
+
+            with db_session(self.engine) as session:
+                session.exec(text("SELECT 1"))
+
+        self.assertEqual(self.checkouts, 2)
+
+    def test_nested_block_gets_its_own_session(self):
+        with unit_of_work(self.engine):
+            with db_session(self.engine) as outer:
+                with db_session(self.engine) as inner:
+                    self.assertIsNot(outer, inner)
+                    inner.exec(text("INSERT INTO item VALUES ('inner')"))
+                    inner.commit()
+
+                outer.exec(text("INSERT INTO item VALUES ('outer')"))
+
+        self.assertEqual(self.names(), ["inner"])
+
+    def test_other_engines_are_not_shared(self):
+        other = create_engine("sqlite://")
+        self.addCleanup(other.dispose)
+
+        with unit_of_work(self.engine):
+            with db_session(self.engine) as session:
+                pass
+            with db_session(other) as other_session:
+                self.assertIsNot(other_session, session)
+                self.assertEqual(
+                    other_session.exec(text("SELECT 1")).scalar(), 1
+                )
+
+    def test_executor_runs_in_unit_of_work(self):
+        with UnitOfWorkExecutor(max_workers=1) as executor:
+            uow = executor.submit(current_unit_of_work.get).result()
+
+        self.assertIsNotNone(uow)
+        self.assertTrue(uow.closed)
+        self.assertIsNone(current_unit_of_work.get())
+
+
+class TestPoolCheckoutStats(unittest.TestCase):
+    def test_record(self):
+        stats = PoolCheckoutStats("sync")
+        stats.record(0.01)
+        stats.record(5.0)
+        stats.record(30.0, timed_out=True)
+
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot["checkouts"], 3)
+        self.assertEqual(snapshot["max_wait_seconds"], 30.0)
+        self.assertEqual(snapshot["slow_checkouts"], 1)
+        self.assertEqual(snapshot["timeouts"], 1)
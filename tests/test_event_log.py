@@ -0,0 +1,219 @@
+import threading
+import time
+import unittest
+import uuid
+from datetime import datetime
+from unittest.mock import patch, MagicMock
+
+from sqlalchemy import create_engine, update
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session
+
+# Mock the slack client before importing modules that depend on it
+mock_client = MagicMock()
+mock_client.auth_test.return_value = {
+    "ok": True,
+    "url": "https://testworkspace.slack.com",
+    "user": "test user",
+    "user_id": "test user id",
+}
+
+with patch("slack_sdk.WebClient", return_value=mock_client):
+    from incidentbot.configuration.settings import EventLog
+    from incidentbot.incident import event as event_module
+    from incidentbot.incident.event import EventLogHandler, EventLogWriter
+    from incidentbot.models.database import IncidentEvent, IncidentRecord
+
+
+created_at = datetime(2026, 1, 1)
+
+
+class TestEventTimeline(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        IncidentRecord.__table__.create(self.engine)
+        IncidentEvent.__table__.create(self.engine)
+
+        with Session(self.engine) as session:
+            session.add(IncidentRecord(id=1, slug="inc-1"))
+            session.add(IncidentRecord(id=2, slug="inc-2"))
+            for n in range(5):
+                session.add(
+                    IncidentEvent(
+                        change_seq=n + 1,
+                        created_at=created_at,
+                        id=uuid.UUID(int=n),
+                        incident_slug="inc-1",
+                        message_ts=f"170000000{n}.000000",
+                        parent=1,
+                        source="slack",
+                        text=f"event {n}",
+                    )
+                )
+            session.add(
+                IncidentEvent(
+                    created_at=created_at,
+                    incident_slug="inc-2",
+                    message_ts="1700000000.000000",
+                    parent=2,
+                    source="slack",
+                )
+            )
+            session.commit()
+
+        patcher = patch.object(event_module, "engine", self.engine)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_pages_follow_on_from_cursor(self):
+        first = EventLogHandler.read_summaries(incident_slug="inc-1", limit=2)
+        rest = EventLogHandler.read_summaries(
+            incident_slug="inc-1",
+            after=(first[-1].message_ts, first[-1].id),
+        )
+
+        self.assertEqual(
+            [e.text for e in first + rest], [f"event {n}" for n in range(5)]
+        )
+
+    def test_since_returns_only_changes(self):
+        since = max(
+            e.change_seq
+            for e in EventLogHandler.read_summaries(incident_slug="inc-1")
+        )
+
+        self.assertEqual(since, 5)
+        self.assertEqual(
+            EventLogHandler.read_summaries(incident_slug="inc-1", since=since),
+            [],
+        )
+
+        with Session(self.engine) as session:
+            session.exec(
+                update(IncidentEvent)
+                .where(IncidentEvent.id == uuid.UUID(int=1))
+                .values(change_seq=6, text="edited")
+            )
+            session.commit()
+
+        changes = EventLogHandler.read_summaries(
+            incident_slug="inc-1", since=since
+        )
+
+        self.assertEqual([e.text for e in changes], ["edited"])
+        self.assertNotIn("change_seq", changes[0].model_dump())
+
+
+class TestEventLogWriter(unittest.TestCase):
+    def setUp(self):
+        # Shared with the writer thread
+        self.engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        IncidentRecord.__table__.create(self.engine)
+        IncidentEvent.__table__.create(self.engine)
+
+        with Session(self.engine) as session:
+            session.add(IncidentRecord(id=1, slug="inc-1"))
+            session.commit()
+
+        for patcher in (
+            patch.object(event_module, "engine", self.engine),
+            patch.object(
+                event_module,
+                "settings",
+                MagicMock(event_log=EventLog(flush_interval_seconds=5)),
+            ),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.writer = EventLogWriter()
+
+    def row(self, n: int, parent: int = 1) -> dict:
+        return {
+            "id": uuid.uuid4(),
+            "incident_slug": "inc-1",
+            "message_ts": f"170000000{n}.000000",
+            "parent": parent,
+            "source": "slack",
+            "text": f"event {n}",
+        }
+
+    def texts(self) -> list[str]:
+        return [
+            e.text
+            for e in EventLogHandler.read_summaries(incident_slug="inc-1")
+        ]
+
+    def test_flush_writes_queued_events(self):
+        for n in range(3):
+            self.writer.put(self.row(n))
+            # Let the writer thread pick up the first event
+            time.sleep(0.05)
+
+        self.writer.flush()
+
+        self.assertEqual(self.texts(), ["event 0", "event 1", "event 2"])
+
+    def test_failed_event_does_not_drop_batch(self):
+        self.writer.put(self.row(0))
+        self.writer.put(self.row(1) | {"source": None})
+        self.writer.put(self.row(2))
+        self.writer.flush()
+
+        self.assertEqual(self.texts(), ["event 0", "event 2"])
+
+    def test_summaries_include_queued_events(self):
+        self.writer.put(self.row(0))
+
+        with patch.object(event_module, "writer", self.writer):
+            self.assertEqual(self.texts(), ["event 0"])
+
+    def test_flush_gives_up_on_stuck_writer(self):
+        stuck = threading.Event()
+        self.addCleanup(stuck.set)
+
+        with patch.object(
+            self.writer, "_write", side_effect=lambda batch: stuck.wait(5)
+        ):
+            self.writer.put(self.row(0))
+            # Let the writer thread pick up the event
+            time.sleep(0.05)
+
+            self.assertFalse(self.writer.flush(timeout=0.1))
+
+    def test_user_names_are_cached(self):
+        with patch.object(
+            event_module,
+            "get_slack_user",
+            return_value={"real_name": "Jane Doe"},
+            create=True,
+        ) as get_slack_user:
+            self.assertEqual(self.writer.user_name("U1"), "Jane Doe")
+            self.assertEqual(self.writer.user_name("U1"), "Jane Doe")
+
+        self.assertEqual(get_slack_user.call_count, 1)
+        self.assertEqual(self.writer.user_name(None), "NotAvailable")
+
+    def test_user_name_cache_is_bounded(self):
+        event_module.settings.event_log.user_name_cache_size = 2
+
+        with patch.object(
+            event_module,
+            "get_slack_user",
+            side_effect=lambda user: {"real_name": f"name of {user}"},
+            create=True,
+        ) as get_slack_user:
+            for user in ("U1", "U2", "U1", "U3", "U1"):
+                self.writer.user_name(user)
+
+        # U2 was the least recently used when U3 was added
+        self.assertEqual(list(self.writer._names), ["U3", "U1"])
+        self.assertEqual(get_slack_user.call_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
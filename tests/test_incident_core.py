@@ -1,7 +1,11 @@
+import json
 import unittest
 from unittest.mock import patch, MagicMock
 from datetime import datetime
 
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web import SlackResponse
+
 # Mock the entire slack client module and settings before importing core
 mock_client = MagicMock()
 mock_client.auth_test.return_value = {
@@ -22,6 +26,8 @@ with patch("slack_sdk.WebClient", return_value=mock_client), patch(
 ) as mock_settings, patch(
     "sqlmodel.create_engine"
 ) as mock_create_engine, patch(
+    "sqlalchemy.ext.asyncio.create_async_engine"
+), patch(
     "apscheduler.schedulers.background.BackgroundScheduler"
 ) as mock_scheduler:
     # Mock settings before importing
@@ -40,7 +46,14 @@ with patch("slack_sdk.WebClient", return_value=mock_client), patch(
     mock_scheduler_instance = MagicMock()
     mock_scheduler.return_value = mock_scheduler_instance
 
-    from incidentbot.incident.core import format_channel_name
+    from incidentbot.incident import core as core_module
+    from incidentbot.incident.core import (
+        format_channel_name,
+        Incident,
+        IncidentRequestParameters,
+    )
+    from incidentbot.models import incident as incident_module
+    from incidentbot.models.database import IncidentRecord
 
 
 class TestFormatChannelName(unittest.TestCase):
@@ -99,5 +112,198 @@ class TestFormatChannelName(unittest.TestCase):
         self.assertEqual(result, "incident-1-test-description-with-spaces")
 
 
+class TestCreationStepOutputs(unittest.TestCase):
+    """
+    Step values are stored as JSON through save_creation_step, a step whose
+    value can't be stored is never recorded as succeeded
+    """
+
+    def setUp(self):
+        self.record = IncidentRecord(
+            description="Test Description",
+            id=1,
+            is_security_incident=True,
+            severity="sev1",
+            status="investigating",
+        )
+        self.session = core_session = MagicMock()
+        core_session.__enter__.return_value = core_session
+        core_session.get.side_effect = lambda model, id: (
+            self.record if model is IncidentRecord else None
+        )
+
+        self.statements = []
+        step_session = MagicMock()
+        step_session.__enter__.return_value = step_session
+        step_session.exec.side_effect = self.statements.append
+
+        client = MagicMock()
+        client.chat_postMessage.side_effect = lambda **_: slack_response(
+            ts="1.0"
+        )
+        client.conversations_setTopic.side_effect = (
+            lambda **_: slack_response()
+        )
+
+        options = MagicMock()
+        options.additional_welcome_messages = None
+        options.auto_invite_groups = None
+        options.channel_name_prefix = "inc"
+        options.channel_name_use_date_prefix = False
+        options.incident_creation_concurrency = 4
+        options.pin_meeting_link_to_channel = True
+
+        patchers = [
+            patch.object(core_module, "BlockBuilder"),
+            patch.object(core_module, "db_session", return_value=core_session),
+            patch.object(core_module, "EventLogHandler"),
+            patch.object(
+                core_module, "get_slack_user", create=True, return_value=None
+            ),
+            patch.object(core_module, "IncidentChannelDigestNotification"),
+            patch.object(core_module, "invite_user_to_channel", create=True),
+            patch.object(core_module, "settings", MagicMock(options=options)),
+            patch.object(core_module, "slack_web_client", client, create=True),
+            patch.object(core_module, "slack_workspace_id", "T1", create=True),
+            patch.object(
+                core_module.IncidentDatabaseInterface, "set_reminder"
+            ),
+            patch.object(
+                incident_module, "db_session", return_value=step_session
+            ),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        core_module.settings.integrations = None
+
+        self.incident = Incident(
+            params=IncidentRequestParameters(
+                incident_components="api",
+                incident_description="Test Description",
+                severity="sev1",
+                user="U1",
+            )
+        )
+
+    def stored_outputs(self) -> dict:
+        outputs = {}
+        for statement in self.statements:
+            params = statement.compile().params
+            if params["status"] == "succeeded":
+                outputs[params["name"]] = json.loads(
+                    json.dumps(params["output"], allow_nan=False)
+                )
+
+        return outputs
+
+    def test_step_values_are_stored(self):
+        with patch.multiple(
+            self.incident,
+            create_channel=MagicMock(return_value={"id": "C1"}),
+            generate_meeting_link=MagicMock(return_value="https://meet"),
+        ):
+            self.incident.create_incident_channel(id=1, completed={})
+        self.incident.handle_incident_optional_features(id=1, completed={})
+
+        outputs = self.stored_outputs()
+        self.assertEqual(outputs["channel"], {"value": "C1"})
+        self.assertEqual(outputs["topic"], {"value": None})
+        self.assertEqual(outputs["welcome"], {"value": "1.0"})
+        self.assertEqual(outputs["security_notice"], {"value": "1.0"})
+        self.assertIn("pin_meeting_link", outputs)
+
+    def test_failed_digest_ts_is_not_written(self):
+        core_module.IncidentChannelDigestNotification.create.side_effect = (
+            RuntimeError("digest channel not found")
+        )
+
+        with patch.multiple(
+            self.incident,
+            create_channel=MagicMock(return_value={"id": "C1"}),
+            generate_meeting_link=MagicMock(return_value="https://meet"),
+        ):
+            self.incident.create_incident_channel(id=1, completed={})
+
+        params = self.session.exec.call_args_list[-1].args[0].compile().params
+        self.assertEqual(params.get("boilerplate_message_ts"), "1.0")
+        self.assertNotIn("digest_message_ts", params)
+
+    def test_group_already_in_channel_is_invited(self):
+        group = MagicMock(severities="all")
+        group.name = "oncall"
+        core_module.settings.options.auto_invite_groups = [group]
+        core_module.slack_web_client.usergroups_users_list.return_value = {
+            "users": ["U1", "U2"]
+        }
+        core_module.slack_web_client.conversations_invite.side_effect = (
+            SlackApiError(
+                "already_in_channel",
+                slack_response(ok=False, error="already_in_channel"),
+            )
+        )
+
+        with patch.object(
+            core_module,
+            "all_workspace_groups",
+            {"usergroups": [{"handle": "oncall", "id": "S1"}]},
+            create=True,
+        ):
+            self.assertTrue(
+                self.incident.handle_incident_optional_features(
+                    id=1, completed={}
+                )
+            )
+
+        self.assertIn("invite_group_oncall", self.stored_outputs())
+
+    def test_existing_jira_issue_is_reused(self):
+        core_module.settings.integrations = MagicMock(
+            atlassian=MagicMock(statuspage=None), gitlab=None, pagerduty=None
+        )
+
+        with patch("incidentbot.jira.issue.JiraIssue") as jira_issue:
+            jira_issue.return_value.find.return_value = {
+                "key": "INC-1",
+                "self": "https://jira/rest/api/2/issue/1",
+            }
+            self.incident.handle_incident_optional_features(id=1, completed={})
+
+        jira_issue.return_value.new.assert_not_called()
+        self.assertEqual(
+            self.stored_outputs()["jira_issue"]["value"]["key"], "INC-1"
+        )
+        (issue_record,) = [
+            call.args[0]
+            for call in self.session.add.call_args_list
+            if call.args[0].__class__.__name__ == "JiraIssueRecord"
+        ]
+        self.assertEqual(issue_record.key, "INC-1")
+
+    def test_unserializable_value_is_stored_as_none(self):
+        incident_module.IncidentDatabaseInterface.save_creation_step(
+            parent=1,
+            pipeline="start",
+            name="topic",
+            status="succeeded",
+            output=slack_response(),
+        )
+
+        self.assertEqual(self.stored_outputs(), {"topic": {"value": None}})
+
+
+def slack_response(**data) -> SlackResponse:
+    return SlackResponse(
+        client=None,
+        http_verb="POST",
+        api_url="https://slack.com/api/",
+        req_args={},
+        data={"ok": True} | data,
+        headers={},
+        status_code=200,
+    )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,169 @@
+import os
+import unittest
+import uuid
+from datetime import datetime
+from unittest.mock import patch, MagicMock
+
+from sqlalchemy import create_engine, insert, select, text
+from sqlalchemy.dialects import postgresql
+
+# Mock the slack client before importing modules that depend on it
+mock_client = MagicMock()
+mock_client.auth_test.return_value = {
+    "ok": True,
+    "url": "https://testworkspace.slack.com",
+    "user": "test user",
+    "user_id": "test user id",
+}
+
+with patch("slack_sdk.WebClient", return_value=mock_client):
+    from incidentbot.models.database import IncidentRecord
+    from incidentbot.models.incident import IncidentDatabaseInterface
+
+
+def database_url() -> str:
+    return "postgresql://{}:{}@{}:{}/{}".format(
+        os.getenv("POSTGRES_USER", "postgres"),
+        os.getenv("POSTGRES_PASSWORD", ""),
+        os.getenv("POSTGRES_HOST", "localhost"),
+        os.getenv("POSTGRES_PORT", "5432"),
+        os.getenv("POSTGRES_DB", "postgres"),
+    )
+
+
+def plan_nodes(plan: dict) -> list[dict]:
+    return [plan] + [
+        node for child in plan.get("Plans", []) for node in plan_nodes(child)
+    ]
+
+
+class TestLookupFilter(unittest.TestCase):
+    def test_filters_on_first_key_only(self):
+        self.assertEqual(
+            str(IncidentDatabaseInterface.lookup_filter(channel_id="C1")),
+            "incidentrecord.channel_id = :channel_id_1",
+        )
+        self.assertEqual(
+            str(IncidentDatabaseInterface.lookup_filter(id=1, slug="inc-1")),
+            "incidentrecord.id = :id_1",
+        )
+
+    def test_keyset_page_continues_after_cursor(self):
+        query = IncidentDatabaseInterface.keyset_page(
+            query=select(IncidentRecord.id),
+            before=(datetime(2026, 1, 1), 42),
+        )
+
+        self.assertIn(
+            "(incidentrecord.created_at, incidentrecord.id) < ", str(query)
+        )
+        self.assertTrue(
+            str(query).endswith(
+                "ORDER BY incidentrecord.created_at DESC, incidentrecord.id DESC"
+            )
+        )
+
+    def test_search_filter_uses_indexed_vector(self):
+        self.assertEqual(
+            str(
+                IncidentDatabaseInterface.search_filter("database").compile(
+                    dialect=postgresql.dialect()
+                )
+            ),
+            "incidentrecord.search_vector @@ "
+            + "websearch_to_tsquery(%(websearch_to_tsquery_1)s, "
+            + "%(websearch_to_tsquery_2)s)",
+        )
+
+    def test_lookup_requires_a_key(self):
+        with self.assertRaises(ValueError):
+            IncidentDatabaseInterface.lookup_filter()
+
+
+class TestIncidentLookupPlans(unittest.TestCase):
+    """
+    Seeds a throwaway schema in a local Postgres and checks that every
+    lookup key is served by an index rather than a sequential scan
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = create_engine(
+            database_url(), connect_args={"connect_timeout": 2}
+        )
+
+        try:
+            cls.engine.connect().close()
+        except Exception as error:
+            raise unittest.SkipTest(f"Postgres is not available: {error}")
+
+        cls.schema = f"plan_test_{uuid.uuid4().hex[:8]}"
+
+        with cls.engine.begin() as conn:
+            conn.execute(text(f"CREATE SCHEMA {cls.schema}"))
+            conn = conn.execution_options(
+                schema_translate_map={None: cls.schema}
+            )
+            IncidentRecord.__table__.create(conn)
+            conn.execute(
+                insert(IncidentRecord),
+                [
+                    {
+                        "channel_id": f"C{n:06d}",
+                        "channel_name": f"inc-{n}-outage",
+                        "slug": f"inc-{n}",
+                        "status": "resolved" if n % 10 else "investigating",
+                    }
+                    for n in range(20000)
+                ],
+            )
+            conn.execute(text(f"ANALYZE {cls.schema}.incidentrecord"))
+
+    @classmethod
+    def tearDownClass(cls):
+        with cls.engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA {cls.schema} CASCADE"))
+
+        cls.engine.dispose()
+
+    def explain(self, **key) -> list[dict]:
+        query = select(IncidentRecord).filter(
+            IncidentDatabaseInterface.lookup_filter(**key)
+        )
+
+        with self.engine.connect() as conn:
+            conn = conn.execution_options(
+                schema_translate_map={None: self.schema}
+            )
+            compiled = query.compile(
+                dialect=conn.dialect,
+                compile_kwargs={"literal_binds": True},
+                schema_translate_map={None: self.schema},
+            )
+            plan = conn.execute(
+                text(f"EXPLAIN (FORMAT JSON) {compiled}")
+            ).scalar()
+
+        return plan_nodes(plan[0]["Plan"])
+
+    def test_lookups_use_an_index(self):
+        for key in (
+            {"channel_id": "C012345"},
+            {"channel_name": "inc-12345-outage"},
+            {"id": 12345},
+            {"slug": "inc-12345"},
+        ):
+            with self.subTest(key=key):
+                node_types = [
+                    node["Node Type"] for node in self.explain(**key)
+                ]
+
+                self.assertNotIn("Seq Scan", node_types)
+                self.assertTrue(
+                    any("Index" in node_type for node_type in node_types),
+                    node_types,
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
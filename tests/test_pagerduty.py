@@ -0,0 +1,134 @@
+import json
+import unittest
+from unittest.mock import patch, MagicMock
+
+import httpx
+from pagerduty import RestApiV2Client
+
+# Mock the slack client before importing modules that depend on it
+mock_client = MagicMock()
+mock_client.auth_test.return_value = {
+    "ok": True,
+    "url": "https://testworkspace.slack.com",
+    "user": "test user",
+    "user_id": "test user id",
+}
+
+with patch("slack_sdk.WebClient", return_value=mock_client):
+    from incidentbot.pagerduty.api import group_on_calls, PagerDutyInterface
+
+
+def oncall(policy: str, level: int, user: str, start: str | None = "s"):
+    return {
+        "escalation_level": level,
+        "escalation_policy": {"id": f"{policy}-id", "summary": policy},
+        "user": {"summary": user},
+        "start": start,
+        "end": "e" if start else None,
+    }
+
+
+class TestGroupOnCalls(unittest.TestCase):
+    def test_groups_entries_by_escalation_policy(self):
+        aggregate = group_on_calls(
+            oncalls=[
+                oncall("platform", 2, "Jane Doe"),
+                oncall("database", 1, "John Smith"),
+                oncall("platform", 1, "John Smith"),
+            ],
+            resolve_slack_user_ids=lambda name: [
+                {"Jane Doe": "U1", "John Smith": "U2"}[name]
+            ],
+        )
+
+        self.assertEqual(aggregate.entries, 3)
+        self.assertEqual(
+            [e["user"] for e in aggregate.on_call["platform"]],
+            ["John Smith", "Jane Doe"],
+        )
+        self.assertEqual(len(aggregate.on_call["database"]), 1)
+        self.assertEqual(
+            aggregate.on_call["platform"][1]["slack_user_id"], ["U1"]
+        )
+
+    def test_auto_mapping_built_from_same_pass(self):
+        aggregate = group_on_calls(
+            oncalls=[
+                oncall("platform", 1, "Jane Doe"),
+                oncall("always-on", 1, "Jane Doe", start=None),
+            ],
+            resolve_slack_user_ids=lambda name: [],
+        )
+
+        self.assertEqual(
+            aggregate.auto_mapping,
+            {"platform": "platform", "always-on": "always-on"},
+        )
+        self.assertEqual(aggregate.on_call["always-on"], [])
+
+    def test_resolves_each_user_once(self):
+        resolved = []
+
+        def resolve(name):
+            resolved.append(name)
+            return []
+
+        group_on_calls(
+            oncalls=[
+                oncall("platform", 1, "Jane Doe"),
+                oncall("database", 1, "Jane Doe"),
+            ],
+            resolve_slack_user_ids=resolve,
+        )
+
+        self.assertEqual(resolved, ["Jane Doe"])
+
+    def test_consumes_iterable_once(self):
+        calls = []
+
+        def oncalls():
+            calls.append(1)
+            yield oncall("platform", 1, "Jane Doe")
+
+        group_on_calls(
+            oncalls=oncalls(), resolve_slack_user_ids=lambda name: []
+        )
+
+        self.assertEqual(len(calls), 1)
+
+
+class TestAggregateOnCalls(unittest.TestCase):
+    def test_counts_requests_made(self):
+        responses = [
+            (429, {}),
+            (200, {"more": True, "oncalls": [oncall("platform", 1, "Jane")]}),
+            (200, {"more": False, "oncalls": []}),
+        ]
+
+        def handler(request):
+            status, body = responses.pop(0)
+            return httpx.Response(
+                status,
+                headers={"content-type": "application/json"},
+                stream=httpx.ByteStream(json.dumps(body).encode()),
+            )
+
+        client = RestApiV2Client("token")
+        client._transport = httpx.MockTransport(handler)
+
+        with patch.object(
+            PagerDutyInterface, "session", return_value=client
+        ), patch(
+            "incidentbot.pagerduty.api.get_slack_user_ids_by_real_name",
+            return_value=["U1"],
+        ), patch(
+            "pagerduty.api_client.time.sleep"
+        ):
+            aggregate = PagerDutyInterface.aggregate_on_calls()
+
+        self.assertEqual(aggregate.entries, 1)
+        self.assertEqual(aggregate.api_calls, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import threading
+import unittest
+
+from incidentbot.incident.pipeline import Pipeline
+
+
+class TestPipeline(unittest.TestCase):
+    def test_dependents_receive_results(self):
+        pipeline = Pipeline(name="test")
+        pipeline.add("channel", lambda _: "C1")
+        pipeline.add(
+            "topic", lambda results: results["channel"], depends_on=["channel"]
+        )
+
+        results = pipeline.run()
+
+        self.assertEqual(results["topic"].value, "C1")
+
+    def test_independent_steps_run_concurrently(self):
+        barrier = threading.Barrier(3, timeout=5)
+        pipeline = Pipeline(name="test", max_workers=3)
+        for name in ("digest", "topic", "bookmark"):
+            pipeline.add(name, lambda _: barrier.wait())
+
+        results = pipeline.run()
+
+        self.assertTrue(all(r.status == "succeeded" for r in results.values()))
+
+    def test_failed_step_skips_dependents_only(self):
+        def fail(_):
+            raise RuntimeError("boom")
+
+        pipeline = Pipeline(name="test")
+        pipeline.add("channel", fail)
+        pipeline.add("record", lambda _: None, depends_on=["channel"])
+        pipeline.add("welcome", lambda _: None, depends_on=["record"])
+        pipeline.add("meeting_link", lambda _: "https://example.com")
+
+        results = pipeline.run()
+
+        self.assertEqual(results["channel"].status, "failed")
+        self.assertEqual(results["record"].status, "skipped")
+        self.assertEqual(results["welcome"].status, "skipped")
+        self.assertEqual(results["meeting_link"].status, "succeeded")
+
+    def test_completed_steps_are_not_run_again(self):
+        calls = []
+        pipeline = Pipeline(name="test", completed={"channel": "C1"})
+        pipeline.add("channel", lambda _: calls.append("channel"))
+        pipeline.add(
+            "digest",
+            lambda results: results["channel"],
+            depends_on=["channel"],
+        )
+
+        results = pipeline.run()
+
+        self.assertEqual(calls, [])
+        self.assertEqual(results["digest"].value, "C1")
+
+    def test_state_changes_are_reported(self):
+        changes = []
+        pipeline = Pipeline(
+            name="test",
+            completed={"channel": "C1"},
+            on_change=lambda r: changes.append((r.name, r.status)),
+        )
+        pipeline.add("channel", lambda _: "C2")
+        pipeline.add("digest", lambda _: "1.0", depends_on=["channel"])
+
+        pipeline.run()
+
+        self.assertEqual(
+            changes, [("digest", "running"), ("digest", "succeeded")]
+        )
+
+    def test_cycles_are_rejected(self):
+        pipeline = Pipeline(name="test")
+        pipeline.add("a", lambda _: None, depends_on=["b"])
+        pipeline.add("b", lambda _: None, depends_on=["a"])
+
+        with self.assertRaises(ValueError):
+            pipeline.run()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+from unittest.mock import patch, MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+# Mock the slack client before importing modules that depend on it
+mock_client = MagicMock()
+mock_client.auth_test.return_value = {
+    "ok": True,
+    "url": "https://testworkspace.slack.com",
+    "user": "test user",
+    "user_id": "test user id",
+}
+
+with patch("slack_sdk.WebClient", return_value=mock_client):
+    from incidentbot.queue.core import WorkerPool, WorkQueueInterface
+
+
+item = {"attempts": 1, "id": 1, "kind": "test", "max_attempts": 5}
+
+
+@patch("incidentbot.queue.core.WorkQueueInterface")
+class TestWorkerPool(unittest.TestCase):
+    @patch("incidentbot.queue.core.run_work_item")
+    def test_successful_items_are_completed(self, _run, interface):
+        pool = WorkerPool()
+        pool._active = 1
+
+        pool._run(item | {"payload": {"id": 1}})
+
+        interface.complete.assert_called_once_with(id=1)
+        interface.fail.assert_not_called()
+        self.assertEqual((pool._active, pool.succeeded), (0, 1))
+
+    @patch(
+        "incidentbot.queue.core.run_work_item",
+        side_effect=RuntimeError("jira is down"),
+    )
+    def test_failed_items_are_retried(self, _run, interface):
+        pool = WorkerPool()
+        pool._active = 1
+
+        pool._run(item | {"payload": {"id": 1}})
+
+        interface.complete.assert_not_called()
+        self.assertEqual(
+            interface.fail.call_args.kwargs["error"], "jira is down"
+        )
+        self.assertEqual((pool._active, pool.failed), (0, 1))
+
+
+class TestRequeueStale(unittest.TestCase):
+    def test_exhausted_items_are_failed(self):
+        session = MagicMock()
+        session.__enter__.return_value = session
+        session.exec.return_value.all.return_value = [
+            (5, 1, "test", "failed"),
+            (2, 2, "test", "queued"),
+        ]
+
+        with patch("incidentbot.queue.core.db_session", return_value=session):
+            requeued = WorkQueueInterface.requeue_stale(timeout_seconds=60)
+
+        statement = str(
+            session.exec.call_args.args[0].compile(
+                dialect=postgresql.dialect()
+            )
+        )
+        self.assertEqual(requeued, 1)
+        self.assertIn(
+            "status=CASE WHEN (work_item.attempts >= work_item.max_attempts)",
+            statement,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
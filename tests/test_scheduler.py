@@ -0,0 +1,55 @@
+import datetime
+import unittest
+from unittest.mock import patch, MagicMock
+
+# Mock the slack client before importing modules that depend on it
+mock_client = MagicMock()
+mock_client.auth_test.return_value = {
+    "ok": True,
+    "url": "https://testworkspace.slack.com",
+    "user": "test user",
+    "user_id": "test user id",
+}
+
+with patch("slack_sdk.WebClient", return_value=mock_client):
+    from incidentbot.scheduler.core import build_aging_incident_messages
+
+
+now = datetime.datetime(2026, 1, 31, 12, 0, 0)
+
+
+def incident(n: int):
+    return MagicMock(
+        channel_id=f"C{n}",
+        created_at=now - datetime.timedelta(days=10, microseconds=5),
+        severity="sev2",
+        status="investigating",
+    )
+
+
+class TestAgingIncidentMessages(unittest.TestCase):
+    def test_single_message(self):
+        messages = build_aging_incident_messages(
+            incidents=[incident(1)], max_age=7, now=now
+        )
+
+        self.assertEqual(len(messages), 1)
+        self.assertEqual(len(messages[0]), 4)
+        self.assertEqual(
+            messages[0][2]["fields"][4]["text"],
+            "*Time Open:* 10 days, 0:00:00",
+        )
+
+    def test_paginated_by_block_limit(self):
+        messages = build_aging_incident_messages(
+            incidents=[incident(n) for n in range(60)], max_age=7, now=now
+        )
+
+        self.assertTrue(all(len(blocks) <= 50 for blocks in messages))
+        self.assertEqual(sum(len(blocks) for blocks in messages), 2 + 120)
+        # Sections are never separated from their divider
+        self.assertTrue(all(len(blocks) % 2 == 0 for blocks in messages))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+from unittest.mock import patch, MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+# Mock the slack client before importing modules that depend on it
+mock_client = MagicMock()
+mock_client.auth_test.return_value = {
+    "ok": True,
+    "url": "https://testworkspace.slack.com",
+    "user": "test user",
+    "user_id": "test user id",
+}
+
+with patch("slack_sdk.WebClient", return_value=mock_client):
+    from incidentbot.slack import client as client_module
+    from incidentbot.slack.client import (
+        diff_slack_users,
+        format_slack_user,
+        slack_user_hash,
+    )
+
+
+user = {
+    "email": "jane@example.com",
+    "id": "U1",
+    "name": "jane",
+    "real_name": "Jane Doe",
+}
+
+
+class TestSlackUserSync(unittest.TestCase):
+    def test_slack_user_hash_ignores_extra_fields(self):
+        self.assertEqual(
+            slack_user_hash(user),
+            slack_user_hash(user | {"content_hash": "abc"}),
+        )
+
+    def test_unchanged_users_are_skipped(self):
+        self.assertEqual(
+            diff_slack_users({"U1": slack_user_hash(user)}, [user]), []
+        )
+
+    def test_new_and_changed_users_are_returned(self):
+        renamed = user | {"real_name": "Jane Smith"}
+        new = user | {"id": "U2"}
+
+        changed = diff_slack_users(
+            {"U1": slack_user_hash(user)}, [renamed, new]
+        )
+
+        self.assertEqual([u["id"] for u in changed], ["U1", "U2"])
+        self.assertEqual(changed[0]["content_hash"], slack_user_hash(renamed))
+
+    def test_tombstoned_users_are_restored(self):
+        self.assertEqual(
+            [u["id"] for u in diff_slack_users({"U1": None}, [user])],
+            ["U1"],
+        )
+
+    def test_deactivated_users_are_tombstoned(self):
+        member = {
+            "deleted": True,
+            "id": "U1",
+            "name": "jane",
+            "profile": {"email": "jane@example.com", "real_name": "Jane Doe"},
+        }
+        statements = []
+        session = MagicMock()
+        session.__enter__.return_value = session
+
+        def execute(statement):
+            statements.append(statement)
+            result = MagicMock()
+            result.all.return_value = [("U1", slack_user_hash(user), None)]
+            return result
+
+        session.exec.side_effect = execute
+
+        with patch.object(
+            client_module, "db_session", return_value=session
+        ), patch.object(
+            client_module,
+            "iter_slack_users",
+            return_value=iter([[format_slack_user(member)]]),
+        ):
+            client_module.store_slack_user_list_db()
+
+        upsert = str(statements[1].compile(dialect=postgresql.dialect()))
+        self.assertTrue(format_slack_user(member)["deleted"])
+        self.assertIn("VALUES (%(content_hash_m0)s, now(),", upsert)
+        self.assertEqual(len(statements), 2)
+        session.commit.assert_called_once()
+
+    def test_user_change_sets_tombstone_from_deleted_flag(self):
+        session = MagicMock()
+        session.__enter__.return_value = session
+
+        for deleted, deleted_at in [(True, "now()"), (False, "%(deleted_at")]:
+            with self.subTest(deleted=deleted), patch.object(
+                client_module, "db_session", return_value=session
+            ):
+                client_module.store_slack_user_db(
+                    {"deleted": deleted, "id": "U1", "name": "jane"}
+                )
+
+                upsert = str(
+                    session.exec.call_args.args[0].compile(
+                        dialect=postgresql.dialect()
+                    )
+                )
+                self.assertIn(
+                    f"VALUES (%(content_hash_m0)s, {deleted_at}", upsert
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
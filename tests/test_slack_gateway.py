@@ -0,0 +1,103 @@
+import threading
+import unittest
+from unittest.mock import patch, MagicMock
+
+from incidentbot.slack.gateway import SlackApiGateway, TokenBucket
+from slack_sdk.errors import SlackApiError
+
+
+def rate_limited():
+    response = MagicMock()
+    response.status_code = 429
+    response.headers = {"Retry-After": "0"}
+
+    return SlackApiError(message="ratelimited", response=response)
+
+
+class TestSlackApiGateway(unittest.TestCase):
+    def setUp(self):
+        self.client = MagicMock()
+        self.gateway = SlackApiGateway(self.client, max_backoff=2)
+
+    def test_backoff_is_bounded(self):
+        for attempt in range(10):
+            self.assertLessEqual(self.gateway.backoff(attempt, None), 3)
+        self.assertGreaterEqual(self.gateway.backoff(0, "30"), 2)
+
+    @patch("incidentbot.slack.gateway.time.sleep")
+    @patch("incidentbot.slack.gateway.random.uniform", return_value=0)
+    def test_retries_rate_limited_calls(self, _uniform, _sleep):
+        self.client.chat_postMessage.side_effect = [rate_limited(), {"ok": 1}]
+
+        self.assertEqual(
+            self.gateway.chat_postMessage(channel="C1"), {"ok": 1}
+        )
+        self.assertEqual(
+            self.gateway.stats()["chat.postMessage"]["rate_limited"], 1
+        )
+
+    @patch("incidentbot.slack.gateway.time.sleep")
+    @patch("incidentbot.slack.gateway.random.uniform", return_value=0)
+    def test_paginate_resumes_from_failing_cursor(self, _uniform, _sleep):
+        self.client.users_list.side_effect = [
+            {"members": [1], "response_metadata": {"next_cursor": "c2"}},
+            rate_limited(),
+            {"members": [2], "response_metadata": {"next_cursor": ""}},
+        ]
+
+        pages = list(self.gateway.paginate("users_list", limit=200))
+
+        self.assertEqual([p["members"] for p in pages], [[1], [2]])
+        self.assertEqual(
+            [
+                c.kwargs.get("cursor")
+                for c in self.client.users_list.call_args_list
+            ],
+            [None, "c2", "c2"],
+        )
+
+    def test_messages_are_limited_per_channel(self):
+        for _ in range(5):
+            self.gateway.chat_postMessage(channel="C1")
+
+        # C1 has used up its burst, C2 has its own bucket
+        with patch("incidentbot.slack.gateway.time.sleep") as sleep:
+            self.gateway.chat_postMessage(channel="C2")
+            sleep.assert_not_called()
+
+            sleep.side_effect = StopIteration
+            with self.assertRaises(StopIteration):
+                self.gateway.chat_postMessage(channel="C1")
+
+    def test_counters_are_not_lost_across_threads(self):
+        def call():
+            for _ in range(200):
+                self.gateway.conversations_info(channel="C1")
+
+        threads = [threading.Thread(target=call) for _ in range(8)]
+        with patch.object(TokenBucket, "acquire", return_value=0.0):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(
+            self.gateway.stats()["conversations.info"]["calls"], 1600
+        )
+
+    def test_non_rate_limit_errors_are_raised(self):
+        response = MagicMock()
+        response.status_code = 400
+        self.client.conversations_info.side_effect = SlackApiError(
+            message="channel_not_found", response=response
+        )
+
+        with self.assertRaises(SlackApiError):
+            self.gateway.conversations_info(channel="C1")
+        self.assertEqual(
+            self.gateway.stats()["conversations.info"]["errors"], 1
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
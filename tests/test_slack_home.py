@@ -0,0 +1,91 @@
+import unittest
+from unittest.mock import patch, MagicMock
+
+from sqlalchemy import create_engine, update
+from sqlmodel import Session
+
+# Mock the slack client before importing modules that depend on it
+mock_client = MagicMock()
+mock_client.auth_test.return_value = {
+    "ok": True,
+    "url": "https://testworkspace.slack.com",
+    "user": "test user",
+    "user_id": "test user id",
+}
+
+with patch("slack_sdk.WebClient", return_value=mock_client):
+    from incidentbot.models.database import IncidentRecord
+    from incidentbot.slack.home import HomeViewCache, home_view
+
+
+class TestHomeViewCache(unittest.TestCase):
+    def setUp(self):
+        self.renders = 0
+        self.cache = HomeViewCache(ttl_seconds=60)
+
+    def render(self):
+        self.renders += 1
+        return {"type": "home", "blocks": [{"n": self.renders}]}
+
+    def test_renders_once_per_version(self):
+        first, digest = self.cache.get(self.render)
+        second, _ = self.cache.get(self.render)
+
+        self.assertIs(first, second)
+        self.assertEqual(self.renders, 1)
+
+        self.cache.invalidate()
+        _, changed = self.cache.get(self.render)
+
+        self.assertEqual(self.renders, 2)
+        self.assertNotEqual(digest, changed)
+
+    def test_expires_after_ttl(self):
+        self.cache.ttl_seconds = 0
+        self.cache.get(self.render)
+        self.cache.get(self.render)
+
+        self.assertEqual(self.renders, 2)
+
+    def test_skips_publishing_unchanged_view(self):
+        _, digest = self.cache.get(self.render)
+
+        self.assertTrue(self.cache.should_publish("U1", digest))
+        self.cache.published("U1", digest)
+        self.assertFalse(self.cache.should_publish("U1", digest))
+        self.assertTrue(self.cache.should_publish("U2", digest))
+
+
+class TestHomeViewInvalidation(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        IncidentRecord.__table__.create(self.engine)
+
+    def test_committed_writes_bump_version(self):
+        version = home_view.version
+
+        with Session(self.engine) as session:
+            session.add(IncidentRecord(id=1, slug="inc-1", status="open"))
+            session.commit()
+
+        self.assertEqual(home_view.version, version + 1)
+
+        with Session(self.engine) as session:
+            session.exec(update(IncidentRecord).values(status="resolved"))
+            session.commit()
+
+        self.assertEqual(home_view.version, version + 2)
+
+    def test_rolled_back_writes_do_not_bump_version(self):
+        version = home_view.version
+
+        with Session(self.engine) as session:
+            session.exec(update(IncidentRecord).values(status="resolved"))
+            session.rollback()
+            session.commit()
+
+        self.assertEqual(home_view.version, version)
+
+
+if __name__ == "__main__":
+    unittest.main()